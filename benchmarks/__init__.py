@@ -0,0 +1,41 @@
+"""
+Standalone performance benchmarks.
+
+Run from the project root, e.g. `python -m benchmarks.bulk_items`.
+Each script builds a throwaway database, so `db.sqlite3` is never touched.
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+def setup(in_memory=False):
+    """
+    Configure Django and create an empty, migrated benchmark database.
+
+    By default the database is a temporary file so disk I/O is included;
+    pass `in_memory=True` to measure CPU cost only.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.ALLOWED_HOSTS = ["*"]
+
+    from django.db import connection
+
+    if not in_memory:
+        path = os.path.join(tempfile.mkdtemp(prefix="erp-bench-"), "bench.sqlite3")
+        connection.settings_dict["TEST"]["NAME"] = path
+    connection.creation.create_test_db(verbosity=0, serialize=False)
+
+
+@contextmanager
+def timer(results, key):
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
@@ -0,0 +1,97 @@
+"""
+API list filters with and without the indexes that back them.
+
+    python -m benchmarks.api_filters [--orders 100000] [--repeat 20]
+
+Seeds `--orders` orders (and `--orders` / 10 products), backdates every
+`updated_at` by a day except the 100 most recent rows, and marks 1% of
+products inactive. Each case fetches the first page of the filtered
+endpoint (`?fields=id`, so encoding stays small) and reports the median,
+first with the filter indexes and then with them dropped.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+from benchmarks import setup
+
+# Indexes added for the API filters; dropping them shows what they buy.
+INDEXES = ["order_status", "order_updated_at", "product_inactive", "product_updated_at"]
+
+
+def median_ms(repeat, fn):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.utils import timezone
+
+    from orders.models import Order
+    from products.models import Product
+
+    settings.DEBUG = False
+    call_command(
+        "seed_perf",
+        orders=args.orders,
+        customers=max(args.orders // 100, 1),
+        products=max(args.orders // 10, 1),
+        max_lines=1,
+        stdout=sys.stderr,
+    )
+    now = timezone.now()
+    for model in (Order, Product):
+        model.objects.update(updated_at=now - timedelta(days=1))
+        recent = model.objects.order_by("-id").values("id")[:100]
+        model.objects.filter(id__in=recent).update(updated_at=now)
+    Product.objects.filter(id__in=Product.objects.values_list("id", flat=True)[::100]).update(is_active=False)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    since = (now - timedelta(hours=1)).isoformat()
+    cases = [
+        ("/api/orders/", {"status": "SHIPPED"}),
+        ("/api/orders/", {"updated_since": since}),
+        ("/api/products/", {"is_active": "false"}),
+        ("/api/products/", {"updated_since": since}),
+    ]
+    client = Client()
+    timings = {}
+    for label in ("indexed", "dropped"):
+        for url, params in cases:
+            query = {"fields": "id", **params}
+            assert client.get(url, query).status_code == 200
+            timings[label, url, str(params)] = median_ms(args.repeat, lambda: client.get(url, query))
+        with connection.cursor() as cursor:
+            for name in INDEXES:
+                cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+    print(f"{'endpoint':16} {'filter':38} {'indexed':>10} {'dropped':>10}")
+    for url, params in cases:
+        key = (url, str(params))
+        print(
+            f"{url:16} {'&'.join(f'{k}=...' if k == 'updated_since' else f'{k}={v}' for k, v in params.items()):38}"
+            f" {timings[('indexed', *key)]:7.2f} ms {timings[('dropped', *key)]:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Concurrent-request capacity: async views under ASGI vs the WSGI deployment.
+
+    pip install uvicorn gunicorn   # servers used here; not project dependencies
+    python -m benchmarks.asgi_load [--threads 8] [--slow-clients 64] [--fast-clients 16] [--seconds 10]
+
+Both servers run one process against the same seeded SQLite file (with
+ERP_DB_PROFILE=production):
+
+- WSGI: gunicorn `config.wsgi:application`, gthread worker with `--threads`
+  threads, serving the sync DRF endpoints and `/products/<id>/price/`.
+- ASGI: uvicorn `config.asgi:application`, serving the same reads from
+  `/api/async/`.
+
+Two scenarios, each for `--seconds`:
+
+- "plain": `--fast-clients` clients request a small page and a price in
+  a loop.
+- "slow clients": the same, while `--slow-clients` other clients dribble
+  their request headers one line every half second, as slow mobile
+  connections do. A WSGI thread is tied up for as long as it waits for
+  those headers.
+
+Reports completed fast requests per second, p50/p95 latency and errors.
+The client is a minimal asyncio HTTP/1.0-style client (one request per
+connection), so no client library is needed.
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks import setup
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start.")
+
+
+async def fetch(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    status = int(response.split(b" ", 2)[1])
+    if status != 200:
+        raise RuntimeError(f"{path}: HTTP {status}")
+
+
+async def slow_client(port, path, stop):
+    """
+    Send a request one header line every half second until `stop`, then
+    finish it; reconnect and repeat.
+    """
+    while not stop.is_set():
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n".encode())
+            n = 0
+            while not stop.is_set() and n < 20:
+                await asyncio.sleep(0.5)
+                writer.write(f"X-Padding-{n}: {'x' * 20}\r\n".encode())
+                await writer.drain()
+                n += 1
+            writer.write(b"Connection: close\r\n\r\n")
+            await writer.drain()
+            await reader.read()
+            writer.close()
+        except OSError:
+            await asyncio.sleep(0.1)
+
+
+async def fast_client(port, paths, stop, timings, errors):
+    n = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(fetch(port, paths[n % len(paths)]), timeout=10)
+            timings.append((time.perf_counter() - start) * 1000)
+        except (OSError, RuntimeError, asyncio.TimeoutError):
+            errors.append(1)
+        n += 1
+
+
+async def scenario(port, paths, fast_clients, slow_clients, seconds):
+    stop = asyncio.Event()
+    timings, errors = [], []
+    slow = [asyncio.create_task(slow_client(port, paths[0], stop)) for _ in range(slow_clients)]
+    await asyncio.sleep(1 if slow_clients else 0)  # let the slow clients connect first
+    fast = [asyncio.create_task(fast_client(port, paths, stop, timings, errors)) for _ in range(fast_clients)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*fast, return_exceptions=True)
+    for task in slow:
+        task.cancel()
+    await asyncio.gather(*slow, return_exceptions=True)
+    return {
+        "rps": len(timings) / seconds,
+        "p50_ms": statistics.median(timings) if timings else float("nan"),
+        "p95_ms": statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else float("nan"),
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8, help="WSGI worker threads.")
+    parser.add_argument("--slow-clients", type=int, default=64)
+    parser.add_argument("--fast-clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    for server in ("uvicorn", "gunicorn"):
+        if shutil.which(server) is None:
+            sys.exit(f"{server} is not installed: pip install uvicorn gunicorn")
+
+    setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from products.models import Product
+
+    call_command("seed_perf", orders=2000, customers=200, products=100, stdout=open(os.devnull, "w"))
+    product_id = Product.objects.order_by("id").values_list("id", flat=True).first()
+    env = dict(
+        os.environ,
+        ERP_DB_PATH=str(connection.settings_dict["NAME"]),
+        ERP_DB_PROFILE="production",
+        DJANGO_SETTINGS_MODULE="config.settings",
+    )
+    connection.close()
+
+    deployments = {
+        "WSGI (gunicorn gthread)": (
+            ["gunicorn", "config.wsgi:application", "--worker-class", "gthread", "--workers", "1",
+             "--threads", str(args.threads), "--log-level", "warning", "--bind"],
+            "127.0.0.1:{port}",
+            [f"/api/customers/?page_size=10", f"/products/{product_id}/price/"],
+        ),
+        "ASGI (uvicorn, async views)": (
+            ["uvicorn", "config.asgi:application", "--workers", "1", "--log-level", "warning",
+             "--no-access-log", "--port"],
+            "{port}",
+            [f"/api/async/customers/?page_size=10", f"/api/async/products/{product_id}/price/"],
+        ),
+    }
+
+    print(f"{'deployment':28} {'scenario':13} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for name, (command, bind, paths) in deployments.items():
+        port = free_port()
+        server = subprocess.Popen([*command, bind.format(port=port)], env=env, cwd=os.getcwd())
+        try:
+            wait_for_port(port)
+            asyncio.run(scenario(port, paths, 2, 0, 1))  # warm up
+            for label, slow_clients in (("plain", 0), ("slow clients", args.slow_clients)):
+                stats = asyncio.run(scenario(port, paths, args.fast_clients, slow_clients, args.seconds))
+                print(
+                    f"{name:28} {label:13} {stats['rps']:8.1f} {stats['p50_ms']:8.2f} "
+                    f"{stats['p95_ms']:8.2f} {stats['errors']:7}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Throughput of the bulk line-item endpoint vs one POST per line.
+
+    python -m benchmarks.bulk_items [--lines 10000] [--single-lines 500]
+"""
+
+import argparse
+from decimal import Decimal
+
+from benchmarks import setup, timer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--single-lines", type=int, default=500)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+
+    from customers.models import Customer
+    from orders.models import Order
+    from products.models import Product
+
+    Product.objects.bulk_create(
+        Product(sku=f"SKU-{i}", name=f"Product {i}", price=Decimal("9.99")) for i in range(args.lines)
+    )
+    product_ids = list(Product.objects.order_by("id").values_list("id", flat=True))
+    customer = Customer.objects.create(name="Bench")
+    api = APIClient()
+    api.force_authenticate(get_user_model().objects.create_superuser("bench", password="bench"))
+
+    results = {}
+
+    order = Order.objects.create(customer=customer)
+    with timer(results, "single"):
+        for product_id in product_ids[: args.single_lines]:
+            resp = api.post(
+                "/api/order-items/",
+                {"order": order.pk, "product": product_id, "quantity": 1, "unit_price": "9.99"},
+                format="json",
+            )
+            assert resp.status_code == 201, resp.content
+
+    order = Order.objects.create(customer=customer)
+    payload = [{"product": product_id, "quantity": 2} for product_id in product_ids]
+    with timer(results, "bulk_insert"):
+        resp = api.post(f"/api/orders/{order.pk}/items/bulk/", payload, format="json")
+    assert resp.status_code == 201, resp.content[:500]
+
+    with timer(results, "bulk_merge"):
+        resp = api.post(f"/api/orders/{order.pk}/items/bulk/", payload, format="json")
+    assert resp.status_code == 200 and resp.data["updated"] == args.lines, resp.content[:500]
+
+    single_rate = args.single_lines / results["single"]
+    print(f"one POST per line : {single_rate:10,.0f} lines/s  ({args.single_lines} lines in {results['single']:.2f}s)")
+    for key, label in (("bulk_insert", "bulk, new lines  "), ("bulk_merge", "bulk, merge lines")):
+        rate = args.lines / results[key]
+        print(f"{label} : {rate:10,.0f} lines/s  ({args.lines} lines in {results[key]:.2f}s, {rate / single_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
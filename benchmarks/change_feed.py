@@ -0,0 +1,78 @@
+"""
+Catching up on changes: re-pulling `/api/orders/` vs the change feed.
+
+    python -m benchmarks.change_feed [--orders 100000] [--changed 100]
+
+Seeds `--orders` orders, backdates every `updated_at` by a day and takes a
+feed cursor at that point (a client that is up to date). Then it updates
+`--changed` orders, deletes a tenth as many (with their items) and times:
+
+- "full pull": every page of `/api/orders/?page_size=500`, which is what
+  a client without a feed has to do to notice the same changes;
+- "feed": following `/api/orders/changes/` and `/api/order-items/changes/`
+  from the cursor until `has_more` is false.
+"""
+
+import argparse
+import sys
+from datetime import timedelta
+
+from benchmarks import setup, timer
+
+
+def follow(client, url):
+    requests = entries = 0
+    while url:
+        data = client.get(url).json()
+        requests += 1
+        entries += len(data["results"])
+        url = data["next"] if data.get("has_more", True) else None
+    return requests, entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--changed", type=int, default=100)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+    from django.utils import timezone
+
+    from changes.feed import encode_feed_cursor
+    from orders.models import Order, OrderItem
+
+    settings.DEBUG = False
+    settings.CHANGE_FEED_SETTLE_SECONDS = 0
+    call_command("seed_perf", orders=args.orders, stdout=sys.stderr)
+    synced = timezone.now() - timedelta(days=1)
+    Order.objects.update(updated_at=synced)
+    OrderItem.objects.update(updated_at=synced)
+    # Just past every backdated row, for both resources.
+    cursor = encode_feed_cursor((synced + timedelta(microseconds=1), 0), timezone.now())
+
+    step = max(args.orders // args.changed, 1)
+    changed = list(Order.objects.order_by("pk").values_list("pk", flat=True)[::step])[: args.changed]
+    Order.objects.filter(pk__in=changed).update(status=Order.Status.CANCELLED, updated_at=timezone.now())
+    Order.objects.filter(pk__in=changed[: max(len(changed) // 10, 1)]).delete()
+
+    client = Client()
+    results = {}
+    with timer(results, "full pull"):
+        pulled = follow(client, "/api/orders/?page_size=500")
+    with timer(results, "feed"):
+        orders = follow(client, f"/api/orders/changes/?page_size=500&cursor={cursor}")
+        items = follow(client, f"/api/order-items/changes/?page_size=500&cursor={cursor}")
+    fed = (orders[0] + items[0], orders[1] + items[1])
+
+    print(f"{'path':10} {'requests':>8} {'entries':>8} {'time':>11}")
+    for name, (requests, entries) in (("full pull", pulled), ("feed", fed)):
+        print(f"{name:10} {requests:8} {entries:8} {results[name] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
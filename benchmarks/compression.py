@@ -0,0 +1,75 @@
+"""
+Bytes on the wire and CPU cost of gzip levels on API and export payloads.
+
+    python -m benchmarks.compression [--orders 10000] [--repeat 9]
+
+Fetches uncompressed bodies for a default `/api/orders/` page (50 orders
+with items), a `?page_size=500` page and the NDJSON export of every order.
+Then for each level it reports the compressed size and the median time to
+compress each body with the middleware's writer (`config/compression.py`).
+The export is compressed line by line, as it is streamed.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks import setup
+
+LEVELS = (1, 3, 6, 9)
+
+
+def median_ms(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=9)
+    args = parser.parse_args()
+
+    setup(in_memory=True)
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+
+    from config.compression import compress, compress_stream
+
+    settings.DEBUG = False
+    settings.GZIP_LEVEL = 0
+    call_command("seed_perf", orders=args.orders, stdout=sys.stderr)
+    client = Client()
+    export = list(client.get("/api/orders/export/?format=ndjson").streaming_content)
+    payloads = {
+        "orders page (50)": [client.get("/api/orders/").content],
+        "orders page (500)": [client.get("/api/orders/?page_size=500").content],
+        f"export ({args.orders:,} orders)": export,
+    }
+
+    print(f"{'payload':26} {'level':>5} {'bytes':>12} {'ratio':>6} {'time':>11} {'MB/s':>7}")
+    for name, chunks in payloads.items():
+        size = sum(map(len, chunks))
+        print(f"{name:26} {'-':>5} {size:12,} {1:6.2f} {'':>11} {'':>7}")
+        for level in LEVELS:
+            if len(chunks) == 1:
+                compressed = len(compress(chunks[0], level))
+                elapsed = median_ms(args.repeat, lambda: compress(chunks[0], level))
+            else:
+                compressed = sum(map(len, compress_stream(chunks, level)))
+                elapsed = median_ms(args.repeat, lambda: sum(map(len, compress_stream(chunks, level))))
+            print(
+                f"{'':26} {level:5} {compressed:12,} {size / compressed:6.2f} "
+                f"{elapsed:8.2f} ms {size / elapsed / 1000:7.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Time-to-first-byte and peak memory of the streaming order export.
+
+    python -m benchmarks.export_orders [--orders 20000] [--items-per-order 10]
+"""
+
+import argparse
+import time
+import tracemalloc
+from decimal import Decimal
+
+from benchmarks import setup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=20_000)
+    parser.add_argument("--items-per-order", type=int, default=10)
+    args = parser.parse_args()
+
+    setup()
+
+    from customers.models import Customer
+    from orders.exports import EXPORTERS
+    from orders.models import Order, OrderItem
+    from products.models import Product
+
+    customer = Customer.objects.create(name="Bench", email="bench@example.com")
+    Product.objects.bulk_create(
+        Product(sku=f"SKU-{i}", name=f"Product {i}", price=Decimal("9.99")) for i in range(args.items_per_order)
+    )
+    product_ids = list(Product.objects.values_list("id", flat=True))
+    Order.objects.bulk_create((Order(customer=customer) for _ in range(args.orders)), batch_size=2000)
+    OrderItem.objects.bulk_create(
+        (
+            OrderItem(order_id=order_id, product_id=product_id, quantity=2, unit_price=Decimal("9.99"))
+            for order_id in Order.objects.values_list("id", flat=True).iterator()
+            for product_id in product_ids
+        ),
+        batch_size=2000,
+    )
+    total_items = args.orders * args.items_per_order
+
+    for name, (_, lines) in EXPORTERS.items():
+        start = time.perf_counter()
+        stream = lines(Order.objects.all())
+        size = 0
+        for line in stream:
+            size += len(line)
+            if not line.startswith("order_id,"):  # skip the CSV header
+                break
+        first = time.perf_counter() - start
+        for line in stream:
+            size += len(line)
+        elapsed = time.perf_counter() - start
+
+        # Second pass under tracemalloc, which slows Python down too much to time.
+        tracemalloc.start()
+        for line in lines(Order.objects.all()):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:6} {args.orders:,} orders / {total_items:,} items: first record {first * 1000:.1f} ms, "
+            f"total {elapsed:.2f} s, {size / 1e6:.1f} MB out, peak Python memory {peak / 1e6:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
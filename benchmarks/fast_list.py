@@ -0,0 +1,100 @@
+"""
+ModelSerializer vs the values_list() encoder (config/encoders.py) on list endpoints.
+
+    python -m benchmarks.fast_list [--rows 10000] [--repeat 5]
+
+Two measurements per resource:
+
+- "encode": load and serialize `--rows` rows in one go (queryset ->
+  Python data), the part the fast path replaces.
+- "api": page through the list endpoint with `?page_size=500` until
+  `--rows` rows are read, including validators, rendering and the rest
+  of the request cycle.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks import setup
+
+
+def best_of(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+
+    from config.encoders import RowEncoder
+    from customers.models import Customer
+    from customers.serializers import CustomerSerializer
+    from orders.models import Order, OrderItem
+    from orders.serializers import OrderItemSerializer, OrderSerializer
+    from products.models import Product
+    from products.serializers import ProductSerializer
+
+    settings.DEBUG = False
+    call_command(
+        "seed_perf",
+        orders=args.rows,
+        customers=args.rows,
+        products=args.rows,
+        stdout=sys.stderr,
+    )
+    client = Client()
+
+    resources = {
+        "customers": (Customer.objects.order_by("id"), CustomerSerializer),
+        "products": (Product.objects.order_by("id"), ProductSerializer),
+        "orders": (Order.objects.prefetch_related("items").order_by("-id"), OrderSerializer),
+        "order-items": (OrderItem.objects.order_by("id"), OrderItemSerializer),
+    }
+    print(f"{'resource':12} {'step':7} {'serializer':>11} {'encoder':>11} {'speedup':>8}")
+    for name, (queryset, serializer_class) in resources.items():
+        queryset = queryset[: args.rows]
+
+        def slow_encode():
+            return serializer_class(list(queryset), many=True).data
+
+        def fast_encode():
+            encoder = RowEncoder(serializer_class(), queryset.model)
+            return encoder.encode(list(queryset.prefetch_related(None).values_list(*encoder.columns)))
+
+        assert slow_encode() == fast_encode()
+        slow, fast = best_of(args.repeat, slow_encode), best_of(args.repeat, fast_encode)
+        print(f"{name:12} {'encode':7} {slow:8.1f} ms {fast:8.1f} ms {slow / fast:7.1f}x")
+
+        def page_through():
+            url, read = f"/api/{name}/?page_size=500", 0
+            while url and read < args.rows:
+                # The response's data, not its JSON: time the server only.
+                data = client.get(url).data
+                read += len(data["results"])
+                url = data["next"]
+
+        timings = {}
+        for enabled in (False, True):
+            settings.API_FAST_LIST = enabled
+            timings[enabled] = best_of(args.repeat, page_through)
+        slow, fast = timings[False], timings[True]
+        print(f"{'':12} {'api':7} {slow:8.1f} ms {fast:8.1f} ms {slow / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
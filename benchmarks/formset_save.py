@@ -0,0 +1,99 @@
+"""
+Order detail formset saves: Django's per-row save vs the batched save.
+
+    python -m benchmarks.formset_save [--lines 500]
+
+Posts the order detail page three times per path, for an order of
+`--lines` lines: add every line, change every quantity, delete every
+line. The per-row path is `BaseInlineFormSet.save()`, patched in for the
+run.
+"""
+
+import argparse
+import contextlib
+import sys
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import urlencode
+
+from benchmarks import setup, timer
+
+FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+
+def formset_data(order, new_products=(), quantity=None, delete=False):
+    items = list(order.items.order_by("pk"))
+    data = {
+        "items-TOTAL_FORMS": str(len(items) + len(new_products)),
+        "items-INITIAL_FORMS": str(len(items)),
+        "items-MIN_NUM_FORMS": "0",
+        "items-MAX_NUM_FORMS": "100000",
+    }
+    for i, item in enumerate(items):
+        data.update({
+            f"items-{i}-id": str(item.pk),
+            f"items-{i}-product": str(item.product_id),
+            f"items-{i}-quantity": str(quantity or item.quantity),
+            f"items-{i}-unit_price": str(item.unit_price),
+        })
+        if delete:
+            data[f"items-{i}-DELETE"] = "on"
+    for i, product_id in enumerate(new_products, start=len(items)):
+        data.update({f"items-{i}-product": str(product_id), f"items-{i}-quantity": "1"})
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=500)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.forms import BaseInlineFormSet
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    from customers.models import Customer
+    from orders.forms import BaseOrderItemFormSet
+    from orders.models import Order
+    from products.models import Product
+
+    settings.DEBUG = False
+    Product.objects.bulk_create(
+        Product(sku=f"SKU-{i}", name=f"Product {i}", price=Decimal("9.99")) for i in range(args.lines)
+    )
+    product_ids = list(Product.objects.order_by("id").values_list("id", flat=True))
+    customer = Customer.objects.create(name="Bench")
+    client = Client()
+
+    paths = {
+        "per-row": mock.patch.object(BaseOrderItemFormSet, "save", BaseInlineFormSet.save),
+        "batched": contextlib.nullcontext(),
+    }
+    print(f"{'step':8} {'path':8} {'time':>10} {'queries':>8}", file=sys.stderr)
+    for name, patch in paths.items():
+        order = Order.objects.create(customer=customer)
+        url = reverse("orders:detail", kwargs={"pk": order.pk})
+        steps = {
+            "add": lambda: formset_data(order, new_products=product_ids),
+            "update": lambda: formset_data(order, quantity=2),
+            "delete": lambda: formset_data(order, delete=True),
+        }
+        with patch:
+            for step, data in steps.items():
+                data = data()
+                results = {}
+                with CaptureQueriesContext(connection) as queries, timer(results, step):
+                    response = client.post(url, urlencode(data), content_type=FORM_CONTENT_TYPE)
+                assert response.status_code == 302, response.status_code
+                print(f"{step:8} {name:8} {results[step] * 1000:7.1f} ms {len(queries):8}")
+        order.refresh_from_db()
+        assert order.item_count == 0
+
+
+if __name__ == "__main__":
+    main()
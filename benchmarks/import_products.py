@@ -0,0 +1,48 @@
+"""
+Throughput of `manage.py import_products` on a generated CSV.
+
+    python -m benchmarks.import_products [--rows 1000000]
+
+Runs the import twice: once into an empty table (all inserts) and once
+more over the same file (all updates).
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from benchmarks import setup, timer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=900)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.core.management import call_command
+
+    path = os.path.join(tempfile.mkdtemp(prefix="erp-import-"), "products.csv")
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["sku", "name", "price", "is_active"])
+        for i in range(args.rows):
+            writer.writerow([f"SKU-{i:08d}", f"Product {i}", f"{i % 10000 / 100:.2f}", i % 7 != 0])
+
+    results = {}
+    for run in ("insert", "update"):
+        out = StringIO()
+        with timer(results, run):
+            call_command("import_products", path, "--batch-size", str(args.batch_size), stdout=out)
+        print(
+            f"{run:6}: {args.rows:,} rows in {results[run]:.1f} s "
+            f"({args.rows / results[run]:,.0f} rows/s) - {out.getvalue().strip()}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+DRF's JSONRenderer / JSONParser vs the orjson-backed classes in config/.
+
+    python -m benchmarks.json_render [--rows 10000] [--repeat 9]
+
+Serializes `--rows` order items and `--rows` orders (with their items)
+once, then times only the JSON step on that data: rendering it to bytes,
+and parsing the bytes back. Both renderers must produce the same bytes.
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+
+from benchmarks import setup
+
+
+def median_ms(repeat, fn):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=9)
+    args = parser.parse_args()
+
+    setup(in_memory=True)
+
+    from django.core.management import call_command
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from config import renderers
+    from config.parsers import FastJSONParser
+    from config.renderers import FastJSONRenderer
+    from orders.models import Order, OrderItem
+    from orders.serializers import OrderItemSerializer, OrderSerializer
+
+    if renderers.orjson is None:
+        sys.exit("orjson is not installed: pip install orjson")
+
+    call_command("seed_perf", orders=args.rows, stdout=sys.stderr)
+    payloads = {
+        "order-items": OrderItemSerializer(OrderItem.objects.order_by("id")[: args.rows], many=True).data,
+        "orders": OrderSerializer(Order.objects.prefetch_related("items").order_by("id")[: args.rows], many=True).data,
+    }
+
+    print(f"{'payload':12} {'step':6} {'size':>8} {'drf':>11} {'orjson':>11} {'speedup':>8}")
+    for name, data in payloads.items():
+        body = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == body
+        size = len(body) / 1e6
+        slow = median_ms(args.repeat, lambda: JSONRenderer().render(data))
+        fast = median_ms(args.repeat, lambda: FastJSONRenderer().render(data))
+        print(f"{name:12} {'render':6} {size:6.1f} MB {slow:8.1f} ms {fast:8.1f} ms {slow / fast:7.1f}x")
+
+        assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(io.BytesIO(body))
+        slow = median_ms(args.repeat, lambda: JSONParser().parse(io.BytesIO(body)))
+        fast = median_ms(args.repeat, lambda: FastJSONParser().parse(io.BytesIO(body)))
+        print(f"{'':12} {'parse':6} {'':8} {slow:8.1f} ms {fast:8.1f} ms {slow / fast:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
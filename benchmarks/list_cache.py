@@ -0,0 +1,84 @@
+"""
+Back-office list pages with and without a cached table (config/fragments.py).
+
+    python -m benchmarks.list_cache [--orders 100000] [--repeat 50]
+
+Seeds `--orders` orders (and `seed_perf`'s customers and products), then
+times the first page of `/orders/`, `/products/` and `/customers/`:
+
+- "cold": the cache is cleared before each request, so the version query,
+  the rows query and the table render all run;
+- "cached": the table comes from the cache; the version query still runs.
+
+Reports the median over `--repeat` requests for the whole page. It also
+times the table alone: the rows query plus rendering `table_template_name`
+when cold, one cache read when cached. The version query runs on every
+request either way, so it is in both page columns and in neither table
+column.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks import setup
+
+
+def median_ms(repeat, fn, before=None):
+    timings = []
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.template.loader import render_to_string
+    from django.test import Client, RequestFactory
+    from django.urls import resolve
+
+    from config.fragments import CachedTableMixin
+
+    settings.DEBUG = False
+    call_command("seed_perf", orders=args.orders, stdout=sys.stderr)
+    client = Client()
+
+    print(f"{'page':12} {'part':6} {'cold':>10} {'cached':>10} {'speedup':>8}")
+    for url in ("/orders/", "/products/", "/customers/"):
+        assert client.get(url).status_code == 200
+        cold = median_ms(args.repeat, lambda: client.get(url), before=cache.clear)
+        client.get(url)
+        warm = median_ms(args.repeat, lambda: client.get(url))
+        print(f"{url:12} {'page':6} {cold:7.2f} ms {warm:7.2f} ms {cold / warm:7.1f}x")
+
+        view = resolve(url).func.view_class()
+        view.setup(RequestFactory().get(url))
+        view.object_list = view.get_queryset()
+        key = view.table_cache_key()
+
+        def render_table():
+            context = super(CachedTableMixin, view).get_context_data()
+            return render_to_string(view.table_template_name, context, view.request)
+
+        assert cache.get(key) == render_table()
+        cold = median_ms(args.repeat, render_table)
+        warm = median_ms(args.repeat, lambda: cache.get(key))
+        print(f"{'':12} {'table':6} {cold:7.2f} ms {warm:7.2f} ms {cold / warm:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
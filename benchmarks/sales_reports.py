@@ -0,0 +1,102 @@
+"""
+Sales report latency from the daily rollups vs live item aggregates.
+
+    python -m benchmarks.sales_reports [--years 3] [--orders-per-day 100] [--items-per-order 4]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from benchmarks import setup, timer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--orders-per-day", type=int, default=100)
+    parser.add_argument("--items-per-order", type=int, default=4)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--customers", type=int, default=2000)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.test import Client
+    from django.utils import timezone
+
+    from customers.models import Customer
+    from orders.models import Order, OrderItem
+    from products.models import Product
+    from reports import rollup
+    from reports.queries import SOURCES
+
+    rng = random.Random(0)
+    Customer.objects.bulk_create(Customer(name=f"Customer {i}") for i in range(args.customers))
+    Product.objects.bulk_create(
+        Product(sku=f"SKU-{i}", name=f"Product {i}", price=Decimal("9.99")) for i in range(args.products)
+    )
+    customer_ids = list(Customer.objects.values_list("id", flat=True))
+    product_ids = list(Product.objects.values_list("id", flat=True))
+
+    days = [date.today() - timedelta(days=n) for n in range(args.years * 365)]
+    Order.objects.bulk_create(
+        (
+            Order(customer_id=rng.choice(customer_ids), status=rng.choice(Order.Status.values))
+            for _ in range(len(days) * args.orders_per_day)
+        ),
+        batch_size=2000,
+    )
+    # order_date is auto_now_add, so spread the orders over the days afterwards.
+    orders = list(Order.objects.only("id").order_by("id"))
+    for i, order in enumerate(orders):
+        order.order_date = days[i // args.orders_per_day]
+    Order.objects.bulk_update(orders, ["order_date"], batch_size=2000)
+    OrderItem.objects.bulk_create(
+        (
+            OrderItem(order_id=order.pk, product_id=product_id, quantity=rng.randint(1, 5), unit_price=Decimal("9.99"))
+            for order in orders
+            for product_id in rng.sample(product_ids, args.items_per_order)
+        ),
+        batch_size=2000,
+    )
+    print(f"{len(orders):,} orders, {len(orders) * args.items_per_order:,} items over {len(days):,} days")
+
+    # Age the seed data so the incremental run only sees the changes below.
+    yesterday = timezone.now() - timedelta(days=1)
+    Order.objects.update(updated_at=yesterday)
+    OrderItem.objects.update(updated_at=yesterday)
+
+    results = {}
+    with timer(results, "full"):
+        rollup.refresh(full=True)
+    Order.objects.filter(pk__in=[order.pk for order in rng.sample(orders, 50)]).update(
+        status=Order.Status.SHIPPED, updated_at=timezone.now()
+    )
+    with timer(results, "incremental"):
+        changed = rollup.refresh()
+    print(f"refresh --full: {results['full']:.1f} s; incremental ({len(changed)} changed days): {results['incremental'] * 1000:.0f} ms")
+
+    client = Client()
+    statuses = [Order.Status.PLACED, Order.Status.SHIPPED]
+    print(f"{'':12} {'rollup query':>13} {'request':>9} {'live query':>11} {'request':>9}")
+    for dimension in ("day", "product", "customer"):
+        timings = []
+        for source in ("rollup", "live"):
+            query = lambda: list(SOURCES[source](dimension, date_from=days[-1], status=statuses, limit=100))
+            query()  # warm up
+            start = time.perf_counter()
+            query()
+            timings.append(time.perf_counter() - start)
+
+            url = f"/api/reports/sales/by-{dimension}/?source={source}&date_from={days[-1]}&status=PLACED&status=SHIPPED"
+            client.get(url)
+            start = time.perf_counter()
+            assert client.get(url).status_code == 200
+            timings.append(time.perf_counter() - start)
+        print(f"by-{dimension:9} " + " ".join(f"{t * 1000:{w}.1f} ms" for t, w in zip(timings, (10, 6, 8, 6))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+FTS5 autocomplete (config/search.py) vs `icontains` and full `<select>` lists.
+
+    python -m benchmarks.search [--rows 100000] [--repeat 50]
+
+Seeds `--rows` products and customers, then reports:
+
+- "search": the autocomplete endpoints (top 10, including the row load
+  and JSON) for short and long prefixes, next to the sorted
+  `LIKE '%q%'` query a naive search would run (which scans every row).
+- "picker": rendering the order-item product field as a full `<select>`
+  (every product) and as the autocomplete widget.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks import setup
+
+
+def timings(repeat, fn):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), statistics.quantiles(samples, n=20)[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+
+    from django import forms
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+
+    from customers.models import Customer
+    from orders.forms import OrderItemForm
+    from products.models import Product
+
+    settings.DEBUG = False
+    call_command(
+        "seed_perf", orders=1, customers=args.rows, products=args.rows, stdout=sys.stderr
+    )
+    client = Client()
+
+    cases = [
+        ("products", "p", Product, "name"),
+        ("products", "prod 12", Product, "name"),
+        ("products", "perf-00012", Product, "sku"),
+        ("customers", "cust", Customer, "name"),
+        ("customers", "custo", Customer, "name"),
+        ("customers", "555-00012", Customer, "phone"),
+    ]
+    print(f"{'search':10} {'query':12} {'matches':>8} {'fts p50':>9} {'fts p95':>9} {'like p50':>9}")
+    for app, query, model, column in cases:
+        url = f"/{app}/search/"
+        assert client.get(url, {"q": query}).json()["results"]
+        fts_p50, fts_p95 = timings(args.repeat, lambda: client.get(url, {"q": query}))
+        like = model.objects.filter(**{f"{column}__icontains": query.split()[-1]})
+        like_p50, _ = timings(args.repeat, lambda: list(like.order_by(column)[:10]))
+        print(f"{app:10} {query:12} {like.count():8} {fts_p50:6.2f} ms {fts_p95:6.2f} ms {like_p50:6.2f} ms")
+
+    field = OrderItemForm.base_fields["product"]
+    full = forms.Select(choices=field.choices)
+    widget = OrderItemForm().fields["product"].widget
+    for name, picker in (("full <select>", full), ("autocomplete", widget)):
+        html = picker.render("items-0-product", None)
+        p50, _ = timings(min(args.repeat, 5), lambda: picker.render("items-0-product", None))
+        print(f"{'picker':10} {name:14} {p50:9.2f} ms per row, {len(html) / 1024:9.1f} KiB per row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Overhead of ServerTimingMiddleware per request.
+
+    python -m benchmarks.server_timing [--requests 500]
+
+Requests alternate between timing on and off, so drift affects both.
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks import setup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+
+    from orders.models import Order
+
+    settings.DEBUG = False
+    call_command("seed_perf", orders=2000, customers=200, products=100, stdout=open("/dev/null", "w"))
+    order_id = Order.objects.values_list("id", flat=True).first()
+    client = Client()
+
+    for label, url in (
+        ("api order list", "/api/orders/"),
+        ("api order", f"/api/orders/{order_id}/"),
+        ("web order list", "/orders/"),
+    ):
+        timings = {True: [], False: []}
+        for i in range(args.requests * 2):
+            enabled = settings.PERF_TIMING_ENABLED = bool(i % 2)
+            start = time.perf_counter()
+            client.get(url)
+            timings[enabled].append((time.perf_counter() - start) * 1000)
+        on, off = statistics.median(timings[True]), statistics.median(timings[False])
+        print(f"{label:15} off {off:7.2f} ms   on {on:7.2f} ms   overhead {(on - off) * 1000:+6.0f} us ({on / off - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
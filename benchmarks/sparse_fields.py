@@ -0,0 +1,63 @@
+"""
+Payload size and response time of full vs `?fields=` / `?expand=` API responses.
+
+    python -m benchmarks.sparse_fields [--requests 200] [--page-size 200]
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks import setup
+
+VARIANTS = {
+    "order list": [
+        "/api/orders/?page_size={page_size}",
+        "/api/orders/?page_size={page_size}&fields=id,status,order_date,subtotal",
+        "/api/orders/?page_size={page_size}&fields=id,items.product,items.quantity",
+        "/api/orders/?page_size={page_size}&expand=customer,items.product",
+    ],
+    "customer list": [
+        "/api/customers/?page_size={page_size}",
+        "/api/customers/?page_size={page_size}&fields=id,name",
+    ],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    settings.DEBUG = False
+    call_command("seed_perf", orders=5000, customers=500, products=200, stdout=open("/dev/null", "w"))
+    client = Client()
+
+    for label, urls in VARIANTS.items():
+        print(label)
+        for url in urls:
+            url = url.format(page_size=args.page_size)
+            size = len(client.get(url).content)
+            with CaptureQueriesContext(connection) as captured:
+                client.get(url)
+            queries = len(captured)
+            timings = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+            query = url.partition("&")[2] or "(all fields)"
+            print(f"  {query:45} {size / 1024:8.1f} KB {statistics.median(timings):8.2f} ms {queries:3} queries")
+
+
+if __name__ == "__main__":
+    main()
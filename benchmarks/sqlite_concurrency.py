@@ -0,0 +1,147 @@
+"""
+Mixed reader/writer throughput of the development vs production SQLite profile.
+
+    python -m benchmarks.sqlite_concurrency [--workers 8] [--seconds 10] [--write-ratio 0.2]
+
+Each profile runs in its own subprocess, because settings are read at
+import time. That subprocess seeds a file database and forks `--workers`
+processes, as a pre-fork server would. Each worker loops for a fixed
+time:
+
+- Readers GET a page of orders and one order from the API.
+- Writers run a read-then-write transaction: lock an existing order,
+  update its status, and create a new order with three items.
+
+Between operations each worker calls close_old_connections(), as Django
+does around every request, so CONN_MAX_AGE takes effect.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import time
+
+
+def run_worker(seed, args, customer_id, product_ids, order_ids, queue):
+    from decimal import Decimal
+
+    from django.db import OperationalError, close_old_connections, transaction
+    from django.test import Client
+
+    from orders.models import Order, OrderItem
+
+    rng = random.Random(seed)
+    client = Client()
+    stats = {"reads": 0, "writes": 0, "errors": 0, "latencies": []}
+    deadline = time.perf_counter() + args.seconds
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if rng.random() < args.write_ratio:
+                with transaction.atomic():
+                    existing = Order.objects.select_for_update().get(pk=rng.choice(order_ids))
+                    existing.status = rng.choice(Order.Status.values)
+                    existing.save(update_fields=["status", "updated_at"])
+                    order = Order.objects.create(customer_id=customer_id)
+                    for product_id in rng.sample(product_ids, 3):
+                        OrderItem.objects.create(
+                            order=order, product_id=product_id, quantity=1, unit_price=Decimal("9.99")
+                        )
+                stats["writes"] += 1
+            else:
+                assert client.get("/api/orders/?page_size=20").status_code == 200
+                assert client.get(f"/api/orders/{rng.choice(order_ids)}/").status_code == 200
+                stats["reads"] += 1
+            stats["latencies"].append(time.perf_counter() - start)
+        except OperationalError:
+            stats["errors"] += 1
+        finally:
+            close_old_connections()
+    queue.put(stats)
+
+
+def run_profile(args):
+    from benchmarks import setup
+
+    setup()
+
+    from decimal import Decimal
+
+    from django.db import connection
+
+    from customers.models import Customer
+    from orders.models import Order, OrderItem
+    from products.models import Product
+
+    customer = Customer.objects.create(name="Bench")
+    Product.objects.bulk_create(
+        Product(sku=f"SKU-{i}", name=f"Product {i}", price=Decimal("9.99")) for i in range(50)
+    )
+    product_ids = list(Product.objects.values_list("id", flat=True))
+    for _ in range(200):
+        order = Order.objects.create(customer=customer)
+        for product_id in random.sample(product_ids, 3):
+            OrderItem.objects.create(order=order, product_id=product_id, quantity=1, unit_price=Decimal("9.99"))
+    order_ids = list(Order.objects.values_list("id", flat=True))
+    with connection.cursor() as cursor:
+        journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+    # Children must open their own connections.
+    connection.close()
+
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    workers = [
+        ctx.Process(target=run_worker, args=(seed, args, customer.pk, product_ids, order_ids, queue))
+        for seed in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    results = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    latencies = sorted(latency for result in results for latency in result["latencies"])
+    print(json.dumps({
+        "journal_mode": journal_mode,
+        "reads": sum(result["reads"] for result in results),
+        "writes": sum(result["writes"] for result in results),
+        "errors": sum(result["errors"] for result in results),
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--profile", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        return run_profile(args)
+
+    for profile in ("development", "production"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.sqlite_concurrency", "--profile", profile, *sys.argv[1:]],
+            env=dict(os.environ, ERP_DB_PROFILE=profile),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        stats = json.loads(out.strip().splitlines()[-1])
+        ops = (stats["reads"] + stats["writes"]) / args.seconds
+        print(
+            f"{profile:11} journal={stats['journal_mode']:6} {ops:8,.0f} ops/s "
+            f"(reads {stats['reads'] / args.seconds:,.0f}/s, writes {stats['writes'] / args.seconds:,.0f}/s), "
+            f"'database is locked' errors: {stats['errors']}, p95 {stats['p95_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
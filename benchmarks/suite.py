@@ -0,0 +1,216 @@
+"""
+End-to-end latency, query counts and memory of the main pages and API
+endpoints at several data scales.
+
+    python -m benchmarks.suite [--scales 1000,10000,100000] [--repeat 20] [--output bench.json]
+    python -m benchmarks.suite --baseline bench.json --output new.json
+
+Scales are order counts. Each scale tops up the same database with
+`manage.py seed_perf` (customers and products grow with it), then every
+endpoint is requested once to warm up and `--repeat` times to time it.
+Query counts and peak Python memory come from separate requests, so
+neither instrument skews the timings.
+
+With `--baseline`, results are compared against an earlier JSON file;
+the run exits with status 1 if any endpoint's p95 grows by more than
+`--threshold` (and at least `--min-delta-ms`) or it issues more queries.
+"""
+
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import setup
+
+
+def endpoints(order_id, product_ids, today):
+    week_ago = today - timedelta(days=7)
+    ids = ",".join(map(str, product_ids))
+    return {
+        "web:customers": "/customers/",
+        "web:products": "/products/",
+        "web:orders": "/orders/",
+        "web:orders-last-page": "/orders/?page=last",
+        "web:order-detail": f"/orders/{order_id}/",
+        "web:product-prices": f"/products/prices/?ids={ids}",
+        "api:customers": "/api/customers/",
+        "api:products": "/api/products/",
+        "api:orders": "/api/orders/",
+        "api:order": f"/api/orders/{order_id}/",
+        "api:order-items": "/api/order-items/",
+        "api:sales-by-day": f"/api/reports/sales/by-day/?date_from={today - timedelta(days=365)}",
+        "api:sales-by-product": "/api/reports/sales/by-product/",
+        "api:export-week": f"/api/orders/export/?date_from={week_ago}",
+    }
+
+
+def request(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, (url, response.status_code)
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def measure(client, url, repeat):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    request(client, url)  # warm up caches and connections
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        request(client, url)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    with CaptureQueriesContext(connection) as captured:
+        request(client, url)
+    # Read now: the next request resets the connection's query log.
+    queries = len(captured)
+
+    tracemalloc.start()
+    request(client, url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(statistics.quantiles(timings, n=20, method="inclusive")[-1], 2),
+        "queries": queries,
+        "peak_kb": round(peak / 1024),
+    }
+
+
+def run(scales, repeat):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.test import Client
+    from django.utils import timezone as dj_timezone
+
+    from customers.models import Customer
+    from orders.models import Order, OrderItem
+    from products.models import Product
+    from reports import rollup
+
+    client = Client()
+    results = {}
+    for scale in scales:
+        current = Order.objects.count()
+        customers = max(100, scale // 10) - Customer.objects.count()
+        products = max(50, min(scale // 20, 5000)) - Product.objects.count()
+        call_command(
+            "seed_perf",
+            orders=scale - current,
+            customers=max(customers, 0),
+            products=max(products, 0),
+            seed=scale,
+            stdout=sys.stderr,
+        )
+        rollup.refresh()
+
+        order_id = Order.objects.order_by("id").values_list("id", flat=True)[Order.objects.count() // 2]
+        product_ids = list(Product.objects.order_by("id").values_list("id", flat=True)[:20])
+        stats = {}
+        for name, url in endpoints(order_id, product_ids, dj_timezone.localdate()).items():
+            stats[name] = measure(client, url, repeat)
+            print(f"  {scale:>9,} {name:22} p50 {stats[name]['p50_ms']:8.2f} ms", file=sys.stderr)
+        results[str(scale)] = {
+            "orders": Order.objects.count(),
+            "items": OrderItem.objects.count(),
+            "customers": Customer.objects.count(),
+            "products": Product.objects.count(),
+            "endpoints": stats,
+        }
+
+    from django import get_version
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": get_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "db_profile": settings.DB_PROFILE,
+            "repeat": repeat,
+        },
+        "scales": results,
+    }
+
+
+def compare(current, baseline, threshold, min_delta_ms):
+    """
+    Print a side-by-side table and return the regressions found.
+    """
+    regressions = []
+    print(
+        f"{'scale':>9} {'endpoint':22} {'p50 ms':>8} {'p95 ms':>8} {'baseline':>8} {'change':>7} "
+        f"{'queries':>8} {'peak KB':>8}"
+    )
+    for scale, run in current["scales"].items():
+        base_run = baseline["scales"].get(scale, {"endpoints": {}})
+        for name, stats in run["endpoints"].items():
+            base = base_run["endpoints"].get(name)
+            flag = ""
+            if base is None:
+                base_p95, change, queries = "-", "-", stats["queries"]
+            else:
+                ratio = stats["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0
+                slower = ratio > threshold and stats["p95_ms"] - base["p95_ms"] >= min_delta_ms
+                more_queries = stats["queries"] > base["queries"]
+                base_p95, change = f"{base['p95_ms']:.2f}", f"{ratio:+.0%}"
+                queries = stats["queries"]
+                if queries != base["queries"]:
+                    queries = f"{base['queries']}->{queries}"
+                if slower or more_queries:
+                    flag = "  REGRESSION"
+                    regressions.append((scale, name))
+            print(
+                f"{scale:>9} {name:22} {stats['p50_ms']:8.2f} {stats['p95_ms']:8.2f} {base_p95:>8} {change:>7} "
+                f"{queries:>8} {stats['peak_kb']:>8}{flag}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="1000,10000,100000", help="Comma-separated order counts.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--baseline", help="Earlier results to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p95 growth (0.25 = 25%%).")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore p95 changes smaller than this.")
+    args = parser.parse_args()
+
+    scales = sorted(int(scale) for scale in args.scales.split(","))
+    setup()
+
+    from django.conf import settings
+
+    settings.DEBUG = False
+
+    current = run(scales, args.repeat)
+    with open(args.output, "w") as out:
+        json.dump(current, out, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"{len(regressions)} regression(s).", file=sys.stderr)
+            sys.exit(1)
+    else:
+        compare(current, {"scales": {}}, args.threshold, args.min_delta_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Incremental change feeds: `GET /api/<resource>/changes/?cursor=`.
+
+A feed lists a collection's saved rows and its tombstones (deleted rows)
+in `(updated_at, id)` order. Every response carries a `next` cursor; a
+sync client stores it and sends it back next time to get only what
+changed since. A page is two index range reads of `page_size + 1`
+entries (the table through its `updated_at` index, tombstones through
+`tombstone_feed`) merged in Python, so a sync costs the same however large
+the table is.
+"""
+
+import base64
+import binascii
+import heapq
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from config.pagination import KeysetPagination
+
+from .models import Tombstone
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Cursor expired; deletes since it may have been pruned. Sync again without a cursor."
+    default_code = "cursor_expired"
+
+
+def encode_feed_cursor(position, issued):
+    stamp, pk = position
+    raw = json.dumps([stamp.isoformat(), pk, issued.isoformat()]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_feed_cursor(token):
+    """
+    Return `(position, issued)`, `position` being the `(updated_at, id)`
+    of the last entry returned; an empty token means the start of the feed.
+    """
+    if not token:
+        return None, None
+    try:
+        stamp, pk, issued = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        position, issued = (parse_datetime(stamp), int(pk)), parse_datetime(issued)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise Http404("Invalid cursor.")
+    if position[0] is None or issued is None:
+        raise Http404("Invalid cursor.")
+    return position, issued
+
+
+def feed_window(queryset, stamp_field, id_field, position, until):
+    """
+    Entries of `queryset` after `position` and stamped before `until`, in
+    feed order.
+    """
+    queryset = queryset.filter(**{f"{stamp_field}__lt": until})
+    if position is not None:
+        stamp, pk = position
+        # The `>=` range walks the (stamp, id) index in order; the OR only
+        # drops the entries at `stamp` that were already returned.
+        queryset = queryset.filter(
+            Q(**{f"{stamp_field}__gt": stamp}) | Q(**{stamp_field: stamp, f"{id_field}__gt": pk}),
+            **{f"{stamp_field}__gte": stamp},
+        )
+    return queryset.order_by(stamp_field, id_field)
+
+
+class ChangeFeedMixin:
+    """
+    ViewSet mixin adding the `changes` list action. Objects are rendered
+    by the viewset's serializer, so `?fields=` / `?expand=` apply; list
+    filters do not, so a feed always covers the whole collection.
+    """
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """
+        Rows saved and deleted after `?cursor=`, oldest first.
+        """
+        now = timezone.now()
+        position, issued = decode_feed_cursor(request.query_params.get("cursor"))
+        if issued is not None and issued < now - timedelta(days=settings.CHANGE_FEED_RETENTION_DAYS):
+            raise CursorExpired()
+        until = now - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+        size = KeysetPagination().get_page_size(request)
+
+        saved = feed_window(self.get_queryset(), "updated_at", "pk", position, until)
+        deleted = feed_window(
+            Tombstone.objects.filter(resource=self.queryset.model._meta.label_lower),
+            "deleted_at",
+            "object_id",
+            position,
+            until,
+        ).values_list("deleted_at", "object_id")
+        entries = list(
+            heapq.merge(
+                ((obj.updated_at, obj.pk, obj) for obj in saved[: size + 1]),
+                ((stamp, pk, None) for stamp, pk in deleted[: size + 1]),
+                key=lambda entry: entry[:2],
+            )
+        )
+        has_more = len(entries) > size
+        entries = entries[:size]
+        if has_more:
+            position = entries[-1][:2]
+        else:
+            # Everything stamped before `until` has been returned, and no
+            # later commit can be stamped before it.
+            position = max(position, (until, 0)) if position else (until, 0)
+
+        objects = iter(self.get_serializer([obj for _, _, obj in entries if obj is not None], many=True).data)
+        stamp_field = serializers.DateTimeField()
+        results = [
+            {
+                "id": pk,
+                "changed_at": stamp_field.to_representation(stamp),
+                "deleted": obj is None,
+                "object": None if obj is None else next(objects),
+            }
+            for stamp, pk, obj in entries
+        ]
+        cursor = encode_feed_cursor(position, now)
+        return Response(
+            {
+                "next": replace_query_param(request.build_absolute_uri(), "cursor", cursor),
+                "has_more": has_more,
+                "results": results,
+            }
+        )
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from changes.models import Tombstone
+from changes.tombstones import TRACKED_MODELS
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete change-feed tombstones older than CHANGE_FEED_RETENTION_DAYS. "
+        "Feed cursors issued before then are refused, so no client misses them."
+    )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=settings.CHANGE_FEED_RETENTION_DAYS)
+        total = 0
+        # Per resource, so each delete is a range on the `tombstone_feed` index.
+        for label in TRACKED_MODELS:
+            resource = apps.get_model(label)._meta.label_lower
+            deleted, _ = Tombstone.objects.filter(resource=resource, deleted_at__lt=cutoff).delete()
+            total += deleted
+        self.stdout.write(f"Deleted {total} tombstones older than {cutoff:%Y-%m-%d %H:%M}.")
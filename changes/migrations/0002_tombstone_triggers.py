@@ -0,0 +1,25 @@
+from django.db import migrations
+
+from changes.tombstones import install_triggers, uninstall_triggers
+
+
+def install(apps, schema_editor):
+    install_triggers(schema_editor.connection, apps)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_triggers(schema_editor.connection, apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('changes', '0001_initial'),
+        ('customers', '0003_api_filter_indexes'),
+        ('products', '0004_api_filter_indexes'),
+        ('orders', '0005_api_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
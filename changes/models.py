@@ -0,0 +1,23 @@
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """
+    A deleted row of a change-feed resource. Written only by the delete
+    triggers in `changes.tombstones`, so cascades, bulk deletes and raw SQL
+    are all recorded.
+    """
+
+    # Model label of the deleted row, e.g. "orders.orderitem".
+    resource = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.resource} #{self.object_id}"
+
+    class Meta:
+        indexes = [
+            # A resource's deletes in feed order.
+            models.Index(fields=["resource", "deleted_at", "object_id"], name="tombstone_feed"),
+        ]
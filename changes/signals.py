@@ -0,0 +1,11 @@
+from django.db import connections
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .tombstones import restore_triggers
+
+
+@receiver(post_migrate)
+def restore_tombstone_triggers(sender, using, **kwargs):
+    if sender.name == "changes":
+        restore_triggers(connections[using])
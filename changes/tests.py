@@ -0,0 +1,176 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from changes.feed import encode_feed_cursor, feed_window
+from changes.models import Tombstone
+from testing.query_plans import QueryPlanAssertions
+from customers.models import Customer
+from orders.models import Order, OrderItem
+from products.models import Product
+
+
+@override_settings(CHANGE_FEED_SETTLE_SECONDS=0)
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.customer = Customer.objects.create(name="Acme")
+        self.widget = Product.objects.create(sku="W-1", name="Widget", price=Decimal("2.00"))
+        self.orders = [Order.objects.create(customer=self.customer) for _ in range(3)]
+
+    def feed(self, url, **params):
+        resp = self.api.get(url, params)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return resp.json()
+
+    def sync(self, url, **params):
+        """
+        Follow `next` until `has_more` is false; return all entries and the
+        cursor to resume from.
+        """
+        data = self.feed(url, **params)
+        entries = data["results"]
+        while data["has_more"]:
+            # `next` keeps the other parameters.
+            data = self.feed(data["next"])
+            entries.extend(data["results"])
+        return entries, data["next"]
+
+    def test_first_sync_returns_every_row(self):
+        entries, _ = self.sync("/api/orders/changes/")
+        self.assertEqual([e["id"] for e in entries], [o.pk for o in self.orders])
+        self.assertFalse(any(e["deleted"] for e in entries))
+        self.assertEqual(entries[0]["object"]["id"], self.orders[0].pk)
+        self.assertEqual(entries[0]["changed_at"], entries[0]["object"]["updated_at"])
+
+    def test_resumes_with_only_later_changes(self):
+        _, cursor = self.sync("/api/orders/changes/")
+        self.assertEqual(self.feed(cursor)["results"], [])
+
+        first, second, _ = self.orders
+        first.status = Order.Status.PLACED
+        first.save()
+        deleted_pk = second.pk
+        second.delete()
+        created = Order.objects.create(customer=self.customer)
+
+        entries, cursor = self.sync(cursor)
+        self.assertEqual(
+            [(e["id"], e["deleted"]) for e in entries],
+            [(first.pk, False), (deleted_pk, True), (created.pk, False)],
+        )
+        self.assertEqual(entries[0]["object"]["status"], "PLACED")
+        self.assertIsNone(entries[1]["object"])
+        self.assertEqual(self.feed(cursor)["results"], [])
+
+    def test_order_delete_records_item_tombstones(self):
+        order = self.orders[0]
+        items = [
+            OrderItem.objects.create(order=order, product=product, unit_price=Decimal("2.00"))
+            for product in (self.widget, Product.objects.create(sku="G-1", name="Gadget", price=1))
+        ]
+        item_pks, order_pk = [item.pk for item in items], order.pk
+        _, cursor = self.sync("/api/order-items/changes/")
+        order.delete()
+
+        entries, _ = self.sync(cursor)
+        self.assertEqual([(e["id"], e["deleted"]) for e in entries], [(pk, True) for pk in item_pks])
+        self.assertIn(order_pk, [e["id"] for e in self.sync("/api/orders/changes/")[0] if e["deleted"]])
+
+    def test_pages_through_equal_timestamps(self):
+        stamp = timezone.now() - timedelta(minutes=1)
+        Order.objects.update(updated_at=stamp)
+        first, second, third = [order.pk for order in self.orders]
+        self.orders[1].delete()
+        Tombstone.objects.update(deleted_at=stamp)
+
+        entries, _ = self.sync("/api/orders/changes/", page_size=1)
+        self.assertEqual([(e["id"], e["deleted"]) for e in entries], [(first, False), (second, True), (third, False)])
+
+    def test_fields_apply_to_objects(self):
+        entries = self.feed("/api/orders/changes/", fields="id,status")["results"]
+        self.assertEqual(entries[0]["object"], {"id": self.orders[0].pk, "status": "DRAFT"})
+
+    def test_unsettled_changes_wait(self):
+        with override_settings(CHANGE_FEED_SETTLE_SECONDS=60):
+            data = self.feed("/api/customers/changes/")
+        self.assertEqual(data["results"], [])
+        # The cursor does not move past the unsettled rows.
+        self.assertEqual([e["id"] for e in self.feed(data["next"])["results"]], [self.customer.pk])
+
+    def test_page_cost_does_not_grow_with_the_table(self):
+        _, cursor = self.sync("/api/products/changes/")
+        Product.objects.bulk_create(Product(sku=f"B-{n}", name="Bulk", price=1) for n in range(200))
+        _, cursor = self.sync(cursor)
+        widget_pk = self.widget.pk
+        self.widget.delete()
+        # Decode the cursor, read saved rows and tombstones, no more.
+        with self.assertNumQueries(2):
+            entries = self.feed(cursor)["results"]
+        self.assertEqual([(e["id"], e["deleted"]) for e in entries], [(widget_pk, True)])
+
+    def test_bad_and_expired_cursors(self):
+        self.assertEqual(self.api.get("/api/orders/changes/", {"cursor": "!!"}).status_code, 404)
+        stale = encode_feed_cursor((timezone.now(), 0), timezone.now() - timedelta(days=31))
+        resp = self.api.get("/api/orders/changes/", {"cursor": stale})
+        self.assertEqual(resp.status_code, 410)
+        self.assertIn("Cursor expired", resp.json()["detail"])
+
+
+class TombstoneTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Acme")
+
+    def test_every_delete_path_is_recorded(self):
+        order = Order.objects.create(customer=self.customer)
+        Order.objects.filter(pk=order.pk).delete()
+        # Raw SQL, past the PROTECT check.
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM customers_customer WHERE id = %s", [self.customer.pk])
+        self.assertEqual(
+            sorted(Tombstone.objects.values_list("resource", "object_id")),
+            [("customers.customer", self.customer.pk), ("orders.order", order.pk)],
+        )
+
+    def test_triggers_restored_after_migrate(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER "customers_customer_tombstone"')
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        self.customer.delete()
+        self.assertTrue(Tombstone.objects.filter(resource="customers.customer").exists())
+
+    def test_prune_keeps_retention_window(self):
+        old = Customer.objects.create(name="Old")
+        old_pk, kept_pk = old.pk, self.customer.pk
+        old.delete()
+        self.customer.delete()
+        Tombstone.objects.filter(object_id=old_pk).update(deleted_at=timezone.now() - timedelta(days=31))
+        out = StringIO()
+        call_command("prune_tombstones", stdout=out)
+        self.assertIn("Deleted 1 tombstones", out.getvalue())
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True)), [kept_pk])
+
+
+class ChangeFeedQueryPlanTests(QueryPlanAssertions, TestCase):
+    def test_windows_walk_an_index_in_feed_order(self):
+        now = timezone.now()
+        for position in (None, (now - timedelta(days=1), 10)):
+            with self.subTest(position=position):
+                for model, index in [
+                    (Order, "order_updated_at"),
+                    (OrderItem, "orderitem_updated_at"),
+                    (Product, "product_updated_at"),
+                    (Customer, "customer_updated_at"),
+                ]:
+                    self.assertIndexed(feed_window(model.objects.all(), "updated_at", "pk", position, now)[:51], index=index)
+                tombstones = Tombstone.objects.filter(resource="orders.order")
+                self.assertIndexed(
+                    feed_window(tombstones, "deleted_at", "object_id", position, now)[:51], index="tombstone_feed"
+                )
@@ -0,0 +1,59 @@
+"""
+Delete triggers that record tombstones for the change feed.
+
+Each tracked table gets an `AFTER DELETE` trigger inserting a
+`changes_tombstone` row. Triggers see every delete: `Model.delete()`,
+queryset deletes, the collector's cascades (deleting an order deletes its
+items with one `DELETE ... WHERE order_id IN (...)`, which sends no
+signals) and raw SQL.
+
+`deleted_at` is written in the text format Django stores datetimes in on
+SQLite (UTC, microseconds, no fraction when they are zero), so it compares
+and sorts with `updated_at` and with datetime parameters.
+
+Like the search triggers (config/search.py), these are dropped when a
+migration rebuilds the table, so `restore_triggers()` runs after every
+`migrate`. SQLite only; other backends record no tombstones.
+"""
+
+from django.apps import apps as global_apps
+
+# Models whose deletes are recorded, by label.
+TRACKED_MODELS = ["customers.Customer", "products.Product", "orders.Order", "orders.OrderItem"]
+
+
+def trigger_name(model):
+    return f"{model._meta.db_table}_tombstone"
+
+
+def trigger_sql(model, tombstone_model, quote):
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS {quote(trigger_name(model))} AFTER DELETE ON {quote(model._meta.db_table)} "
+        f"BEGIN INSERT INTO {quote(tombstone_model._meta.db_table)}(resource, object_id, deleted_at) "
+        f"VALUES ('{model._meta.label_lower}', old.{quote(model._meta.pk.column)}, "
+        "replace(strftime('%Y-%m-%d %H:%M:%f', 'now') || '000', '.000000', '')); END"
+    )
+
+
+def install_triggers(connection, apps=global_apps):
+    if connection.vendor != "sqlite":
+        return
+    tombstone_model = apps.get_model("changes", "Tombstone")
+    with connection.cursor() as cursor:
+        for label in TRACKED_MODELS:
+            cursor.execute(trigger_sql(apps.get_model(label), tombstone_model, connection.ops.quote_name))
+
+
+def uninstall_triggers(connection, apps=global_apps):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for label in TRACKED_MODELS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {connection.ops.quote_name(trigger_name(apps.get_model(label)))}")
+
+
+def restore_triggers(connection):
+    """
+    Recreate triggers dropped by table rebuilds.
+    """
+    install_triggers(connection)
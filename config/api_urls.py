@@ -1,13 +1,24 @@
+from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from config.views import perf_product_cache, perf_routes
+
 from customers.views import CustomerViewSet
 from products.views import ProductViewSet
 from orders.views import OrderViewSet, OrderItemViewSet
+from reports.views import SalesReportViewSet
 
 router = DefaultRouter()
 router.register(r"customers", CustomerViewSet, basename="customer")
 router.register(r"products", ProductViewSet, basename="product")
 router.register(r"orders", OrderViewSet, basename="order")
 router.register(r"order-items", OrderItemViewSet, basename="orderitem")
+router.register(r"reports/sales", SalesReportViewSet, basename="sales-report")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("perf/routes/", perf_routes, name="perf-routes"),
+    path("perf/product-cache/", perf_product_cache, name="perf-product-cache"),
+    # Async read-only mirrors of the list/detail endpoints, for ASGI.
+    path("async/", include("config.async_urls")),
+    *router.urls,
+]
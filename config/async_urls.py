@@ -0,0 +1,17 @@
+from django.urls import path
+
+from config.async_views import AsyncReadView
+from customers.views import CustomerViewSet
+from orders.views import OrderViewSet
+from products.views import ProductViewSet
+from products.web_views import product_price_async
+
+urlpatterns = [
+    path("customers/", AsyncReadView.as_view(viewset_class=CustomerViewSet), name="async-customer-list"),
+    path("customers/<int:pk>/", AsyncReadView.as_view(viewset_class=CustomerViewSet), name="async-customer-detail"),
+    path("products/", AsyncReadView.as_view(viewset_class=ProductViewSet), name="async-product-list"),
+    path("products/<int:pk>/", AsyncReadView.as_view(viewset_class=ProductViewSet), name="async-product-detail"),
+    path("products/<int:pk>/price/", product_price_async, name="async-product-price"),
+    path("orders/", AsyncReadView.as_view(viewset_class=OrderViewSet), name="async-order-list"),
+    path("orders/<int:pk>/", AsyncReadView.as_view(viewset_class=OrderViewSet), name="async-order-detail"),
+]
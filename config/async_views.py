@@ -0,0 +1,131 @@
+"""
+Async read-only JSON endpoints, mounted under `/api/async/`.
+
+Each view mirrors a DRF viewset's list and detail responses using the
+async ORM, so under ASGI a request waiting on the database or a slow
+client holds no worker thread. Objects are built by the viewset
+serializer's compiled `RowEncoder` (config/encoders.py), so each object
+is rendered byte for byte as the DRF endpoint renders it. `?fields=` is
+supported; `?expand=` is not.
+
+Lists and details are filtered by the viewset's `filterset_class`, as on
+the DRF endpoints. Lists are keyset-paginated like the web pages
+(`?cursor=`, plus `?page_size=` up to the API maximum). Validators are
+the DRF endpoints': an ETag on lists, ETag and Last-Modified on details.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views import View
+from rest_framework import serializers
+from rest_framework.utils.urls import replace_query_param
+
+from config.conditional import acollection_version, make_etag, not_modified, set_validators
+from config.encoders import compiled_encoder
+from config.fieldsets import parse_paths
+from config.pagination import KeysetPagination, decode_cursor, keyset_page, keyset_window
+from config.renderers import FastJSONRenderer
+
+
+def json_response(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), content_type="application/json", status=status)
+
+
+def page_size(request):
+    """
+    `?page_size=` as the DRF paginator reads it: invalid values give the
+    default, large ones are clamped.
+    """
+    default = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    try:
+        size = int(request.GET[KeysetPagination.page_size_query_param])
+    except (KeyError, ValueError):
+        return default
+    return min(size, KeysetPagination.max_page_size) if size > 0 else default
+
+
+class AsyncReadView(View):
+    """
+    `GET` list (no `pk`) or detail for `viewset_class`'s queryset and
+    serializer.
+    """
+
+    viewset_class = None
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request, pk=None):
+        if request.GET.get("expand"):
+            return json_response({"expand": ["Not supported on async endpoints."]}, status=400)
+        queryset = self.viewset_class.queryset.all()
+        fieldsets = {"fields": parse_paths(request.GET.getlist("fields")) or None, "expand": None}
+        try:
+            encoder = compiled_encoder(
+                self.viewset_class.serializer_class,
+                json.dumps(fieldsets, sort_keys=True),
+                queryset.db,
+                timezone.get_current_timezone_name(),
+            )
+        except serializers.ValidationError as exc:
+            return json_response(exc.detail, status=400)
+        if encoder is None:
+            raise ImproperlyConfigured(f"{self.viewset_class.serializer_class.__name__} has no row encoder.")
+
+        filterset_class = getattr(self.viewset_class, "filterset_class", None)
+        if filterset_class is not None:
+            # Validation is form cleaning only; the filters query nothing.
+            filterset = filterset_class(request.GET, queryset=queryset, request=request)
+            if not filterset.is_valid():
+                return json_response(filterset.errors, status=400)
+            queryset = filterset.qs
+        if pk is None:
+            return await self.list(request, queryset, encoder)
+        return await self.retrieve(request, queryset, encoder, pk)
+
+    def get_etag(self, request, queryset, *parts):
+        # Same parts as ConditionalGetMixin; only JSON is served here.
+        return make_etag(queryset.model._meta.label, "application/json", request.GET.urlencode(), *parts)
+
+    async def list(self, request, queryset, encoder):
+        last_modified, count = await acollection_version(queryset)
+        etag = self.get_etag(request, queryset, count, last_modified)
+        # ETag only, as on the DRF lists (config/conditional.py).
+        response = not_modified(request, etag, None)
+        if response is not None:
+            return response
+
+        (ordering,) = queryset.query.order_by
+        size = page_size(request)
+        reverse, position = decode_cursor(request.GET.get("cursor"))
+        window = keyset_window(queryset, ordering, reverse, position).values_list(*encoder.columns, named=True)
+        page = keyset_page([row async for row in window[: size + 1]], ordering, reverse, position, size)
+
+        url = request.build_absolute_uri()
+        data = {
+            "next": replace_query_param(url, "cursor", page.next_cursor) if page.next_cursor else None,
+            "previous": replace_query_param(url, "cursor", page.previous_cursor) if page.previous_cursor else None,
+            "results": await encoder.aencode(page.object_list),
+        }
+        return set_validators(json_response(data), etag, None)
+
+    async def retrieve(self, request, queryset, encoder, pk):
+        queryset = queryset.filter(pk=pk).order_by()
+        last_modified = await queryset.values_list("updated_at", flat=True).afirst()
+        if last_modified is None:
+            return self.not_found(queryset)
+        etag = self.get_etag(request, queryset, pk, last_modified)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        row = await queryset.values_list(*encoder.columns).afirst()
+        if row is None:
+            return self.not_found(queryset)
+        (data,) = await encoder.aencode([row])
+        return set_validators(json_response(data), etag, last_modified)
+
+    def not_found(self, queryset):
+        return json_response({"detail": f"No {queryset.model._meta.object_name} matches the given query."}, status=404)
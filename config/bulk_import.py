@@ -0,0 +1,164 @@
+"""
+Base class for streaming CSV/NDJSON master-data import commands.
+
+Rows are read lazily, validated in chunks with the model form's field
+cleaners (no per-row queries), and upserted on a unique column with one
+classification query and one batched `INSERT ... ON CONFLICT` per chunk.
+"""
+
+import csv
+import json
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+
+class BulkImportCommand(BaseCommand):
+    """
+    Subclasses set `model`, `form_class` and `unique_field`.
+    """
+
+    model = None
+    form_class = None
+    unique_field = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with header) or NDJSON file.")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: from the file extension.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=900,
+            help="Rows per chunk; keep under the database's query parameter limit (999 on SQLite).",
+        )
+        parser.add_argument("--rejects", help="Where to write rejected rows (default: <path>.rejects.<format>).")
+
+    def handle(self, *args, path, format, batch_size, rejects, **options):
+        path = Path(path)
+        if not path.exists():
+            raise CommandError(f"{path} does not exist.")
+        format = format or ("ndjson" if path.suffix in (".ndjson", ".jsonl") else "csv")
+        rejects_path = Path(rejects) if rejects else path.with_name(f"{path.name}.rejects.{format}")
+
+        self.fields = self.form_class.base_fields
+        self.import_fields = None
+        counts = {"inserted": 0, "updated": 0, "rejected": 0}
+        self.rejects_file = self.rejects_writer = None
+
+        with path.open(newline="", encoding="utf-8") as source:
+            rows = self.read_csv(source) if format == "csv" else self.read_ndjson(source)
+            try:
+                chunk = []
+                for line_no, row in rows:
+                    chunk.append((line_no, row))
+                    if len(chunk) >= batch_size:
+                        self.import_chunk(chunk, counts, rejects_path, format)
+                        chunk = []
+                if chunk:
+                    self.import_chunk(chunk, counts, rejects_path, format)
+            finally:
+                if self.rejects_file:
+                    self.rejects_file.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inserted {counts['inserted']}, updated {counts['updated']}, rejected {counts['rejected']}."
+            )
+        )
+        if counts["rejected"]:
+            self.stdout.write(f"Rejected rows written to {rejects_path}")
+
+    def read_csv(self, source):
+        reader = csv.DictReader(source)
+        for row in reader:
+            yield reader.line_num, row
+
+    def read_ndjson(self, source):
+        for line_no, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                row = {"_raw": line.rstrip("\n"), "_invalid": str(exc)}
+            yield line_no, row if isinstance(row, dict) else {"_raw": line.rstrip("\n"), "_invalid": "Not an object."}
+
+    def clean_row(self, row):
+        """
+        Return `(values, errors)` using the form's field cleaners.
+        """
+        if "_invalid" in row:
+            return None, {"__all__": [row["_invalid"]]}
+        values, errors = {}, {}
+        for name in self.import_fields:
+            raw = row.get(name)
+            try:
+                values[name] = self.fields[name].clean(raw if raw is not None else "")
+            except ValidationError as exc:
+                errors[name] = exc.messages
+        return values, errors
+
+    def import_chunk(self, chunk, counts, rejects_path, format):
+        if self.import_fields is None:
+            # Columns present in the first row decide what gets written; the
+            # rest keep model defaults on insert and are untouched on update.
+            first = chunk[0][1]
+            self.import_fields = [name for name in self.fields if name in first] or list(self.fields)
+            if self.unique_field not in self.import_fields:
+                raise CommandError(f"Input must have a '{self.unique_field}' column.")
+
+        valid = {}
+        keyless = []
+        for line_no, row in chunk:
+            values, errors = self.clean_row(row)
+            if errors:
+                counts["rejected"] += 1
+                self.write_reject(rejects_path, format, line_no, row, errors)
+            elif values[self.unique_field] in (None, ""):
+                keyless.append(values)
+            else:
+                if values[self.unique_field] in valid:
+                    # A later row for the same key in this chunk wins.
+                    counts["updated"] += 1
+                valid[values[self.unique_field]] = values
+
+        existing = set(
+            self.model.objects.filter(**{f"{self.unique_field}__in": list(valid)}).values_list(
+                self.unique_field, flat=True
+            )
+        )
+        counts["updated"] += len(existing)
+        counts["inserted"] += len(valid) - len(existing) + len(keyless)
+
+        update_fields = [name for name in self.import_fields if name != self.unique_field] + ["updated_at"]
+        with transaction.atomic():
+            self.model.objects.bulk_create(
+                [self.model(**values) for values in valid.values()],
+                update_conflicts=True,
+                unique_fields=[self.unique_field],
+                update_fields=update_fields,
+            )
+            if keyless:
+                # NULL keys never conflict, so these are always new rows.
+                self.model.objects.bulk_create([self.model(**values) for values in keyless])
+        self.chunk_written(list(valid))
+
+    def chunk_written(self, keys):
+        """
+        Hook called after each chunk with the unique keys it upserted.
+        Bulk writes send no model signals, so caches are dropped here.
+        """
+
+    def write_reject(self, rejects_path, format, line_no, row, errors):
+        if self.rejects_file is None:
+            self.rejects_file = rejects_path.open("w", newline="", encoding="utf-8")
+            if format == "csv":
+                self.rejects_writer = csv.writer(self.rejects_file)
+                self.rejects_writer.writerow(["line", *self.fields, "errors"])
+        messages = "; ".join(f"{name}: {' '.join(msgs)}" for name, msgs in errors.items())
+        if format == "csv":
+            self.rejects_writer.writerow([line_no, *(row.get(name, "") for name in self.fields), messages])
+        else:
+            self.rejects_file.write(json.dumps({"line": line_no, "row": row, "errors": errors}) + "\n")
@@ -0,0 +1,164 @@
+"""
+Gzip for pages, API responses and streaming exports.
+
+`GZipMiddleware` follows Django's (`django.middleware.gzip`), with:
+
+- `GZIP_MIN_LENGTH` and `GZIP_LEVEL` from settings instead of a fixed
+  200 bytes and level 6; `GZIP_LEVEL = 0` turns compression off;
+- `Accept-Encoding` q-values honoured (`gzip;q=0`, `*`), where Django
+  only looks for the word "gzip";
+- streaming responses, sync or async, compressed incrementally as one
+  gzip stream (Django compresses each async chunk as its own member);
+- native sync and async modes, so under ASGI it does not push every
+  response onto a thread.
+
+Compressed responses get `Vary: Accept-Encoding` and their strong ETag
+made weak (RFC 9110 8.8.1): the bytes differ from the identity encoding.
+A 304 to a client that accepts gzip gets the same, so it carries the
+validator of the response it revalidates. `If-None-Match` compares
+weakly, so either form of the tag matches. Like Django's, the gzip header
+is padded with up to 100 random bytes against BREACH.
+"""
+
+import secrets
+from gzip import GzipFile
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import StreamingBuffer
+
+MAX_RANDOM_BYTES = 100
+
+
+def accepts_gzip(header):
+    """
+    True if an `Accept-Encoding` header allows gzip.
+    """
+    qualities = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    if "x-gzip" in qualities:
+        return qualities["x-gzip"] > 0
+    return qualities.get("*", 0) > 0
+
+
+class GzipWriter:
+    """
+    One gzip stream, fed in pieces; each call returns the bytes ready so far.
+    """
+
+    def __init__(self, level):
+        self.buffer = StreamingBuffer()
+        self.file = GzipFile(
+            filename=b"a" * secrets.randbelow(MAX_RANDOM_BYTES),
+            mode="wb",
+            compresslevel=level,
+            fileobj=self.buffer,
+            mtime=0,
+        )
+
+    def write(self, data):
+        self.file.write(data)
+        return self.buffer.read()
+
+    def close(self):
+        self.file.close()
+        return self.buffer.read()
+
+
+def compress(data, level):
+    writer = GzipWriter(level)
+    return writer.write(data) + writer.close()
+
+
+def compress_stream(chunks, level):
+    writer = GzipWriter(level)
+    for chunk in chunks:
+        if data := writer.write(chunk):
+            yield data
+    yield writer.close()
+
+
+async def acompress_stream(chunks, level):
+    writer = GzipWriter(level)
+    async for chunk in chunks:
+        if data := writer.write(chunk):
+            yield data
+    yield writer.close()
+
+
+def weaken_etag(response):
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+
+
+class GZipMiddleware:
+    """
+    Put near the top of `MIDDLEWARE`, below `ServerTimingMiddleware`, so
+    it compresses what every other middleware returns.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        level = settings.GZIP_LEVEL
+        if not level or response.has_header("Content-Encoding"):
+            return response
+        gzip_ok = accepts_gzip(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if response.status_code == 304:
+            if gzip_ok:
+                patch_vary_headers(response, ("Accept-Encoding",))
+                weaken_etag(response)
+            return response
+        if not response.streaming and len(response.content) < settings.GZIP_MIN_LENGTH:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if not gzip_ok:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, level)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, level)
+            # The compressed size is not known until the stream ends.
+            del response.headers["Content-Length"]
+        else:
+            compressed = compress(response.content, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        weaken_etag(response)
+        response.headers["Content-Encoding"] = "gzip"
+        return response
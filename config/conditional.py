@@ -0,0 +1,186 @@
+"""
+Conditional GET (ETag / Last-Modified) for views backed by `updated_at`.
+
+Validators are computed from cheap queries (one row's `updated_at`, or
+`MAX(updated_at)` plus `COUNT(*)` for a collection) before any rows are
+loaded, so an unchanged resource costs one small query and a 304.
+
+Collections only get an ETag. A delete lowers the count without moving
+`MAX(updated_at)`, and a row saved within the same second as the max
+does not move it at HTTP-date resolution either, so `Last-Modified`
+would let `If-Modified-Since` answer 304 for a changed list.
+"""
+
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Func, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from config.fieldsets import parse_paths
+
+
+def make_etag(*parts):
+    return '"%s"' % hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def related_stamps(queryset, paths):
+    """
+    `{alias: Subquery}` for `MAX(<path>__updated_at)` over the rows of
+    `queryset`, one per ORM path to a related model.
+    """
+    return {
+        f"related_{n}": Subquery(
+            queryset.order_by().annotate(stamp=Func(f"{path}__updated_at", function="MAX")).values("stamp")
+        )
+        for n, path in enumerate(paths)
+    }
+
+
+def latest(*stamps):
+    return max((stamp for stamp in stamps if stamp is not None), default=None)
+
+
+def version_query(queryset, related=()):
+    """
+    `(last_modified, count, *related stamps)` for a queryset as one row.
+    Each aggregate is its own scalar subquery: SQLite answers
+    `MAX(updated_at)` alone with one seek on the `updated_at` index, but
+    scans the whole index when the max and the count share a SELECT.
+    """
+    queryset = queryset.order_by()
+    last_modified = queryset.annotate(stamp=Func("updated_at", function="MAX")).values("stamp")
+    count = queryset.annotate(rows=Func("pk", function="COUNT")).values("rows")
+    stamps = related_stamps(queryset, related)
+    return (
+        queryset.model._base_manager.annotate(last_modified=Subquery(last_modified), count=Subquery(count), **stamps)
+        .order_by()
+        .values_list("last_modified", "count", *stamps)[:1]
+    )
+
+
+def collection_version(queryset, related=()):
+    """
+    `(last_modified, count)` for a queryset; changes whenever a row is
+    saved (new max) or deleted (new count).
+
+    `related` lists ORM paths to related models shown with the rows (e.g.
+    `customer`); their newest `updated_at` counts toward `last_modified`.
+
+    This assumes `updated_at` only moves forward: every write sets it to
+    the current time (`auto_now`, and explicitly in bulk writes). Writing
+    an older `updated_at` on purpose, as some tests and benchmarks do to
+    backdate rows, can bring back a `(last_modified, count)` seen before,
+    and with it a stale ETag or cached list table (config/fragments.py).
+
+    The count reads a whole index, so its cost grows with the table.
+    """
+    # No row at all when the table is empty.
+    for last_modified, count, *stamps in version_query(queryset, related):
+        return latest(last_modified, *stamps), count
+    return None, 0
+
+
+async def acollection_version(queryset):
+    async for version in version_query(queryset):
+        return version
+    return None, 0
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Return a 304 (or 412) response if the request's preconditions say so.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding an ETag to `list` and ETag / Last-Modified to
+    `retrieve`, answering `If-None-Match` / `If-Modified-Since` before
+    serializing.
+    """
+
+    def get_etag(self, *parts):
+        # The same rows render differently per media type and query string
+        # (pagination, field selection), so both are part of the tag.
+        return make_etag(
+            self.queryset.model._meta.label,
+            self.request.accepted_media_type,
+            self.request.GET.urlencode(),
+            *parts,
+        )
+
+    def expanded_paths(self):
+        """
+        ORM paths (`customer`, `items__product`) to the foreign keys that
+        `?expand=` inlines. Those rows change without touching this model's
+        `updated_at`, so their own `updated_at` counts toward the validators.
+        Names that are not relations are left to the serializer to reject.
+        """
+        paths = []
+
+        def walk(model, tree, prefix):
+            for name, subtree in tree.items():
+                try:
+                    field = model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    continue
+                if not field.is_relation:
+                    continue
+                path = prefix + name
+                if field.many_to_one and any(f.name == "updated_at" for f in field.related_model._meta.concrete_fields):
+                    paths.append(path)
+                walk(field.related_model, subtree, path + "__")
+
+        walk(self.queryset.model, parse_paths(self.request.GET.getlist("expand")), "")
+        return paths
+
+    def list(self, request, *args, **kwargs):
+        last_modified, count = collection_version(self.filter_queryset(self.get_queryset()), self.expanded_paths())
+        etag = self.get_etag(count, last_modified)
+        # ETag only: see the module docstring.
+        response = not_modified(request, etag, None)
+        if response is not None:
+            return response
+        return set_validators(super().list(request, *args, **kwargs), etag, None)
+
+    def get_last_modified(self):
+        """
+        The requested object's `updated_at` (or a newer one of the rows it
+        expands), or None if it does not exist.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        ).order_by()
+        stamps = related_stamps(queryset, self.expanded_paths())
+        for last_modified, *related in queryset.annotate(**stamps).values_list("updated_at", *stamps)[:1]:
+            return latest(last_modified, *related)
+        return None
+
+    def retrieve(self, request, *args, **kwargs):
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            # Let the normal path raise the 404.
+            return super().retrieve(request, *args, **kwargs)
+        etag = self.get_etag(self.kwargs[self.lookup_url_kwarg or self.lookup_field], last_modified)
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(super().retrieve(request, *args, **kwargs), etag, last_modified)
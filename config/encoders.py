@@ -0,0 +1,263 @@
+"""
+Fast read path for API list actions.
+
+`ModelSerializer.to_representation()` builds a model instance per row and
+walks every field's `get_attribute()` / `to_representation()`. For plain
+column fields that work is a fixed mapping, so `RowEncoder` compiles it
+once per serializer and field selection: the list query becomes
+`values_list()` and each row is turned into a dict by a per-field
+converter. Nested lists (order items) are fetched in one query per page.
+
+On SQLite, datetimes, dates and decimals are selected in their stored
+form (text, text and REAL) and formatted directly, skipping the parse
+into `datetime` / `Decimal` and back. SQLite stores UTC datetimes as
+`str(datetime)`, which has the same digits as `isoformat()`, and a REAL
+holding a DecimalField value formats back to the same digits.
+
+Output is identical to the serializer's. Anything the encoder does not
+know how to reproduce exactly (expanded objects, method fields, dotted
+sources) falls back to the serializer.
+"""
+
+import datetime
+import decimal
+import functools
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import CharField, FloatField
+from django.db.models.functions import Cast
+from django.utils import timezone
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+
+class Unsupported(Exception):
+    pass
+
+
+def _is_utc(tz):
+    return tz is datetime.timezone.utc or getattr(tz, "key", None) == "UTC"
+
+
+def _datetime_converter(field, column, vendor):
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if field_timezone is None or getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
+        return column, field.to_representation
+    if vendor == "sqlite" and _is_utc(field_timezone):
+        return Cast(column, CharField()), lambda value: value.replace(" ", "T") + "Z"
+
+    def convert(value):
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return column, convert
+
+
+def _date_converter(field, column, vendor):
+    if getattr(field, "format", api_settings.DATE_FORMAT) != ISO_8601:
+        return column, field.to_representation
+    if vendor == "sqlite":
+        return Cast(column, CharField()), None
+    return column, lambda value: value.isoformat()
+
+
+def _decimal_converter(field, column, vendor):
+    coerce_to_string = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize or field.normalize_output or field.decimal_places is None:
+        return column, field.to_representation
+    if vendor == "sqlite" and field.max_digits is not None and field.max_digits <= 15:
+        # Up to 15 significant digits survive the REAL round trip exactly.
+        return Cast(column, FloatField()), f"{{:.{field.decimal_places}f}}".format
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+    return column, lambda value: f"{value.quantize(exponent, rounding=rounding, context=context):f}"
+
+
+def _converter(field, column, vendor):
+    """
+    `(select, convert)` for one serializer field: what to select for
+    `column`, and a function turning the selected value into the field's
+    representation (None when the value is already it).
+    """
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            raise Unsupported(field.field_name)
+        return column, None
+    if isinstance(field, serializers.ChoiceField):
+        return column, None if all(isinstance(key, str) for key in field.choices) else field.to_representation
+    if isinstance(field, (serializers.CharField, serializers.IntegerField, serializers.BooleanField)):
+        return column, None
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field, column, vendor)
+    if isinstance(field, serializers.DateField):
+        return _date_converter(field, column, vendor)
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field, column, vendor)
+    if isinstance(field, (serializers.BaseSerializer, relations.RelatedField, serializers.ModelField)):
+        raise Unsupported(field.field_name)
+    return column, field.to_representation
+
+
+def _nested_placeholder(value):
+    # Holds a nested list's place in the dict until `encode()` fills it.
+    return None
+
+
+class RowEncoder:
+    """
+    Serializer output for rows of `values_list(*encoder.columns)`.
+    Raises `Unsupported` for serializers it cannot reproduce.
+    """
+
+    def __init__(self, serializer, model, using="default", extra_columns=()):
+        opts = model._meta
+        vendor = connections[using].vendor
+        self.model = model
+        self.using = using
+        # Attnames or expressions; the pk comes first.
+        self.columns = [opts.pk.attname]
+        self.fields = []  # (name, column index, converter)
+        self.nested = []  # (name, RowEncoder, foreign key attname on the child)
+
+        for field in serializer._readable_fields:
+            if isinstance(field, serializers.ListSerializer) and isinstance(field.child, serializers.ModelSerializer):
+                relation = opts.get_field(field.source)
+                if not relation.one_to_many:
+                    raise Unsupported(field.field_name)
+                child = RowEncoder(field.child, relation.related_model, using, extra_columns=[relation.field.attname])
+                self.nested.append((field.field_name, child, relation.field.attname))
+                self.fields.append((field.field_name, 0, _nested_placeholder))
+                continue
+            if "." in field.source or field.source == "*":
+                raise Unsupported(field.field_name)
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                raise Unsupported(field.field_name)
+            if not model_field.concrete or model_field.many_to_many:
+                raise Unsupported(field.field_name)
+            select, convert = _converter(field, model_field.attname, vendor)
+            self.fields.append((field.field_name, self.column(select), convert))
+
+        for column in extra_columns:
+            self.column(column)
+
+    def column(self, select):
+        if isinstance(select, str) and select in self.columns:
+            return self.columns.index(select)
+        self.columns.append(select)
+        return len(self.columns) - 1
+
+    def encode(self, rows):
+        """
+        Dicts for `rows` (tuples in `columns` order), nested lists included.
+        """
+        data = self.encode_columns(rows)
+        for name, child, foreign_key in self.nested:
+            groups = child.fetch_groups(foreign_key, [row[0] for row in rows])
+            for item, row in zip(data, rows):
+                item[name] = groups.get(row[0], [])
+        return data
+
+    async def aencode(self, rows):
+        data = self.encode_columns(rows)
+        for name, child, foreign_key in self.nested:
+            groups = await child.afetch_groups(foreign_key, [row[0] for row in rows])
+            for item, row in zip(data, rows):
+                item[name] = groups.get(row[0], [])
+        return data
+
+    def encode_columns(self, rows):
+        fields = self.fields
+        data = []
+        for row in rows:
+            item = {}
+            for name, index, convert in fields:
+                value = row[index]
+                item[name] = value if convert is None or value is None else convert(value)
+            data.append(item)
+        return data
+
+    def fetch_groups(self, foreign_key, parent_ids):
+        """
+        Encoded rows whose `foreign_key` is in `parent_ids`, grouped by it,
+        in primary key order (the order the prefetch uses).
+        """
+        if not parent_ids:
+            return {}
+        rows = list(self.group_query(foreign_key, parent_ids))
+        return self.group(rows, self.encode(rows), foreign_key)
+
+    async def afetch_groups(self, foreign_key, parent_ids):
+        if not parent_ids:
+            return {}
+        rows = [row async for row in self.group_query(foreign_key, parent_ids)]
+        return self.group(rows, await self.aencode(rows), foreign_key)
+
+    def group_query(self, foreign_key, parent_ids):
+        return (
+            self.model._default_manager.using(self.using)
+            .filter(**{f"{foreign_key}__in": parent_ids})
+            .order_by("pk")
+            .values_list(*self.columns)
+        )
+
+    def group(self, rows, items, foreign_key):
+        groups = defaultdict(list)
+        key = self.columns.index(foreign_key)
+        for row, item in zip(rows, items):
+            groups[row[key]].append(item)
+        return groups
+
+
+@functools.lru_cache(maxsize=256)
+def compiled_encoder(serializer_class, fieldsets, using, tz_name):
+    """
+    The `RowEncoder` for a serializer and `fieldsets` (JSON of the
+    `fields` / `expand` kwargs), or None if it is unsupported. `tz_name`
+    keys the cache on the active time zone, which datetimes render in.
+    """
+    serializer = serializer_class(**json.loads(fieldsets))
+    try:
+        return RowEncoder(serializer, serializer.Meta.model, using)
+    except Unsupported:
+        return None
+
+
+class FastListMixin:
+    """
+    ViewSet mixin serving `list` through `RowEncoder` when the serializer
+    allows it (`API_FAST_LIST` setting). Pagination works on the
+    `values_list()` rows, so cursors and page sizes are unchanged.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.API_FAST_LIST:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        fieldsets = self.get_fieldsets() if hasattr(self, "get_fieldsets") else {}
+        encoder = compiled_encoder(
+            self.get_serializer_class(),
+            json.dumps(fieldsets, sort_keys=True),
+            queryset.db,
+            timezone.get_current_timezone_name(),
+        )
+        if encoder is None:
+            return super().list(request, *args, **kwargs)
+
+        # Named rows give the paginator the ordering column by attribute.
+        rows = queryset.prefetch_related(None).values_list(*encoder.columns, named=True)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(encoder.encode(page))
+        return Response(encoder.encode(list(rows)))
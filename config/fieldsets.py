@@ -0,0 +1,150 @@
+"""
+Sparse fieldsets (`?fields=`) and inline expansion (`?expand=`) for the API.
+
+    /api/orders/?fields=id,status,subtotal
+    /api/orders/?fields=id,items.product,items.quantity
+    /api/orders/42/?expand=customer,items.product
+
+Both take comma-separated, dotted paths into nested serializers. Without
+`fields` every field is returned, as before; with it, only the named
+fields are, and a nested field named without a sub-path keeps all of its
+own fields. `expand` swaps a foreign key id for the related object, for
+the fields a serializer lists in `Meta.expandable`.
+
+The viewset mixin shapes the SQL to match: unselected columns are
+deferred, expanded foreign keys are joined, and nested lists are only
+prefetched when they are part of the response.
+"""
+
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_paths(values):
+    """
+    `["id,items.product", "items.quantity"]` ->
+    `{"id": {}, "items": {"product": {}, "quantity": {}}}`.
+    """
+    tree = {}
+    for value in values:
+        for path in value.split(","):
+            node = tree
+            for part in path.strip().split("."):
+                if part:
+                    node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsetMixin:
+    """
+    ModelSerializer mixin taking `fields` and `expand` trees (see
+    `parse_paths`). `Meta.expandable` maps a foreign key field to the
+    serializer class, or its dotted path, used when it is expanded.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selected_fields = fields or None
+        expand = expand or {}
+        expandable = getattr(self.Meta, "expandable", {})
+
+        unknown = [name for name in fields or () if name not in self.fields]
+        if unknown:
+            raise serializers.ValidationError({"fields": [f"Unknown field: {name}." for name in unknown]})
+        nested = {name for name, field in self.fields.items() if _nested_serializer(field)}
+        unknown = [name for name in expand if name not in expandable and name not in nested]
+        if unknown:
+            raise serializers.ValidationError({"expand": [f"Cannot expand: {name}." for name in unknown]})
+
+        if fields:
+            for name in set(self.fields) - set(fields):
+                del self.fields[name]
+
+        for name in list(self.fields):
+            sub_fields = (fields or {}).get(name) or None
+            if name in expand and name in expandable:
+                serializer_class = expandable[name]
+                if isinstance(serializer_class, str):
+                    serializer_class = import_string(serializer_class)
+                self.fields[name] = serializer_class(read_only=True, fields=sub_fields, expand=expand[name])
+            elif name in nested and (sub_fields or expand.get(name)):
+                field = self.fields[name]
+                child = _nested_serializer(field)
+                source = {"source": field.source} if field.source != name else {}
+                self.fields[name] = type(child)(
+                    many=field is not child,
+                    read_only=True,
+                    fields=sub_fields,
+                    expand=expand.get(name),
+                    **source,
+                )
+
+
+def _nested_serializer(field):
+    """
+    The sparse-fieldset serializer behind a nested field (or list), if any.
+    """
+    child = getattr(field, "child", field)
+    return child if isinstance(child, SparseFieldsetMixin) else None
+
+
+def shape_queryset(queryset, serializer, keep=()):
+    """
+    Narrow `queryset` to what `serializer` renders: `only()` the selected
+    columns (plus `keep`), join expanded foreign keys and prefetch nested
+    lists, recursively.
+    """
+    opts = queryset.model._meta
+    columns = {opts.pk.name, *keep}
+    joins, prefetches = [], []
+    for field in serializer.fields.values():
+        child = _nested_serializer(field)
+        if child is not None and child is not field:
+            # Reverse foreign key: prefetch it, keeping the FK the
+            # prefetch joins back on.
+            remote = opts.get_field(field.source).field
+            related = child.Meta.model._default_manager.order_by("pk")
+            prefetches.append(Prefetch(field.source, shape_queryset(related, child, keep=[remote.name])))
+        elif child is not None:
+            joins.append(field.source)
+            columns.add(field.source)
+        elif field.source != "*":
+            columns.add(field.source.split(".")[0])
+
+    if serializer.selected_fields:
+        concrete = {f.name for f in opts.concrete_fields}
+        queryset = queryset.only(*sorted(columns & concrete))
+    if joins:
+        queryset = queryset.select_related(*joins)
+    return queryset.prefetch_related(*prefetches)
+
+
+class SparseFieldsetViewMixin:
+    """
+    ViewSet mixin reading `?fields=` / `?expand=` on safe methods and
+    shaping the queryset to match. Writes always take and return every
+    field.
+    """
+
+    def get_fieldsets(self):
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return {"fields": None, "expand": None}
+        params = request.query_params
+        return {
+            "fields": parse_paths(params.getlist("fields")) or None,
+            "expand": parse_paths(params.getlist("expand")) or None,
+        }
+
+    def get_queryset(self):
+        # Building a ModelSerializer's fields is not free; list() asks for
+        # the queryset twice (validators, then rows).
+        if not hasattr(self, "_fieldset_serializer"):
+            self._fieldset_serializer = self.get_serializer_class()(**self.get_fieldsets())
+        return shape_queryset(super().get_queryset(), self._fieldset_serializer)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.update(self.get_fieldsets())
+        return super().get_serializer(*args, **kwargs)
@@ -0,0 +1,60 @@
+"""
+Shared django-filter pieces for the API filtersets.
+
+Every filter maps to a predicate an index can serve: equality, `IN` or a
+range on an indexed column. Text prefixes are sent as a range (`sku >= 'AB'
+AND sku < 'AC'`) rather than `LIKE 'AB%'`, because SQLite's LIKE is case
+insensitive and cannot use a case-sensitive index. `*QueryPlanTests` check
+the common combinations with `testing.query_plans`.
+"""
+
+import django_filters
+from django.utils import timezone
+
+
+def prefix_upper_bound(prefix):
+    """
+    The smallest string greater than every string starting with `prefix`,
+    or None if there is none. `"AB"` -> `"AC"`.
+    """
+    while prefix:
+        last = ord(prefix[-1])
+        if last < 0x10FFFF:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class PrefixFilter(django_filters.CharFilter):
+    """
+    Case-sensitive prefix match as an index-friendly range.
+    """
+
+    def filter(self, qs, value):
+        if value in django_filters.constants.EMPTY_VALUES:
+            return qs
+        qs = qs.filter(**{f"{self.field_name}__gte": value})
+        upper = prefix_upper_bound(value)
+        if upper is not None:
+            qs = qs.filter(**{f"{self.field_name}__lt": upper})
+        return qs.distinct() if self.distinct else qs
+
+
+class UpdatedFilterSet(django_filters.FilterSet):
+    """
+    `?updated_since=` (inclusive) and `?updated_before=` (exclusive) on
+    `updated_at`, as ISO 8601 datetimes.
+    """
+
+    updated_since = django_filters.IsoDateTimeFilter(field_name="updated_at", lookup_expr="gte")
+    updated_before = django_filters.IsoDateTimeFilter(field_name="updated_at", lookup_expr="lt")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        data = self.form.cleaned_data
+        if data.get("updated_since") and not data.get("updated_before"):
+            # SQLite takes a one-sided range as unselective and pages the
+            # table in id order instead; nothing is updated after now, so
+            # closing the range gets the updated_at index.
+            queryset = queryset.filter(updated_at__lte=timezone.now())
+        return queryset
@@ -0,0 +1,64 @@
+"""
+Cached tables for the back-office list pages.
+
+`CachedTableMixin` renders a list view's table and pager from
+`table_template_name` and caches the HTML. The pager is included because
+its links come from the page's rows. The key is made of:
+
+- the page's cursor (or `?page=`) and page size;
+- the data version of each model in `table_models`: `MAX(updated_at)` and
+  `COUNT(*)` (`collection_version()`, config/conditional.py).
+
+While `updated_at` only moves forward (see `collection_version()`), every
+save moves the max and every delete lowers the count, so a changed table
+does not match an old key and nothing has to be invalidated: old
+fragments expire after `LIST_FRAGMENT_CACHE_TIMEOUT`. Rows written with
+an older `updated_at` on purpose are not guaranteed to show.
+
+A hit costs one cache read and one version query per model. The page's
+rows are not loaded, but each version's `COUNT(*)` reads a whole index,
+so hits still get slower as the table grows.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.views.generic.base import ContextMixin
+
+from config.conditional import collection_version, make_etag
+
+
+class CachedTableMixin:
+    """
+    Keyset-paginated ListView mixin. `table_template_name` gets the usual
+    list context and goes into the page template as `{{ table }}`.
+
+    `table_models` lists every model the rows display, e.g. `[Order,
+    Customer]` when order rows show the customer's name. It defaults to
+    the view's model.
+    """
+
+    table_template_name = None
+    table_models = ()
+
+    def table_cache_key(self):
+        versions = [collection_version(model._default_manager.all()) for model in self.table_models or [self.model]]
+        return "list-table:" + make_etag(
+            self.table_template_name,
+            self.get_paginate_by(self.object_list),
+            self.request.GET.get(self.cursor_kwarg, ""),
+            self.request.GET.get(self.page_kwarg, ""),
+            *versions,
+        ).strip('"')
+
+    def get_context_data(self, **kwargs):
+        key = self.table_cache_key()
+        table = cache.get(key)
+        if table is not None:
+            # Skip the paginator, and with it the rows query.
+            return ContextMixin.get_context_data(self, table=mark_safe(table), **kwargs)
+        context = super().get_context_data(**kwargs)
+        context["table"] = render_to_string(self.table_template_name, context, self.request)
+        cache.set(key, context["table"], settings.LIST_FRAGMENT_CACHE_TIMEOUT)
+        return context
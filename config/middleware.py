@@ -0,0 +1,209 @@
+"""
+Per-request timing: SQL, view and template/renderer time.
+
+Each response gets a `Server-Timing` header, e.g.
+
+    Server-Timing: db;dur=3.1;desc="4 queries", view;dur=7.9, render;dur=1.2, total;dur=9.4
+
+`view` includes the SQL run by the view. `render` is the rendering of
+template and DRF responses, which Django does after the view returns;
+templates rendered inside the view (`render()` shortcuts) count as view
+time, and a streaming response's body (and its SQL) is produced after
+the header is sent. Timings are also folded into per-route aggregates,
+exposed to staff at `/api/perf/routes/`.
+
+SQL is timed with `connection.execute_wrapper()`, so no query log is
+kept; the cost per request is a few clock reads and one locked append.
+Aggregates are per process.
+
+The middleware runs natively in both modes, so under ASGI it does not
+push async views onto a thread.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+
+class RouteStats:
+    """
+    Request counts and a window of recent timings for each route.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def record(self, route, total_ms, db_ms, queries):
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {
+                    "count": 0,
+                    "max_ms": 0.0,
+                    "db_ms": 0.0,
+                    "queries": 0,
+                    "recent": deque(maxlen=settings.PERF_ROUTE_SAMPLES),
+                }
+            stats["count"] += 1
+            stats["max_ms"] = max(stats["max_ms"], total_ms)
+            stats["db_ms"] += db_ms
+            stats["queries"] += queries
+            stats["recent"].append(total_ms)
+
+    def snapshot(self):
+        """
+        `{route: {count, p50_ms, p95_ms, max_ms, avg_db_ms, avg_queries}}`;
+        percentiles are over the most recent `PERF_ROUTE_SAMPLES` requests.
+        """
+        with self.lock:
+            routes = {route: dict(stats, recent=sorted(stats["recent"])) for route, stats in self.routes.items()}
+        return {
+            route: {
+                "count": stats["count"],
+                "p50_ms": round(_percentile(stats["recent"], 0.50), 2),
+                "p95_ms": round(_percentile(stats["recent"], 0.95), 2),
+                "max_ms": round(stats["max_ms"], 2),
+                "avg_db_ms": round(stats["db_ms"] / stats["count"], 2),
+                "avg_queries": round(stats["queries"] / stats["count"], 1),
+            }
+            for route, stats in sorted(routes.items())
+        }
+
+    def reset(self):
+        with self.lock:
+            self.routes.clear()
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+route_stats = RouteStats()
+
+# Anything else is bucketed as OTHER, so clients cannot grow `route_stats`
+# with made-up methods.
+ROUTE_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"})
+
+
+class RequestTimer:
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.view_started = self.view_finished = self.render_finished = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+    def rendered(self, response):
+        self.render_finished = time.perf_counter()
+
+
+class ServerTimingMiddleware:
+    """
+    Put first in `MIDDLEWARE` so `total` covers the other middleware and
+    its `process_template_response` runs last, right before rendering.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django adapts sync hooks with sync_to_async() under ASGI,
+            # which would cost a thread hop per request.
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.PERF_TIMING_ENABLED:
+            return self.get_response(request)
+
+        timer = request._perf_timer = RequestTimer()
+        start = time.perf_counter()
+        with self.timing(timer):
+            response = self.get_response(request)
+        return self.finish(request, response, timer, start)
+
+    async def __acall__(self, request):
+        if not settings.PERF_TIMING_ENABLED:
+            return await self.get_response(request)
+
+        timer = request._perf_timer = RequestTimer()
+        start = time.perf_counter()
+        with self.timing(timer):
+            response = await self.get_response(request)
+        return self.finish(request, response, timer, start)
+
+    def timing(self, timer):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        return stack
+
+    def finish(self, request, response, timer, start):
+        end = time.perf_counter()
+
+        view_ms = render_ms = 0.0
+        if timer.view_started is not None:
+            view_ms = ((timer.view_finished or end) - timer.view_started) * 1000
+        if timer.view_finished is not None and timer.render_finished is not None:
+            render_ms = (timer.render_finished - timer.view_finished) * 1000
+        total_ms = (end - start) * 1000
+        db_ms = timer.db * 1000
+
+        match = getattr(request, "resolver_match", None)
+        method = request.method if request.method in ROUTE_METHODS else "OTHER"
+        # URL names are stable and readable ("order-detail"); DRF routes are regexes.
+        route = f"{method} {match.view_name or match.route}" if match else f"{method} <unresolved>"
+        route_stats.record(route, total_ms, db_ms, timer.queries)
+
+        if settings.PERF_SERVER_TIMING_HEADER:
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{timer.queries} queries", '
+                f"view;dur={view_ms:.1f}, render;dur={render_ms:.1f}, total;dur={total_ms:.1f}"
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _view_started(request)
+
+    def process_template_response(self, request, response):
+        return _view_finished(request, response)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        _view_started(request)
+
+    async def aprocess_template_response(self, request, response):
+        return _view_finished(request, response)
+
+
+def _view_started(request):
+    timer = getattr(request, "_perf_timer", None)
+    if timer is not None:
+        timer.view_started = time.perf_counter()
+
+
+def _view_finished(request, response):
+    timer = getattr(request, "_perf_timer", None)
+    if timer is not None:
+        timer.view_finished = time.perf_counter()
+        response.add_post_render_callback(timer.rendered)
+    return response
@@ -0,0 +1,130 @@
+"""
+Keyset (cursor) pagination shared by the API and the web list views.
+
+Pages are selected with `WHERE id < last_seen ORDER BY id DESC LIMIT n`
+instead of `OFFSET`, so page 1000 costs the same as page 1.
+"""
+
+import base64
+import binascii
+
+from django.http import Http404
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    DRF cursor pagination that follows each viewset's queryset ordering.
+
+    `?page_size=` can shrink or grow a page up to `max_page_size`.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        # Viewsets already order on a unique key (`id` or `-id`); reuse it
+        # rather than repeating it on the paginator.
+        if queryset.query.order_by:
+            return tuple(queryset.query.order_by)
+        return super().get_ordering(request, queryset, view)
+
+
+class KeysetPage:
+    """
+    A page of keyset results, shaped enough like Django's `Page` for templates.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(reverse, position):
+    raw = f"{'p' if reverse else 'n'}{position}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Return `(reverse, position)`; an empty token means the first page.
+    """
+    if not token:
+        return False, None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        return raw[0] == "p", int(raw[1:])
+    except (binascii.Error, UnicodeDecodeError, IndexError, ValueError):
+        raise Http404("Invalid cursor.")
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that pages with `?cursor=` instead of `?page=` OFFSETs.
+
+    The view must order on a single unique integer field (e.g. `-id`).
+    Requests that still pass `?page=N` fall back to Django's paginator.
+    """
+
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        (ordering,) = self.get_ordering()
+        reverse, position = decode_cursor(self.request.GET.get(self.cursor_kwarg))
+        queryset = keyset_window(queryset, ordering, reverse, position)
+        page = keyset_page(list(queryset[: page_size + 1]), ordering, reverse, position, page_size)
+        return (None, page, page.object_list, page.has_other_pages())
+
+
+def keyset_window(queryset, ordering, reverse, position):
+    """
+    `queryset` narrowed to the rows after the cursor in display order (or
+    before it, nearest first, when paging back). Slice `page_size + 1`
+    rows off it and pass them to `keyset_page()`.
+    """
+    field = ordering.lstrip("-")
+    descending = ordering.startswith("-")
+    if position is not None:
+        lookup = "gt" if descending == reverse else "lt"
+        queryset = queryset.filter(**{f"{field}__{lookup}": position})
+    if reverse:
+        queryset = queryset.order_by(field if descending else f"-{field}")
+    return queryset
+
+
+def keyset_page(rows, ordering, reverse, position, page_size):
+    """
+    A `KeysetPage` from up to `page_size + 1` rows of `keyset_window()`.
+    """
+    field = ordering.lstrip("-")
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    has_next = reverse or has_more
+    has_previous = has_more if reverse else position is not None
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(False, getattr(rows[-1], field)) if rows and has_next else None,
+        previous_cursor=encode_cursor(True, getattr(rows[0], field)) if rows and has_previous else None,
+    )
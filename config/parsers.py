@@ -0,0 +1,40 @@
+"""
+JSON parser using orjson when it is installed.
+
+`FastJSONParser` returns the same data as DRF's `JSONParser` for UTF-8
+bodies. Anything orjson rejects (NaN, lone surrogates, a byte-order
+mark, malformed JSON) is parsed again by `JSONParser`, so accepted input
+and error messages are unchanged. Bodies with a run of 19 or more digits
+also go to `JSONParser`, since orjson reads integers past 64 bits as
+floats.
+
+Without orjson this is `JSONParser`.
+"""
+
+import codecs
+import io
+
+from rest_framework.parsers import JSONParser, get_encoding
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Maps digits to b"0" and everything else to b" ": a 19-digit run is then a
+# substring search, several times faster than a regex over the body.
+DIGITS = bytes(0x30 if 0x30 <= byte <= 0x39 else 0x20 for byte in range(256))
+LONG_NUMBER = b"0" * 19
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if codecs.lookup(get_encoding(parser_context or {})).name == "utf-8" and LONG_NUMBER not in body.translate(DIGITS):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,57 @@
+"""
+JSON renderer using orjson when it is installed.
+
+`FastJSONRenderer` produces the same bytes as DRF's `JSONRenderer` with
+the default settings (compact, UTF-8, strict): orjson writes strings,
+integers and most floats exactly as `json.dumps()` does, and everything
+it does not know natively (Decimal, datetimes, lazy strings, ...) goes
+through DRF's `JSONEncoder.default()`. The rest falls back to
+`JSONRenderer`:
+
+- indented output (`; indent=` in the Accept header, browsable API);
+- `COMPACT_JSON`, `UNICODE_JSON` or `STRICT_JSON` turned off, or a
+  custom `encoder_class`;
+- data orjson refuses (integers over 64 bits, non-string keys);
+- floats under 1e-4, which orjson formats differently (`0.00001` for
+  `1e-05`); these are spotted in the output, which then gets re-rendered.
+
+One difference remains: orjson writes NaN and infinities as `null`,
+where `JSONRenderer` raises. The API's serializers emit no floats.
+
+Without orjson this is `JSONRenderer`.
+"""
+
+import re
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# `1e-05` / `1e-09` as orjson writes them, or string content that looks
+# like it; either way the stdlib output is used.
+SMALL_FLOAT = re.compile(rb"\de-\d(?!\d)|(?<![\d.])0\.0000")
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or orjson is None or not self.uses_defaults():
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            content = orjson.dumps(data, default=JSONEncoder().default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if (b"e-" in content or b"0.0000" in content) and SMALL_FLOAT.search(content):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped by JSONRenderer: valid JSON, but line terminators in JavaScript.
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return content
+
+    def uses_defaults(self):
+        return self.compact and not self.ensure_ascii and self.strict and self.encoder_class is JSONEncoder
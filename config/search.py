@@ -0,0 +1,171 @@
+"""
+SQLite FTS5 prefix search for autocomplete.
+
+A `SearchIndex` is an external-content FTS5 table, `<db_table>_fts`, over
+some text columns of a model's table. It stores only the index; rows are
+read back from the model table by id. Triggers on the model table keep it
+in sync on every write, including bulk creates, upserts, queryset updates
+and raw SQL, none of which send model signals.
+
+Prefix indexes on 1-4 characters let a query like `widg*` read a single
+index entry instead of scanning every term starting with `w`.
+
+SQLite drops a table's triggers when the schema editor rebuilds the table
+(most `AlterField`/`AddField` migrations), so `restore_triggers()` runs
+after every `migrate` (see the `post_migrate` receivers of the apps that
+own an index).
+
+FTS5 is SQLite only. On other backends no index is created and `search()`
+falls back to `icontains` on the same columns, ordered by id.
+"""
+
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connections
+from django.db.models import Q
+from django.http import JsonResponse
+
+TOKEN = re.compile(r"[^\W_]+")
+
+MAX_RESULTS = 50
+
+# Ranking costs about a microsecond per match, and a one-letter prefix can
+# match every row, so only the first this many matches (by id) are ranked.
+RANKED_CANDIDATES = 200
+
+
+def match_query(text):
+    """
+    FTS5 query matching rows that contain a term starting with each word
+    of `text`, or "" if `text` has no words. `"widg bl"` -> `"widg"* "bl"*`.
+    """
+    return " ".join(f'"{token}"*' for token in TOKEN.findall(text))
+
+
+class SearchIndex:
+    def __init__(self, model, columns):
+        self.model = model
+        self.columns = list(columns)
+
+    @property
+    def table(self):
+        return f"{self.model._meta.db_table}_fts"
+
+    def _trigger_sql(self, quote):
+        source, table, pk = (
+            quote(self.model._meta.db_table),
+            quote(self.table),
+            quote(self.model._meta.pk.column),
+        )
+        columns = ", ".join(quote(column) for column in self.columns)
+        new = ", ".join(f"new.{quote(column)}" for column in self.columns)
+        old = ", ".join(f"old.{quote(column)}" for column in self.columns)
+        insert = f"INSERT INTO {table}(rowid, {columns}) VALUES (new.{pk}, {new});"
+        delete = f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.{pk}, {old});"
+        name = self.table
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {quote(name + '_ai')} AFTER INSERT ON {source} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {quote(name + '_ad')} AFTER DELETE ON {source} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {quote(name + '_au')} AFTER UPDATE OF {columns}, {pk} ON {source} "
+            f"BEGIN {delete} {insert} END",
+        ]
+
+    def exists(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [self.table])
+            return cursor.fetchone() is not None
+
+    def install(self, connection):
+        """
+        Create the index and its triggers and index the existing rows.
+        """
+        if connection.vendor != "sqlite":
+            return
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(column) for column in self.columns)
+        table = quote(self.table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {table} USING fts5({columns}, "
+                f"content='{self.model._meta.db_table}', content_rowid='{self.model._meta.pk.column}', "
+                "tokenize='unicode61 remove_diacritics 2', prefix='1 2 3 4')"
+            )
+            for sql in self._trigger_sql(quote):
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+    def uninstall(self, connection):
+        if connection.vendor != "sqlite":
+            return
+        quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            for suffix in ("_ai", "_ad", "_au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {quote(self.table + suffix)}")
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(self.table)}")
+
+    def restore_triggers(self, connection):
+        """
+        Recreate missing triggers, if the index exists. Table rebuilds copy
+        rows with their ids, so the index itself stays valid.
+        """
+        if connection.vendor != "sqlite" or not self.exists(connection):
+            return
+        with connection.cursor() as cursor:
+            for sql in self._trigger_sql(connection.ops.quote_name):
+                cursor.execute(sql)
+
+    def search(self, text, limit=10, using="default"):
+        """
+        Ids of the best `limit` rows matching `text` as prefixes, best first
+        (by bm25, among the first `RANKED_CANDIDATES` matches).
+        """
+        query = match_query(text)
+        if not query:
+            return []
+        connection = connections[using]
+        if connection.vendor != "sqlite":
+            return self.fallback_search(text, limit, using)
+        table = connection.ops.quote_name(self.table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM (SELECT rowid, rank FROM {table} WHERE {table} MATCH %s LIMIT %s) "
+                "ORDER BY rank LIMIT %s",
+                [query, RANKED_CANDIDATES, min(limit, MAX_RESULTS)],
+            )
+            return [pk for (pk,) in cursor.fetchall()]
+
+    def fallback_search(self, text, limit, using):
+        """
+        Ids of rows with each word of `text` somewhere in one of the
+        columns, by id. A table scan: for backends without FTS5.
+        """
+        words = [
+            reduce(or_, [Q(**{f"{column}__icontains": token}) for column in self.columns])
+            for token in TOKEN.findall(text)
+        ]
+        queryset = self.model._default_manager.using(using).filter(reduce(and_, words)).order_by("pk")
+        return list(queryset.values_list("pk", flat=True)[: min(limit, MAX_RESULTS)])
+
+    def objects(self, text, limit=10, queryset=None):
+        """
+        Model instances for `search()`, in rank order.
+        """
+        queryset = self.model._default_manager.all() if queryset is None else queryset
+        pks = self.search(text, limit, queryset.db)
+        found = queryset.in_bulk(pks)
+        return [found[pk] for pk in pks if pk in found]
+
+
+def autocomplete_response(request, index, to_json):
+    """
+    `?q=<text>&limit=<n>` -> `{"results": [to_json(obj), ...]}`, best match
+    first. `limit` defaults to 10 and is clamped to `MAX_RESULTS`.
+    """
+    try:
+        limit = max(1, min(int(request.GET.get("limit", 10)), MAX_RESULTS))
+    except ValueError:
+        return JsonResponse({"limit": ["Expected an integer."]}, status=400)
+    results = index.objects(request.GET.get("q", ""), limit)
+    return JsonResponse({"results": [to_json(obj) for obj in results]})
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,12 +41,19 @@ INSTALLED_APPS = [
     
     # Local apps
     'rest_framework',
+    'django_filters',
     'customers.apps.CustomersConfig',
     'products.apps.ProductsConfig',
     'orders.apps.OrdersConfig',
+    'reports.apps.ReportsConfig',
+    'changes.apps.ChangesConfig',
 ]
 
 MIDDLEWARE = [
+    # First, so its total covers the rest of the stack.
+    'config.middleware.ServerTimingMiddleware',
+    # Compresses everything below it, including streaming exports.
+    'config.compression.GZipMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,6 +65,19 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'config.urls'
 
+# Per-request SQL/view/render timing (config/middleware.py): a Server-Timing
+# header on every response and per-route aggregates at /api/perf/routes/.
+PERF_TIMING_ENABLED = os.environ.get('ERP_PERF_TIMING', '1') != '0'
+PERF_SERVER_TIMING_HEADER = os.environ.get('ERP_SERVER_TIMING_HEADER', '1') != '0'
+# Recent requests per route kept for the p50/p95 figures.
+PERF_ROUTE_SAMPLES = 1000
+
+# Gzip (config/compression.py) for responses of at least GZIP_MIN_LENGTH
+# bytes and for all streaming responses. GZIP_LEVEL is 1-9, or 0 for no
+# compression; see docs/PERFORMANCE.md for the trade-off.
+GZIP_MIN_LENGTH = int(os.environ.get('ERP_GZIP_MIN_LENGTH', 1024))
+GZIP_LEVEL = int(os.environ.get('ERP_GZIP_LEVEL', 6))
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -81,10 +102,70 @@ WSGI_APPLICATION = 'config.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('ERP_DB_PATH', BASE_DIR / 'db.sqlite3'),
     }
 }
 
+# ERP_DB_PROFILE=production tunes SQLite for concurrent web + API load:
+# WAL lets readers run alongside the single writer, IMMEDIATE transactions
+# take the write lock up front (so the busy timeout applies instead of an
+# instant "database is locked"), and connections are reused across requests.
+# See docs/PERFORMANCE.md for the benchmark.
+DB_PROFILE = os.environ.get('ERP_DB_PROFILE', 'development')
+
+if DB_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': int(os.environ.get('ERP_DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': float(os.environ.get('ERP_DB_BUSY_TIMEOUT', 20)),
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': ';'.join([
+                'PRAGMA journal_mode=WAL',
+                'PRAGMA synchronous=NORMAL',
+                'PRAGMA temp_store=MEMORY',
+                f"PRAGMA mmap_size={int(os.environ.get('ERP_DB_MMAP_SIZE', 256 * 1024 * 1024))}",
+                # Negative cache_size is in KiB.
+                f"PRAGMA cache_size=-{int(os.environ.get('ERP_DB_CACHE_SIZE_KB', 64 * 1024))}",
+            ]),
+        },
+    })
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default; set ERP_CACHE_DIR to share a file-based cache
+# between worker processes.
+
+if os.environ.get('ERP_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['ERP_CACHE_DIR'],
+            'OPTIONS': {'MAX_ENTRIES': 200_000},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 200_000},
+        }
+    }
+
+# Product read-through cache (products/cache.py)
+PRODUCT_CACHE_ALIAS = 'default'
+PRODUCT_CACHE_TIMEOUT = 300
+
+# Rendered list page tables (config/fragments.py), keyed by data version so
+# they never go stale; the timeout only bounds how long old ones linger.
+LIST_FRAGMENT_CACHE_TIMEOUT = int(os.environ.get('ERP_LIST_CACHE_TIMEOUT', 3600))
+
+# The order detail formset posts up to 5 fields per line item; Django's
+# default of 1,000 fields would reject orders over ~200 lines. 10,000
+# matches the formset's own limit of 2,000 forms.
+DATA_UPLOAD_MAX_NUMBER_FIELDS = 10_000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -132,4 +213,34 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.DjangoModelPermissionsOrAnonReadOnly',
     ],
+    # Keyset pagination on each viewset's ordering; clients may pass
+    # ?page_size= up to KeysetPagination.max_page_size.
+    'DEFAULT_PAGINATION_CLASS': 'config.pagination.KeysetPagination',
+    'PAGE_SIZE': 50,
+    # Each viewset's `filterset_class` (<app>/filters.py).
+    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # orjson-backed JSON when it is installed (`pip install orjson`), with
+    # the same output and accepted input as DRF's JSON classes.
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
+
+# API list actions encode values_list() rows directly instead of going
+# through ModelSerializer (config/encoders.py); the output is the same.
+API_FAST_LIST = os.environ.get('ERP_API_FAST_LIST', '1') != '0'
+
+# Change feeds (`/api/<resource>/changes/`, changes/feed.py). Rows become
+# visible once their timestamp is this old, so a write that took its
+# `updated_at` before waiting on the write lock cannot commit behind a
+# client's cursor; keep it above the busy timeout plus the longest write
+# transaction. Tombstones older than the retention are pruned by
+# `manage.py prune_tombstones`, and cursors issued before it are refused.
+CHANGE_FEED_SETTLE_SECONDS = float(os.environ.get('ERP_CHANGE_FEED_SETTLE_SECONDS', 30))
+CHANGE_FEED_RETENTION_DAYS = int(os.environ.get('ERP_CHANGE_FEED_RETENTION_DAYS', 30))
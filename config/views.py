@@ -0,0 +1,33 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from products import cache as product_cache
+
+from .middleware import route_stats
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def perf_routes(request):
+    """
+    Per-route request timings for this process (staff only). `DELETE`
+    clears them.
+    """
+    if request.method == "DELETE":
+        route_stats.reset()
+        return Response(status=204)
+    return Response(route_stats.snapshot())
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def perf_product_cache(request):
+    """
+    Product cache hits and misses for this process (staff only). `DELETE`
+    clears them.
+    """
+    if request.method == "DELETE":
+        product_cache.reset_stats()
+        return Response(status=204)
+    return Response(product_cache.cache_stats())
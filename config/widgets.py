@@ -0,0 +1,38 @@
+from django import forms
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    `<select>` for a `ModelChoiceField` that renders only the empty and the
+    selected options, so its size does not grow with the table. Other
+    choices are fetched from `url` (a search endpoint returning
+    `{"results": [{"id", "label"}, ...]}`) by
+    `templates/includes/autocomplete.html`.
+
+    The selected objects come from the field's `get_objects(pks)` (a
+    `{pk: obj}` dict) if it has one, else one `in_bulk()` query.
+    """
+
+    def __init__(self, url, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete"] = str(self.url)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        pks = [int(pk) for pk in value if str(pk).isdigit()]
+        options = []
+        if field.empty_label is not None:
+            options.append(self.create_option(name, "", field.empty_label, not pks, 0, attrs=attrs))
+        if pks:
+            get_objects = getattr(field, "get_objects", self.choices.queryset.in_bulk)
+            found = get_objects(pks)
+            for index, pk in enumerate(pks, start=len(options)):
+                if pk in found:
+                    label = field.label_from_instance(found[pk])
+                    options.append(self.create_option(name, pk, label, True, index, attrs=attrs))
+        return [(None, options, 0)]
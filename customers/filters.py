@@ -0,0 +1,13 @@
+import django_filters
+
+from config.filters import UpdatedFilterSet
+
+from .models import Customer
+
+
+class CustomerFilterSet(UpdatedFilterSet):
+    email = django_filters.CharFilter()
+
+    class Meta:
+        model = Customer
+        fields = ["email", "updated_since", "updated_before"]
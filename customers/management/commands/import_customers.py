@@ -0,0 +1,11 @@
+from config.bulk_import import BulkImportCommand
+from customers.forms import CustomerForm
+from customers.models import Customer
+
+
+class Command(BulkImportCommand):
+    help = "Upsert customers from a CSV or NDJSON file, keyed on email. Rows without an email are always inserted."
+
+    model = Customer
+    form_class = CustomerForm
+    unique_field = "email"
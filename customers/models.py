@@ -11,4 +11,10 @@ class Customer(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    class Meta:
+        indexes = [
+            # API `?updated_since=` / `?updated_before=`.
+            models.Index(fields=["updated_at"], name="customer_updated_at"),
+        ]
@@ -0,0 +1,5 @@
+from config.search import SearchIndex
+
+from .models import Customer
+
+customer_index = SearchIndex(Customer, ["name", "email", "phone"])
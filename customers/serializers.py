@@ -1,7 +1,8 @@
+from config.fieldsets import SparseFieldsetMixin
 from rest_framework import serializers
 from .models import Customer
 
-class CustomerSerializer(serializers.ModelSerializer):
+class CustomerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Customer
         fields = "__all__"
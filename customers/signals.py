@@ -0,0 +1,11 @@
+from django.db import connections
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .search import customer_index
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.name == "customers":
+        customer_index.restore_triggers(connections[using])
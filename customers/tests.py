@@ -1,11 +1,21 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 from django.urls import reverse
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.db.models.deletion import ProtectedError
 
+from testing.query_plans import QueryPlanAssertions
 from orders.models import Order
 from customers.models import Customer
+from customers.views import CustomerViewSet
+from customers.search import customer_index
 
 
 class CustomersWebViewTests(TestCase):
@@ -57,6 +67,41 @@ class CustomersWebViewTests(TestCase):
         self.assertFalse(Customer.objects.filter(pk=c.pk).exists())
 
 
+class CustomerSearchTests(TestCase):
+    def setUp(self):
+        self.acme = Customer.objects.create(name="Acme Corp", email="orders@acme.example", phone="+1 555-0100")
+        self.beta = Customer.objects.create(name="Beta Ltd", phone="020 7946 0000")
+
+    def test_prefix_search_on_name_email_and_phone(self):
+        self.assertEqual(customer_index.search("acm"), [self.acme.pk])
+        self.assertEqual(customer_index.search("orders@"), [self.acme.pk])
+        self.assertEqual(customer_index.search("555-01"), [self.acme.pk])
+        self.assertEqual(customer_index.search("020 79"), [self.beta.pk])
+
+        self.beta.email = "hello@beta.example"
+        self.beta.save()
+        self.assertEqual(customer_index.search("hello"), [self.beta.pk])
+
+    def test_search_endpoint(self):
+        resp = self.client.get(reverse("customers:search"), {"q": "beta"})
+        self.assertEqual(
+            resp.json(),
+            {"results": [{"id": self.beta.pk, "label": "Beta Ltd", "email": None, "phone": "020 7946 0000"}]},
+        )
+
+    def test_other_backends_fall_back_to_icontains(self):
+        both = Customer.objects.create(name="Acme Beta", email="acme@beta.example")
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            self.assertEqual(customer_index.search("acm"), [self.acme.pk, both.pk])
+            self.assertEqual(customer_index.search("beta acme"), [both.pk])
+            self.assertEqual(customer_index.search("0100"), [self.acme.pk])
+            # No FTS5 to create or drop.
+            with CaptureQueriesContext(connection) as ctx:
+                customer_index.uninstall(connection)
+                customer_index.install(connection)
+            self.assertEqual(len(ctx), 0)
+
+
 class CustomersApiTests(TestCase):
     def setUp(self):
         self.api = APIClient()
@@ -78,6 +123,14 @@ class CustomersApiTests(TestCase):
             notes="Test notes",
         )
 
+    def test_filter_customers(self):
+        Customer.objects.create(name="Other", email="other@example.com")
+        resp = self.api.get("/api/customers/", {"email": "acme@example.com"})
+        self.assertEqual([row["id"] for row in resp.json()["results"]], [self.customer.pk])
+        resp = self.api.get("/api/customers/", {"updated_since": "2999-01-01T00:00:00Z"})
+        self.assertEqual(resp.json()["results"], [])
+        self.assertEqual(self.api.get("/api/customers/", {"updated_since": "soon"}).status_code, 400)
+
     def test_list_customers(self):
         resp = self.api.get("/api/customers/")
         self.assertEqual(resp.status_code, 200)
@@ -111,6 +164,16 @@ class CustomersApiTests(TestCase):
         self.assertFalse(Customer.objects.filter(pk=c.pk).exists())
 
 
+class CustomerQueryPlanTests(QueryPlanAssertions, TestCase):
+    def test_api_filters(self):
+        self.assertIndexed(self.api_page(CustomerViewSet, "email=acme@example.com"))
+        self.assertIndexed(
+            self.api_page(CustomerViewSet, "updated_since=2026-01-01T00:00:00Z"),
+            index="customer_updated_at",
+            sort_matches=True,
+        )
+
+
 class CustomersDeleteProtectionTests(TestCase):
     def setUp(self):
         self.customer = Customer.objects.create(name="Acme")
@@ -119,3 +182,23 @@ class CustomersDeleteProtectionTests(TestCase):
     def test_customer_delete_is_protected_when_has_orders(self):
         with self.assertRaises(ProtectedError):
             self.customer.delete()
+
+
+class ImportCustomersCommandTests(TestCase):
+    def test_csv_upsert_on_email(self):
+        Customer.objects.create(name="Acme", email="acme@example.com", phone="555")
+        path = Path(tempfile.mkdtemp()) / "customers.csv"
+        path.write_text(
+            "name,email,phone,notes\n"
+            "Acme Corp,acme@example.com,555-0100,\n"
+            "Walk-in,,,\n"
+            "Globex,globex@example.com,,\n"
+            "Bad,not-an-email,,\n"
+        )
+        out = StringIO()
+        call_command("import_customers", str(path), stdout=out)
+
+        self.assertIn("Inserted 2, updated 1, rejected 1.", out.getvalue())
+        self.assertEqual(Customer.objects.get(email="acme@example.com").name, "Acme Corp")
+        self.assertIsNone(Customer.objects.get(name="Walk-in").email)
+        self.assertEqual(Customer.objects.count(), 3)
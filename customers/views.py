@@ -1,9 +1,15 @@
 from django.shortcuts import render
+from changes.feed import ChangeFeedMixin
+from config.conditional import ConditionalGetMixin
+from config.encoders import FastListMixin
+from config.fieldsets import SparseFieldsetViewMixin
 from rest_framework import viewsets
+from .filters import CustomerFilterSet
 from .models import Customer
 from .serializers import CustomerSerializer
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(ChangeFeedMixin, SparseFieldsetViewMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Customer.objects.all().order_by("id")
     serializer_class = CustomerSerializer
+    filterset_class = CustomerFilterSet
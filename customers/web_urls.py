@@ -1,6 +1,6 @@
 from django.urls import path
 from .web_views import (
-    CustomerListView, CustomerCreateView, CustomerUpdateView, CustomerDeleteView
+    CustomerListView, CustomerCreateView, CustomerUpdateView, CustomerDeleteView, customer_search
 )
 
 app_name = "customers"
@@ -10,4 +10,5 @@ urlpatterns = [
     path("new/", CustomerCreateView.as_view(), name="create"),
     path("<int:pk>/edit/", CustomerUpdateView.as_view(), name="update"),
     path("<int:pk>/delete/", CustomerDeleteView.as_view(), name="delete"),
+    path("search/", customer_search, name="search"),
 ]
@@ -1,13 +1,37 @@
 from django.urls import reverse_lazy
+from django.views.decorators.http import require_GET
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from config.fragments import CachedTableMixin
+from config.pagination import KeysetPaginationMixin
+from config.search import autocomplete_response
 from .models import Customer
 from .forms import CustomerForm
+from .search import customer_index
 
-class CustomerListView(ListView):
+@require_GET
+def customer_search(request):
+    """
+    Autocomplete: customers with words starting with each word of `?q=`
+    in their name, email or phone.
+    """
+    return autocomplete_response(
+        request,
+        customer_index,
+        lambda customer: {
+            "id": customer.pk,
+            "label": str(customer),
+            "email": customer.email,
+            "phone": customer.phone,
+        },
+    )
+
+class CustomerListView(CachedTableMixin, KeysetPaginationMixin, ListView):
     model = Customer
     template_name = "customers/customer_list.html"
+    table_template_name = "customers/customer_list_table.html"
     context_object_name = "customers"
     paginate_by = 25
+    ordering = ["id"]
 
 class CustomerCreateView(CreateView):
     model = Customer
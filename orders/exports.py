@@ -0,0 +1,134 @@
+"""
+Streaming order exports (NDJSON and CSV).
+
+Orders are read in keyset batches (`id > last_id LIMIT n`) and each batch's
+items are fetched with one `IN` query, so memory stays flat no matter how
+many rows are exported and the first line is produced after the first batch.
+"""
+
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import OrderItem
+
+ORDER_FIELDS = (
+    "id", "status", "order_date", "subtotal", "total_items", "item_count",
+    "created_at", "updated_at", "customer_id", "customer__name", "customer__email",
+)
+ITEM_FIELDS = ("id", "order_id", "product_id", "product__sku", "product__name", "quantity", "unit_price")
+
+CSV_HEADER = (
+    "order_id", "order_date", "status", "customer_id", "customer_name", "customer_email",
+    "order_subtotal", "item_id", "product_id", "sku", "product_name", "quantity", "unit_price", "line_total",
+)
+
+
+def filter_orders(queryset, date_from=None, date_to=None, status=None):
+    """
+    Apply `OrderExportFilterForm.cleaned_data` to an order queryset.
+    """
+    if date_from:
+        queryset = queryset.filter(order_date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(order_date__lte=date_to)
+    if status:
+        queryset = queryset.filter(status__in=status)
+    return queryset
+
+
+def iter_orders(queryset, chunk_size=1000):
+    """
+    Yield `(order, items)` pairs of plain dicts, ordered by order id.
+
+    The first batch is small so the first record goes out quickly; batches
+    then double up to `chunk_size`.
+    """
+    last_id = 0
+    batch_size = min(chunk_size, 50)
+    while True:
+        orders = list(queryset.filter(pk__gt=last_id).order_by("pk").values(*ORDER_FIELDS)[:batch_size])
+        if not orders:
+            return
+        last_id = orders[-1]["id"]
+        batch_size = min(batch_size * 2, chunk_size)
+
+        items = {}
+        for item in (
+            OrderItem.objects.filter(order_id__in=[o["id"] for o in orders])
+            .order_by("order_id", "id")
+            .values(*ITEM_FIELDS)
+        ):
+            items.setdefault(item["order_id"], []).append(item)
+
+        for order in orders:
+            yield order, items.get(order["id"], [])
+
+
+def ndjson_lines(queryset, chunk_size=1000):
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    for order, items in iter_orders(queryset, chunk_size):
+        record = {
+            "id": order["id"],
+            "status": order["status"],
+            "order_date": order["order_date"],
+            "subtotal": order["subtotal"],
+            "total_items": order["total_items"],
+            "item_count": order["item_count"],
+            "created_at": order["created_at"],
+            "updated_at": order["updated_at"],
+            "customer": {
+                "id": order["customer_id"],
+                "name": order["customer__name"],
+                "email": order["customer__email"],
+            },
+            "items": [
+                {
+                    "id": item["id"],
+                    "product": item["product_id"],
+                    "sku": item["product__sku"],
+                    "name": item["product__name"],
+                    "quantity": item["quantity"],
+                    "unit_price": item["unit_price"],
+                    "line_total": item["unit_price"] * item["quantity"],
+                }
+                for item in items
+            ],
+        }
+        yield encoder.encode(record) + "\n"
+
+
+class _Echo:
+    """File-like object whose write() hands the formatted line back."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(queryset, chunk_size=1000):
+    """
+    One row per order item; orders without items get one row with blank item columns.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for order, items in iter_orders(queryset, chunk_size):
+        head = (
+            order["id"], order["order_date"].isoformat(), order["status"], order["customer_id"],
+            order["customer__name"], order["customer__email"] or "", order["subtotal"],
+        )
+        if not items:
+            yield writer.writerow(head + ("",) * 7)
+        for item in items:
+            yield writer.writerow(
+                head
+                + (
+                    item["id"], item["product_id"], item["product__sku"], item["product__name"],
+                    item["quantity"], item["unit_price"], item["unit_price"] * item["quantity"],
+                )
+            )
+
+
+EXPORTERS = {
+    "ndjson": ("application/x-ndjson", ndjson_lines),
+    "csv": ("text/csv", csv_lines),
+}
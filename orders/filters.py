@@ -0,0 +1,26 @@
+import django_filters
+
+from config.filters import UpdatedFilterSet
+
+from .models import Order, OrderItem
+
+
+class OrderFilterSet(UpdatedFilterSet):
+    # Same names and semantics as the export filters (OrderExportFilterForm).
+    status = django_filters.MultipleChoiceFilter(choices=Order.Status.choices)
+    customer = django_filters.NumberFilter(field_name="customer_id")
+    date_from = django_filters.DateFilter(field_name="order_date", lookup_expr="gte")
+    date_to = django_filters.DateFilter(field_name="order_date", lookup_expr="lte")
+
+    class Meta:
+        model = Order
+        fields = ["status", "customer", "date_from", "date_to", "updated_since", "updated_before"]
+
+
+class OrderItemFilterSet(UpdatedFilterSet):
+    order = django_filters.NumberFilter(field_name="order_id")
+    product = django_filters.NumberFilter(field_name="product_id")
+
+    class Meta:
+        model = OrderItem
+        fields = ["order", "product", "updated_since", "updated_before"]
@@ -1,14 +1,83 @@
 from django import forms
-from django.forms import inlineformset_factory
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.forms import BaseInlineFormSet, inlineformset_factory
+from django.urls import reverse_lazy
+from django.utils.functional import cached_property
 from decimal import Decimal
 
+from config.widgets import AutocompleteSelect
+from products.cache import get_products
+from products.models import Product
 from .models import Order, OrderItem
+from .services import save_item_changes
 
 
 class OrderForm(forms.ModelForm):
     class Meta:
         model = Order
         fields = ["customer", "status"]
+        widgets = {"customer": AutocompleteSelect(reverse_lazy("customers:search"))}
+
+
+class CachedProductChoiceField(forms.ModelChoiceField):
+    """
+    Resolves the submitted product through the product cache instead of
+    a query per form. Any existing product is accepted, matching the
+    unfiltered `Product` queryset this field is built with.
+
+    `products` is a `{pk: Product}` dict the formset resolves once for all
+    its rows; ids missing from it are looked up in the cache.
+    """
+
+    products = None
+
+    def get_objects(self, pks):
+        products = self.products or {}
+        found = {pk: products[pk] for pk in pks if pk in products}
+        missing = [pk for pk in pks if pk not in found]
+        if missing:
+            found.update(get_products(missing))
+        return found
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        product = self.get_objects([int(value)]).get(int(value)) if str(value).isdigit() else None
+        if product is None:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+        return product
+
+
+class FormsetObjectChoiceField(forms.ModelChoiceField):
+    """
+    The hidden id field of a model formset row, resolved from the objects
+    the formset has already loaded instead of a `get()` per row.
+    """
+
+    def __init__(self, formset, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.formset = formset
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            obj = self.formset._existing_object(self.queryset.model._meta.pk.to_python(value))
+        except ValidationError:
+            obj = None
+        if obj is None:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
+        return obj
 
 
 class OrderItemForm(forms.ModelForm):
@@ -17,6 +86,24 @@ class OrderItemForm(forms.ModelForm):
     class Meta:
         model = OrderItem
         fields = ["product", "quantity", "unit_price"]
+        field_classes = {"product": CachedProductChoiceField}
+        widgets = {"product": AutocompleteSelect(reverse_lazy("products:search"))}
+
+    def __init__(self, *args, products=None, prices=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["product"].products = products
+        self.prices = prices
+        # A formset passing `products` checks (order, product) for all rows
+        # at once; see BaseOrderItemFormSet.validate_unique().
+        self.unique_checked_by_formset = products is not None
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        if self.unique_checked_by_formset:
+            # The product was resolved by the field, so the model's
+            # per-row `exists()` and unique checks are skipped.
+            exclude.add("product")
+        return exclude
 
     def clean(self):
         cleaned = super().clean()
@@ -25,15 +112,146 @@ class OrderItemForm(forms.ModelForm):
 
         # If user leaves unit_price blank, default from product.price
         if product and (unit_price is None):
-            cleaned["unit_price"] = product.price
+            cleaned["unit_price"] = self.current_price(product)
 
         return cleaned
 
+    def current_price(self, product):
+        """
+        The product's price from the database. The cached `product` may
+        predate a price change made in another process, and this price is
+        saved onto the line.
+        """
+        if self.prices is not None and product.pk in self.prices:
+            return self.prices[product.pk]
+        price = Product.objects.filter(pk=product.pk).values_list("price", flat=True).first()
+        return product.price if price is None else price
+
+
+class BaseOrderItemFormSet(BaseInlineFormSet):
+    """
+    Shares one product lookup between all rows, resolves row ids from the
+    items it loaded, and checks (order, product) uniqueness for all rows
+    together, so validation and rendering take the same number of queries
+    for any number of rows.
+    """
+
+    @cached_property
+    def products(self):
+        """
+        `{pk: Product}` for every product on the submitted (or loaded) rows.
+        """
+        if self.is_bound:
+            pks = [self.data.get(f"{self.add_prefix(i)}-product") for i in range(self.total_form_count())]
+        else:
+            pks = [item.product_id for item in self.get_queryset()]
+        return get_products(pk for pk in pks if pk is not None and str(pk).isdigit())
+
+    @cached_property
+    def prices(self):
+        """
+        Current `{pk: price}`, loaded with one query, for the products of
+        bound rows submitted without a `unit_price`.
+        """
+        if not self.is_bound:
+            return {}
+        pks = [
+            self.data.get(f"{self.add_prefix(i)}-product")
+            for i in range(self.total_form_count())
+            if self.data.get(f"{self.add_prefix(i)}-unit_price") in (None, "")
+        ]
+        pks = [pk for pk in pks if pk is not None and str(pk).isdigit()]
+        return dict(Product.objects.filter(pk__in=pks).values_list("pk", "price")) if pks else {}
+
+    def get_form_kwargs(self, index):
+        return {**super().get_form_kwargs(index), "products": self.products, "prices": self.prices}
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        name = self._pk_field.name
+        field = form.fields[name]
+        form.fields[name] = FormsetObjectChoiceField(
+            self, field.queryset, initial=field.initial, required=False, widget=field.widget
+        )
+
+    def validate_unique(self):
+        # The rows exclude `product` from model validation, so the base
+        # check skips (order, product); it is done here against the loaded
+        # items instead of one query per row.
+        super().validate_unique()
+        forms_to_delete = self.deleted_forms
+        deleted = {form.instance.pk for form in forms_to_delete}
+        existing = {item.product_id: item.pk for item in self.get_queryset() if item.pk not in deleted}
+        seen = set()
+        errors = []
+        for form in self.forms:
+            if form in forms_to_delete or not form.is_valid():
+                continue
+            product = form.cleaned_data.get("product")
+            if product is None:
+                continue
+            if product.pk in seen:
+                form._errors[NON_FIELD_ERRORS] = self.error_class([self.get_form_error()], renderer=self.renderer)
+                del form.cleaned_data["product"]
+                errors.append(self.get_unique_error_message(["order", "product"]))
+                continue
+            seen.add(product.pk)
+            if existing.get(product.pk, form.instance.pk) != form.instance.pk:
+                form.add_error(None, form.instance.unique_error_message(OrderItem, ("order", "product")))
+        if errors:
+            raise ValidationError(errors)
+
+    def save(self, commit=True):
+        """
+        Save every change with one bulk operation per kind (see
+        `save_item_changes()`). Rows are only written if a value differs
+        from what was loaded. `commit=False` behaves as in Django.
+        """
+        if not commit:
+            return super().save(commit=False)
+
+        # `deleted_forms` revalidates every form on each access.
+        deleted_forms = set(self.deleted_forms)
+        self.deleted_objects = [form.instance for form in deleted_forms if form.instance.pk is not None]
+        self.changed_objects = []
+        self.new_objects = []
+        update_fields = set()
+        for form in self.initial_forms:
+            if form in deleted_forms or not form.has_changed():
+                continue
+            changed = [
+                name
+                for name in form._meta.fields
+                if form.initial.get(name) != getattr(form.instance, OrderItem._meta.get_field(name).attname)
+            ]
+            if changed:
+                update_fields.update(changed)
+                self.changed_objects.append((form.instance, changed))
+        for form in self.extra_forms:
+            if form.has_changed() and form not in deleted_forms:
+                self.new_objects.append(form.instance)
+
+        save_item_changes(
+            self.instance,
+            created=self.new_objects,
+            updated=[item for item, _ in self.changed_objects],
+            update_fields=sorted(update_fields),
+            deleted=self.deleted_objects,
+        )
+        return [item for item, _ in self.changed_objects] + self.new_objects
+
 
 OrderItemFormSet = inlineformset_factory(
     Order,
     OrderItem,
     form=OrderItemForm,
+    formset=BaseOrderItemFormSet,
     extra=1,
     can_delete=True,
 )
+
+
+class OrderExportFilterForm(forms.Form):
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+    status = forms.MultipleChoiceField(choices=Order.Status.choices, required=False)
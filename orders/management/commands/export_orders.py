@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.exports import EXPORTERS, filter_orders
+from orders.forms import OrderExportFilterForm
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = "Stream orders with customer and line items as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(EXPORTERS), default="ndjson")
+        parser.add_argument("--date-from", help="YYYY-MM-DD, inclusive")
+        parser.add_argument("--date-to", help="YYYY-MM-DD, inclusive")
+        parser.add_argument("--status", action="append", default=[], help="Repeat for several statuses.")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout).")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        form = OrderExportFilterForm(
+            {"date_from": options["date_from"], "date_to": options["date_to"], "status": options["status"]}
+        )
+        if not form.is_valid():
+            raise CommandError(form.errors.as_text())
+
+        _, lines = EXPORTERS[options["format"]]
+        queryset = filter_orders(Order.objects.all(), **form.cleaned_data)
+        chunks = lines(queryset, options["chunk_size"])
+
+        if not options["output"]:
+            for line in chunks:
+                self.stdout.write(line, ending="")
+            return
+
+        # csv.writer already emits \r\n; don't let the file translate it.
+        with open(options["output"], "w", encoding="utf-8", newline="") as out:
+            out.writelines(chunks)
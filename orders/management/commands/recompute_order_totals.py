@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from orders.models import LINE_TOTAL, Order, OrderItem
+
+TOTAL_FIELDS = ("subtotal", "total_items", "item_count")
+
+
+class Command(BaseCommand):
+    help = "Recompute stored order totals from line items and repair any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report orders with stale totals without writing.",
+        )
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        checked = repaired = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                Order.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", *TOTAL_FIELDS)[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            computed = {
+                row["order_id"]: row
+                for row in OrderItem.objects.filter(order_id__in=[row[0] for row in batch])
+                .values("order_id")
+                .annotate(subtotal=Sum(LINE_TOTAL), total_items=Sum("quantity"), item_count=Count("id"))
+                .order_by()
+            }
+
+            stale = []
+            for pk, *stored in batch:
+                row = computed.get(pk)
+                expected = (
+                    (row["subtotal"].quantize(Decimal("0.01")), row["total_items"], row["item_count"])
+                    if row
+                    else (Decimal("0.00"), 0, 0)
+                )
+                if tuple(stored) != expected:
+                    stale.append(Order(pk=pk, **dict(zip(TOTAL_FIELDS, expected))))
+
+            checked += len(batch)
+            repaired += len(stale)
+            if stale and not dry_run:
+                now = timezone.now()
+                for order in stale:
+                    order.updated_at = now
+                with transaction.atomic():
+                    Order.objects.bulk_update(stale, [*TOTAL_FIELDS, "updated_at"])
+
+        verb = "Would repair" if dry_run else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} orders. {verb} {repaired}."))
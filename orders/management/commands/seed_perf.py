@@ -0,0 +1,136 @@
+import itertools
+import random
+import time
+from datetime import datetime, time as day_time, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from customers.models import Customer
+from orders.models import Order, OrderItem
+from products.models import Product
+
+CENT = Decimal("0.01")
+
+# Roughly what a wholesale order book looks like: most orders are placed
+# or shipped, most lines are for one or two units, a few are bulk.
+STATUS_WEIGHTS = {
+    Order.Status.DRAFT: 5,
+    Order.Status.PLACED: 30,
+    Order.Status.SHIPPED: 60,
+    Order.Status.CANCELLED: 5,
+}
+QUANTITY_WEIGHTS = {1: 50, 2: 20, 3: 10, 4: 6, 5: 5, 10: 6, 20: 3}
+
+
+class Command(BaseCommand):
+    help = "Add synthetic customers, products and orders for performance testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=1000)
+        parser.add_argument("--products", type=int, default=500)
+        parser.add_argument("--orders", type=int, default=10_000)
+        parser.add_argument("--days", type=int, default=365, help="Spread order dates over this many days up to today.")
+        parser.add_argument("--max-lines", type=int, default=40, help="Most line items on one order.")
+        parser.add_argument("--seed", type=int, default=42, help="Same seed and starting data, same rows.")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Orders per transaction.")
+
+    def handle(self, *args, customers, products, orders, days, max_lines, seed, batch_size, **options):
+        rng = random.Random(seed)
+        started = time.perf_counter()
+
+        # Suffixes start past the highest id so emails and SKUs stay free when
+        # seeding on top of an earlier run, even after some of its rows were
+        # deleted: a seeded row's id is always greater than its suffix.
+        offset = Customer.objects.aggregate(Max("id"))["id__max"] or 0
+        Customer.objects.bulk_create(
+            (
+                Customer(name=f"Customer {n}", email=f"customer{n}@perf.example.com", phone=f"555-{n:07d}")
+                for n in range(offset, offset + customers)
+            ),
+            batch_size=batch_size,
+        )
+        offset = Product.objects.aggregate(Max("id"))["id__max"] or 0
+        Product.objects.bulk_create(
+            (
+                Product(
+                    sku=f"PERF-{n:07d}",
+                    name=f"Product {n}",
+                    price=Decimal(min(max(rng.lognormvariate(3, 1), 0.5), 5000)).quantize(CENT),
+                    is_active=rng.random() > 0.05,
+                )
+                for n in range(offset, offset + products)
+            ),
+            batch_size=batch_size,
+        )
+
+        customer_ids = list(Customer.objects.order_by("id").values_list("id", flat=True))
+        catalogue = list(Product.objects.order_by("id").values_list("id", "price"))
+        # Zipf-like popularity: a few products appear on most orders.
+        popularity = list(itertools.accumulate(1 / rank**1.1 for rank in range(1, len(catalogue) + 1)))
+        rng.shuffle(catalogue)
+        max_lines = min(max_lines, len(catalogue))
+
+        today = timezone.localdate()
+        order_days = sorted((rng.randrange(days) for _ in range(orders)), reverse=True)
+        items_created = 0
+        for start in range(0, orders, batch_size):
+            with transaction.atomic():
+                items_created += self.create_orders(
+                    rng, order_days[start : start + batch_size], today, customer_ids, catalogue, popularity, max_lines
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {customers} customers, {products} products, {orders} orders "
+                f"and {items_created} items in {time.perf_counter() - started:.1f}s."
+            )
+        )
+
+    def create_orders(self, rng, order_days, today, customer_ids, catalogue, popularity, max_lines):
+        """
+        Insert one batch of orders (oldest first) with their items and
+        stored totals. Returns the number of items.
+        """
+        batch = []
+        for _ in order_days:
+            # Log-normal line counts: median around three, a long tail.
+            count = min(max_lines, int(rng.lognormvariate(1.0, 0.8)) + 1)
+            picked = set()
+            while len(picked) < count:
+                picked.update(rng.choices(range(len(catalogue)), cum_weights=popularity, k=count - len(picked)))
+            lines = []
+            for index in picked:
+                product_id, price = catalogue[index]
+                if rng.random() < 0.1:
+                    price = (price * Decimal("0.9")).quantize(CENT)
+                lines.append((product_id, rng.choices(*zip(*QUANTITY_WEIGHTS.items()))[0], price))
+            order = Order(
+                customer_id=rng.choice(customer_ids),
+                status=rng.choices(*zip(*STATUS_WEIGHTS.items()))[0],
+                subtotal=sum(price * quantity for _, quantity, price in lines),
+                total_items=sum(quantity for _, quantity, _ in lines),
+                item_count=len(lines),
+            )
+            batch.append((order, lines))
+
+        Order.objects.bulk_create([order for order, _ in batch])
+        OrderItem.objects.bulk_create(
+            OrderItem(order_id=order.pk, product_id=product_id, quantity=quantity, unit_price=price)
+            for order, lines in batch
+            for product_id, quantity, price in lines
+        )
+
+        # order_date and created_at are auto_now_add; backdate them with one
+        # UPDATE per day over the contiguous id range that day received.
+        for days_ago, group in itertools.groupby(zip(order_days, batch), key=lambda pair: pair[0]):
+            group = [order for _, (order, _) in group]
+            day = today - timedelta(days=days_ago)
+            Order.objects.filter(pk__range=(group[0].pk, group[-1].pk)).update(
+                order_date=day,
+                created_at=timezone.make_aware(datetime.combine(day, day_time(12))),
+            )
+        return sum(len(lines) for _, lines in batch)
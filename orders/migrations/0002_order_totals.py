@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:16
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+
+def backfill_totals(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+
+    line_total = ExpressionWrapper(
+        F("unit_price") * F("quantity"),
+        output_field=DecimalField(max_digits=14, decimal_places=2),
+    )
+    rows = (
+        OrderItem.objects.values("order_id")
+        .annotate(subtotal=Sum(line_total), total_items=Sum("quantity"), item_count=Count("id"))
+        .order_by()
+    )
+    orders = [
+        Order(
+            pk=row["order_id"],
+            subtotal=row["subtotal"].quantize(Decimal("0.01")),
+            total_items=row["total_items"],
+            item_count=row["item_count"],
+        )
+        for row in rows
+    ]
+    Order.objects.bulk_update(orders, ["subtotal", "total_items", "item_count"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_items',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,31 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.utils import timezone
 from decimal import Decimal
 
 
+LINE_TOTAL = ExpressionWrapper(
+    F("unit_price") * F("quantity"),
+    output_field=DecimalField(max_digits=14, decimal_places=2),
+)
+
+
+def compute_totals(items):
+    """
+    Aggregate stored totals for an OrderItem queryset in a single query.
+    """
+    totals = items.aggregate(
+        subtotal=Sum(LINE_TOTAL),
+        total_items=Sum("quantity"),
+        item_count=Count("id"),
+    )
+    return {
+        "subtotal": (totals["subtotal"] or Decimal("0.00")).quantize(Decimal("0.01")),
+        "total_items": totals["total_items"] or 0,
+        "item_count": totals["item_count"],
+    }
+
+
 class Order(models.Model):
     class Status(models.TextChoices):
         DRAFT = "DRAFT", "Draft"
@@ -15,20 +39,44 @@ class Order(models.Model):
         related_name="orders",
     )
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
-    order_date = models.DateField(auto_now_add=True)
+    order_date = models.DateField(auto_now_add=True, db_index=True)
+
+    # Denormalized from items; kept in sync by OrderItem.save()/delete()
+    # and refresh_totals(). Repair with `manage.py recompute_order_totals`.
+    subtotal = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"), editable=False)
+    total_items = models.PositiveIntegerField(default=0, editable=False)
+    item_count = models.PositiveIntegerField(default=0, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
-    def subtotal(self):
-        return sum((item.line_total() for item in self.items.all()), Decimal("0.00"))
 
-    def total_items(self):
-        return sum((item.quantity for item in self.items.all()), 0)
+    def refresh_totals(self):
+        """
+        Recompute the stored totals from the order's items and persist them.
+        """
+        totals = compute_totals(OrderItem.objects.filter(order_id=self.pk))
+        now = timezone.now()
+        Order.objects.filter(pk=self.pk).update(updated_at=now, **totals)
+        for name, value in totals.items():
+            setattr(self, name, value)
+        self.updated_at = now
 
     def __str__(self):
         return f"Order #{self.id}"
-    
+
+    class Meta:
+        indexes = [
+            # A customer's orders, optionally by status and date range.
+            models.Index(fields=["customer", "status", "order_date"], name="order_customer_status_date"),
+            # Orders in a status over a date range (reports, exports).
+            models.Index(fields=["status", "order_date"], name="order_status_date"),
+            # API `?status=` pages: rowid order within a status, so
+            # `ORDER BY id LIMIT n` reads the first n entries without a sort.
+            models.Index(fields=["status"], name="order_status"),
+            # API `?updated_since=` / `?updated_before=`.
+            models.Index(fields=["updated_at"], name="order_updated_at"),
+        ]
+
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
@@ -42,9 +90,44 @@ class OrderItem(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded order so moving an item refreshes both orders.
+        instance._loaded_order_id = instance.__dict__.get("order_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._order_for_totals().refresh_totals()
+            previous = getattr(self, "_loaded_order_id", None)
+            if previous is not None and previous != self.order_id:
+                Order(pk=previous).refresh_totals()
+            self._loaded_order_id = self.order_id
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self._order_for_totals().refresh_totals()
+        return result
+
+    def _order_for_totals(self):
+        # Reuse a loaded order so callers see fresh totals, without
+        # fetching one just to update it.
+        if OrderItem.order.is_cached(self):
+            return self.order
+        return Order(pk=self.order_id)
+
     def line_total(self):
         return (self.unit_price or Decimal("0.00")) * self.quantity
 
     class Meta:
-        unique_together = ("order", "product")
\ No newline at end of file
+        unique_together = ("order", "product")
+        indexes = [
+            # Items by product: the PROTECT check on product delete, and
+            # per-product sales; `order` makes it covering for both.
+            models.Index(fields=["product", "order"], name="orderitem_product_order"),
+            models.Index(fields=["updated_at"], name="orderitem_updated_at"),
+        ]
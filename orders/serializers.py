@@ -1,14 +1,28 @@
+from config.fieldsets import SparseFieldsetMixin
 from rest_framework import serializers
 from .models import Order, OrderItem
 
-class OrderItemSerializer(serializers.ModelSerializer):
+class OrderItemSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = OrderItem
         fields = "__all__"
+        expandable = {"product": "products.serializers.ProductSerializer"}
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     items = OrderItemSerializer(many=True, read_only=True)
 
     class Meta:
         model = Order
         fields = "__all__"
+        expandable = {"customer": "customers.serializers.CustomerSerializer"}
+
+
+class BulkOrderItemLineSerializer(serializers.Serializer):
+    """
+    One line of a bulk item payload. Products are resolved for the whole
+    batch at once, so `product` is a plain id here.
+    """
+
+    product = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1, default=1)
+    unit_price = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, allow_null=True)
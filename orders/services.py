@@ -0,0 +1,120 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+
+from products.models import Product
+
+from .models import OrderItem
+
+
+class UnknownProducts(Exception):
+    def __init__(self, product_ids):
+        super().__init__(f"Unknown product ids: {sorted(product_ids)}")
+        self.product_ids = set(product_ids)
+
+
+def bulk_add_items(order, lines, batch_size=500):
+    """
+    Add validated `{"product", "quantity", "unit_price"}` lines to an order.
+
+    Lines for the same product (in the payload or already on the order)
+    are merged by adding quantities; an explicit `unit_price` replaces the
+    stored one, a missing one defaults from `Product.price` like
+    `OrderItemForm.clean`. Everything is written in one transaction with
+    batched upserts, then the order totals are refreshed once.
+
+    Returns `(created, updated)` counts.
+    """
+    merged = {}
+    for line in lines:
+        entry = merged.setdefault(line["product"], {"quantity": 0, "unit_price": None})
+        entry["quantity"] += line["quantity"]
+        if line.get("unit_price") is not None:
+            entry["unit_price"] = line["unit_price"]
+
+    products = Product.objects.only("id", "price").in_bulk(list(merged))
+    missing = merged.keys() - products.keys()
+    if missing:
+        raise UnknownProducts(missing)
+
+    with transaction.atomic():
+        # Read the order's rows once rather than an IN over every payload id.
+        existing = {
+            item.product_id: item
+            for item in OrderItem.objects.filter(order=order).only("product_id", "quantity", "unit_price")
+            if item.product_id in merged
+        }
+
+        rows = []
+        for product_id, entry in merged.items():
+            item = existing.get(product_id)
+            if item is None:
+                quantity = entry["quantity"]
+                unit_price = products[product_id].price
+            else:
+                quantity = item.quantity + entry["quantity"]
+                unit_price = item.unit_price
+            if entry["unit_price"] is not None:
+                unit_price = entry["unit_price"]
+            rows.append(OrderItem(order=order, product_id=product_id, quantity=quantity, unit_price=unit_price))
+
+        # Final quantities are computed above, so one upsert covers both new
+        # and merged rows; created_at is left alone on conflict.
+        OrderItem.objects.bulk_create(
+            rows,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["order", "product"],
+            update_fields=["quantity", "unit_price", "updated_at"],
+        )
+        order.refresh_totals()
+
+    updated = len(existing)
+    return len(rows) - updated, updated
+
+
+def save_item_changes(order, created=(), updated=(), update_fields=(), deleted=(), batch_size=500):
+    """
+    Apply a set of line-item changes to an order in one transaction: one
+    DELETE, one UPDATE of `update_fields` and one INSERT per `batch_size`
+    rows, in that order so a product freed by a delete can be reused, then
+    one totals refresh. Updated rows get the same `updated_at`.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        if deleted:
+            OrderItem.objects.filter(order=order, pk__in=[item.pk for item in deleted]).delete()
+        for start in range(0, len(updated), batch_size):
+            batch = updated[start : start + batch_size]
+            for item in batch:
+                item.updated_at = now
+            OrderItem.objects.filter(pk__in=[item.pk for item in batch]).update(
+                updated_at=now, **{name: _values_by_pk(batch, name) for name in update_fields}
+            )
+        if created:
+            for item in created:
+                item.order = order
+            OrderItem.objects.bulk_create(created, batch_size=batch_size)
+        order.refresh_totals()
+
+
+def _values_by_pk(items, name):
+    """
+    Update expression giving each of `items` its own value of field `name`.
+    Unlike `bulk_update()`, which builds one WHEN per row, this builds one
+    `WHEN pk IN (...)` per distinct value, so setting many rows to a few
+    values stays cheap.
+    """
+    field = OrderItem._meta.get_field(name)
+    pks_by_value = defaultdict(list)
+    for item in items:
+        pks_by_value[getattr(item, field.attname)].append(item.pk)
+    if len(pks_by_value) == 1:
+        (value,) = pks_by_value
+        return Value(value, output_field=field)
+    return Case(
+        *[When(pk__in=pks, then=Value(value, output_field=field)) for value, pks in pks_by_value.items()],
+        output_field=field,
+    )
@@ -1,13 +1,42 @@
+import csv
+import gzip
+import io
+import json
+import uuid
+import zlib
+from datetime import date, datetime, timedelta, timezone as dt_timezone
 from decimal import Decimal
+from io import StringIO
+from unittest import mock
 from django.urls import reverse
-from django.test import TestCase
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from django.db.models.deletion import ProtectedError
 
+from products import cache as product_cache
 from products.models import Product
 from customers.models import Customer
 from orders.models import Order, OrderItem
+from orders.views import OrderItemViewSet, OrderViewSet
+from orders.web_views import OrderListView
+from config.compression import GZipMiddleware
+from testing.query_plans import QueryPlanAssertions
+from config.middleware import route_stats
+from config.pagination import KeysetPagination
+from config.parsers import FastJSONParser
+from config.renderers import FastJSONRenderer
 
 
 class OrderTotalsTests(TestCase):
@@ -31,8 +60,55 @@ class OrderTotalsTests(TestCase):
         OrderItem.objects.create(order=order, product=self.p1, quantity=2, unit_price=Decimal("10.00"))
         OrderItem.objects.create(order=order, product=self.p2, quantity=4, unit_price=Decimal("2.50"))
 
-        self.assertEqual(order.total_items(), 6)
-        self.assertEqual(order.subtotal(), Decimal("30.00"))
+        order.refresh_from_db()
+        self.assertEqual(order.total_items, 6)
+        self.assertEqual(order.subtotal, Decimal("30.00"))
+        self.assertEqual(order.item_count, 2)
+
+    def test_totals_follow_item_update_and_delete(self):
+        order = Order.objects.create(customer=self.customer)
+        item = OrderItem.objects.create(order=order, product=self.p1, quantity=2, unit_price=Decimal("10.00"))
+        OrderItem.objects.create(order=order, product=self.p2, quantity=4, unit_price=Decimal("2.50"))
+
+        item.quantity = 5
+        item.save()
+        order.refresh_from_db()
+        self.assertEqual(order.subtotal, Decimal("60.00"))
+        self.assertEqual(order.total_items, 9)
+
+        item.delete()
+        order.refresh_from_db()
+        self.assertEqual(order.subtotal, Decimal("10.00"))
+        self.assertEqual(order.total_items, 4)
+        self.assertEqual(order.item_count, 1)
+
+    def test_moving_item_refreshes_both_orders(self):
+        source = Order.objects.create(customer=self.customer)
+        target = Order.objects.create(customer=self.customer)
+        OrderItem.objects.create(order=source, product=self.p1, quantity=2, unit_price=Decimal("10.00"))
+
+        item = OrderItem.objects.get()
+        item.order_id = target.pk
+        item.save()
+
+        source.refresh_from_db()
+        target.refresh_from_db()
+        self.assertEqual((source.subtotal, source.item_count), (Decimal("0.00"), 0))
+        self.assertEqual((target.subtotal, target.item_count), (Decimal("20.00"), 1))
+
+    def test_recompute_command_repairs_stale_totals(self):
+        order = Order.objects.create(customer=self.customer)
+        OrderItem.objects.create(order=order, product=self.p1, quantity=3, unit_price=Decimal("10.00"))
+        Order.objects.filter(pk=order.pk).update(subtotal=Decimal("0.00"), total_items=0, item_count=0)
+
+        out = StringIO()
+        call_command("recompute_order_totals", stdout=out)
+
+        order.refresh_from_db()
+        self.assertEqual(order.subtotal, Decimal("30.00"))
+        self.assertEqual(order.total_items, 3)
+        self.assertEqual(order.item_count, 1)
+        self.assertIn("Repaired 1", out.getvalue())
 
 
 class OrdersWebViewTests(TestCase):
@@ -45,6 +121,32 @@ class OrdersWebViewTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, "Orders")
 
+    def test_detail_embeds_product_prices(self):
+        order = Order.objects.create(customer=self.customer)
+        resp = self.client.get(reverse("orders:detail", kwargs={"pk": order.pk}))
+        self.assertEqual(resp.context["product_prices"], {})
+        self.assertContains(resp, 'id="product-prices"')
+
+        OrderItem.objects.create(order=order, product=self.product, quantity=1, unit_price=Decimal("10.00"))
+        resp = self.client.get(reverse("orders:detail", kwargs={"pk": order.pk}))
+        self.assertEqual(resp.context["product_prices"], {str(self.product.pk): "10.00"})
+
+    def test_order_forms_render_selected_choices_only(self):
+        other = Product.objects.create(sku="SKU-2", name="Gadget", price=Decimal("5.00"))
+        Customer.objects.create(name="Globex")
+        order = Order.objects.create(customer=self.customer)
+        OrderItem.objects.create(order=order, product=self.product, quantity=1, unit_price=Decimal("10.00"))
+
+        resp = self.client.get(reverse("orders:detail", kwargs={"pk": order.pk}))
+        self.assertContains(resp, f'data-autocomplete="{reverse("products:search")}"', count=2)
+        self.assertContains(resp, f'<option value="{self.product.pk}" selected>SKU-1 - Widget</option>', html=True)
+        self.assertNotContains(resp, other.sku)
+
+        resp = self.client.get(reverse("orders:create"))
+        self.assertContains(resp, f'data-autocomplete="{reverse("customers:search")}"')
+        self.assertNotContains(resp, "Acme")
+        self.assertNotContains(resp, "Globex")
+
     def test_create_order_redirects_to_detail(self):
         resp = self.client.post(
             reverse("orders:create"),
@@ -82,8 +184,89 @@ class OrdersWebViewTests(TestCase):
         self.assertEqual(item.unit_price, Decimal("10.00"))
 
         self.assertEqual(item.line_total(), Decimal("30.00"))
-        self.assertEqual(order.subtotal(), Decimal("30.00"))
-        self.assertEqual(order.total_items(), 3)
+        self.assertEqual(order.subtotal, Decimal("30.00"))
+        self.assertEqual(order.total_items, 3)
+
+    def test_blank_unit_price_uses_current_price_not_cached_one(self):
+        order = Order.objects.create(customer=self.customer)
+        product_cache.get_product(self.product.pk)
+        # Another process repriced the product; this process's cache has not seen it.
+        Product.objects.filter(pk=self.product.pk).update(price=Decimal("12.00"))
+
+        resp = self.client.post(
+            reverse("orders:detail", kwargs={"pk": order.pk}),
+            {
+                "items-TOTAL_FORMS": "1",
+                "items-INITIAL_FORMS": "0",
+                "items-MIN_NUM_FORMS": "0",
+                "items-MAX_NUM_FORMS": "1000",
+                "items-0-product": str(self.product.pk),
+                "items-0-quantity": "1",
+                "items-0-unit_price": "",
+            },
+        )
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(order.items.get().unit_price, Decimal("12.00"))
+
+    def test_orders_list_does_not_read_items(self):
+        for _ in range(3):
+            order = Order.objects.create(customer=self.customer)
+            OrderItem.objects.create(order=order, product=self.product, quantity=2, unit_price=Decimal("10.00"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("orders:list"))
+
+        self.assertContains(resp, "$20.00")
+        self.assertFalse(any("orders_orderitem" in q["sql"] for q in ctx.captured_queries))
+
+
+class ListTableCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer = Customer.objects.create(name="Acme")
+        self.product = Product.objects.create(sku="SKU-1", name="Widget", price=Decimal("10.00"))
+        self.orders = [Order.objects.create(customer=self.customer) for _ in range(3)]
+
+    def test_hits_skip_the_rows_query(self):
+        for name, versions in [("orders:list", 2), ("products:list", 1), ("customers:list", 1)]:
+            with self.subTest(name=name):
+                cold = self.client.get(reverse(name))
+                with self.assertNumQueries(versions):
+                    warm = self.client.get(reverse(name))
+                self.assertEqual(warm.content, cold.content)
+
+    def test_saves_and_deletes_change_the_table(self):
+        url = reverse("orders:list")
+        self.assertContains(self.client.get(url), "Acme")
+
+        self.customer.name = "Acme Ltd"
+        self.customer.save()
+        self.assertContains(self.client.get(url), "Acme Ltd")
+
+        OrderItem.objects.create(order=self.orders[0], product=self.product, quantity=2, unit_price=Decimal("10.00"))
+        self.assertContains(self.client.get(url), "$20.00")
+
+        detail = reverse("orders:detail", args=[self.orders[1].pk])
+        self.orders[1].delete()
+        self.assertNotContains(self.client.get(url), f'href="{detail}"')
+
+        Product.objects.filter(pk=self.product.pk).update(name="Gizmo", updated_at=timezone.now())
+        self.assertContains(self.client.get(reverse("products:list")), "Gizmo")
+
+    def test_pages_are_cached_separately(self):
+        OrderListView.paginate_by = 2
+        self.addCleanup(setattr, OrderListView, "paginate_by", 25)
+        first = self.client.get(reverse("orders:list"))
+        cursor = first.context["page_obj"].next_cursor
+        second = self.client.get(reverse("orders:list"), {"cursor": cursor})
+        self.assertNotEqual(second.content, first.content)
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(reverse("orders:list"), {"cursor": cursor}).content, second.content)
+
+    @override_settings(LIST_FRAGMENT_CACHE_TIMEOUT=0)
+    def test_zero_timeout_renders_every_time(self):
+        self.client.get(reverse("orders:list"))
+        self.assertIn("page_obj", self.client.get(reverse("orders:list")).context)
 
 
 class OrdersApiTests(TestCase):
@@ -124,6 +307,927 @@ class OrdersApiTests(TestCase):
 
         order.refresh_from_db()
         self.assertEqual(order.items.count(), 1)
+        self.assertEqual(order.subtotal, Decimal("20.00"))
+        self.assertEqual(order.total_items, 2)
+
+    def test_bulk_add_items_merges_and_defaults_price(self):
+        order = Order.objects.create(customer=self.customer)
+        other = Product.objects.create(sku="SKU-2", name="Gadget", price=Decimal("2.50"))
+        OrderItem.objects.create(order=order, product=self.product, quantity=1, unit_price=Decimal("9.00"))
+
+        resp = self.api.post(
+            f"/api/orders/{order.pk}/items/bulk/",
+            [
+                {"product": self.product.id, "quantity": 2},
+                {"product": other.id, "quantity": 3},
+                {"product": other.id, "quantity": 1, "unit_price": "2.00"},
+            ],
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data["created"], 1)
+        self.assertEqual(resp.data["updated"], 1)
+
+        existing = order.items.get(product=self.product)
+        self.assertEqual((existing.quantity, existing.unit_price), (3, Decimal("9.00")))
+        added = order.items.get(product=other)
+        self.assertEqual((added.quantity, added.unit_price), (4, Decimal("2.00")))
+
+        order.refresh_from_db()
+        self.assertEqual(order.subtotal, Decimal("35.00"))
+        self.assertEqual(order.total_items, 7)
+        self.assertEqual(order.item_count, 2)
+
+    def test_bulk_add_items_defaults_missing_unit_price(self):
+        order = Order.objects.create(customer=self.customer)
+        resp = self.api.post(
+            f"/api/orders/{order.pk}/items/bulk/",
+            [{"product": self.product.id, "quantity": 2, "unit_price": None}],
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(order.items.get().unit_price, Decimal("10.00"))
+
+    def test_bulk_add_items_rejects_unknown_products_atomically(self):
+        order = Order.objects.create(customer=self.customer)
+        resp = self.api.post(
+            f"/api/orders/{order.pk}/items/bulk/",
+            [{"product": self.product.id, "quantity": 1}, {"product": 999999, "quantity": 1}],
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data[0], {})
+        self.assertIn("product", resp.data[1])
+        self.assertFalse(order.items.exists())
+
+    def test_bulk_add_items_validates_lines(self):
+        order = Order.objects.create(customer=self.customer)
+        resp = self.api.post(
+            f"/api/orders/{order.pk}/items/bulk/",
+            [{"product": self.product.id, "quantity": 0}],
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("quantity", resp.data[0])
+
+
+class OrderItemFormSetTests(TestCase):
+    """
+    The detail page's formset shares one product lookup across rows, so
+    GET and POST take the same number of queries for any number of items.
+    """
+
+    def setUp(self):
+        product_cache._cache().clear()
+        self.customer = Customer.objects.create(name="Acme")
+        self.products = [
+            Product.objects.create(sku=f"SKU-{i}", name=f"Product {i}", price=Decimal("1.00")) for i in range(16)
+        ]
+
+    def make_order(self, lines):
+        order = Order.objects.create(customer=self.customer)
+        for product in self.products[:lines]:
+            OrderItem.objects.create(order=order, product=product, quantity=1, unit_price=product.price)
+        return order
+
+    def post_data(self, order, extra=()):
+        """
+        The formset's current rows unchanged, plus `extra` new rows as
+        (product, quantity).
+        """
+        items = list(order.items.order_by("pk"))
+        data = {
+            "items-TOTAL_FORMS": str(len(items) + len(extra)),
+            "items-INITIAL_FORMS": str(len(items)),
+            "items-MIN_NUM_FORMS": "0",
+            "items-MAX_NUM_FORMS": "1000",
+        }
+        for i, item in enumerate(items):
+            data.update({
+                f"items-{i}-id": str(item.pk),
+                f"items-{i}-product": str(item.product_id),
+                f"items-{i}-quantity": str(item.quantity),
+                f"items-{i}-unit_price": str(item.unit_price),
+            })
+        for i, (product, quantity) in enumerate(extra, start=len(items)):
+            data.update({f"items-{i}-product": str(product.pk), f"items-{i}-quantity": str(quantity)})
+        return data
+
+    def count_queries(self, method, order, data=None):
+        product_cache._cache().clear()
+        url = reverse("orders:detail", kwargs={"pk": order.pk})
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(url) if method == "get" else self.client.post(url, data)
+        self.assertIn(resp.status_code, (200, 302))
+        return len(queries)
+
+    def test_get_queries_do_not_grow_with_items(self):
+        small, large = self.make_order(1), self.make_order(15)
+        # order + items + one product lookup
+        self.assertEqual(self.count_queries("get", small), 3)
+        self.assertEqual(self.count_queries("get", large), 3)
+
+    def test_post_validation_queries_do_not_grow_with_items(self):
+        small, large = self.make_order(1), self.make_order(15)
+        new = (self.products[15], 2)
+        self.assertEqual(
+            self.count_queries("post", small, self.post_data(small, [new])),
+            self.count_queries("post", large, self.post_data(large, [new])),
+        )
+        self.assertEqual(large.items.count(), 16)
+
+        # An invalid POST re-renders without a query per row.
+        data = self.post_data(large)
+        data["items-0-quantity"] = "-1"
+        self.assertEqual(self.count_queries("post", large, data), 3)
+
+    def test_save_is_one_bulk_write_per_kind(self):
+        counts = []
+        for lines in (3, 15):
+            order = self.make_order(lines)
+            data = self.post_data(order, [(self.products[15], 4)])
+            for i in range(1, lines):
+                data[f"items-{i}-quantity"] = "3"
+            data["items-0-DELETE"] = "on"
+            counts.append(self.count_queries("post", order, data))
+
+            order.refresh_from_db()
+            self.assertEqual(order.item_count, lines)
+            self.assertEqual(order.total_items, (lines - 1) * 3 + 4)
+            self.assertEqual(order.subtotal, Decimal((lines - 1) * 3 + 4))
+            self.assertFalse(order.items.filter(product=self.products[0]).exists())
+        self.assertEqual(counts[0], counts[1])
+
+    def test_save_touches_changed_rows_only(self):
+        order = self.make_order(3)
+        past = timezone.now() - timedelta(days=1)
+        order.items.update(updated_at=past)
+        data = self.post_data(order)
+        data["items-1-unit_price"] = "2.50"
+        # Same value in a different spelling: not a change.
+        data["items-2-unit_price"] = "1.0"
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(reverse("orders:detail", kwargs={"pk": order.pk}), data)
+        self.assertEqual(resp.status_code, 302)
+        updates = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "orders_orderitem"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"quantity"', updates[0])
+
+        items = list(order.items.order_by("pk"))
+        self.assertEqual([item.updated_at == past for item in items], [True, False, True])
+        self.assertEqual(items[1].unit_price, Decimal("2.50"))
+        order.refresh_from_db()
+        self.assertEqual(order.subtotal, Decimal("4.50"))
+
+    def test_duplicate_products_are_rejected(self):
+        order = self.make_order(2)
+        resp = self.client.post(
+            reverse("orders:detail", kwargs={"pk": order.pk}),
+            self.post_data(order, [(self.products[5], 1), (self.products[5], 2)]),
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("duplicate data for product", str(resp.context["formset"].non_form_errors()))
+
+        # A page loaded before another user added the product.
+        data = self.post_data(order, [(self.products[5], 1)])
+        OrderItem.objects.create(order=order, product=self.products[5], quantity=1, unit_price=Decimal("1.00"))
+        resp = self.client.post(reverse("orders:detail", kwargs={"pk": order.pk}), data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("already exists", str(resp.context["formset"].forms[2].non_field_errors()))
+        self.assertEqual(order.items.count(), 3)
+
+    def test_replacing_a_deleted_row_with_its_product(self):
+        order = self.make_order(2)
+        data = self.post_data(order, [(self.products[0], 5)])
+        data["items-0-DELETE"] = "on"
+        resp = self.client.post(reverse("orders:detail", kwargs={"pk": order.pk}), data)
+        self.assertEqual(resp.status_code, 302)
+        self.assertEqual(order.items.get(product=self.products[0]).quantity, 5)
+
+    def test_unknown_row_id_is_rejected(self):
+        order, other = self.make_order(1), self.make_order(1)
+        data = self.post_data(order)
+        data["items-0-id"] = str(other.items.get().pk)
+        resp = self.client.post(reverse("orders:detail", kwargs={"pk": order.pk}), data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("id", resp.context["formset"].forms[0].errors)
+
+
+class ApiQueryCountTests(TestCase):
+    """
+    Guard against N+1 regressions: query counts must not grow with rows.
+    Every count includes one ETag validator query (see config.conditional).
+    """
+
+    def setUp(self):
+        self.api = APIClient()
+        customer = Customer.objects.create(name="Acme")
+        products = [
+            Product.objects.create(sku=f"SKU-{i}", name=f"Product {i}", price=Decimal("1.00"))
+            for i in range(3)
+        ]
+        for _ in range(5):
+            order = Order.objects.create(customer=customer)
+            for product in products:
+                OrderItem.objects.create(order=order, product=product, quantity=1, unit_price=product.price)
+        self.order = order
+
+    def test_order_list(self):
+        # validator + orders + prefetched items
+        with self.assertNumQueries(3):
+            resp = self.api.get("/api/orders/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data["results"]), 5)
+        self.assertEqual(len(resp.data["results"][0]["items"]), 3)
+
+    def test_order_retrieve(self):
+        with self.assertNumQueries(3):
+            resp = self.api.get(f"/api/orders/{self.order.pk}/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data["items"]), 3)
+
+    def test_order_item_list_and_retrieve(self):
+        with self.assertNumQueries(2):
+            resp = self.api.get("/api/order-items/")
+        self.assertEqual(len(resp.data["results"]), 15)
+
+        item = OrderItem.objects.first()
+        with self.assertNumQueries(2):
+            self.api.get(f"/api/order-items/{item.pk}/")
+
+    def test_customer_and_product_lists(self):
+        with self.assertNumQueries(2):
+            self.api.get("/api/customers/")
+        with self.assertNumQueries(2):
+            self.api.get("/api/products/")
+
+    def test_not_modified_skips_loading_rows(self):
+        etag = self.api.get("/api/orders/")["ETag"]
+        with self.assertNumQueries(1):
+            resp = self.api.get("/api/orders/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        etag = self.api.get(f"/api/orders/{self.order.pk}/")["ETag"]
+        with self.assertNumQueries(1):
+            resp = self.api.get(f"/api/orders/{self.order.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.customer = Customer.objects.create(name="Acme", email="acme@example.com")
+        self.widget = Product.objects.create(sku="W-1", name="Widget", price=Decimal("2.50"))
+        self.order = Order.objects.create(customer=self.customer)
+        OrderItem.objects.create(order=self.order, product=self.widget, quantity=2, unit_price=Decimal("2.50"))
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.api.get(url, params)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return resp.json(), [query["sql"] for query in ctx.captured_queries]
+
+    def test_fields_restrict_output_and_columns(self):
+        data, queries = self.get("/api/orders/", fields="id,status")
+        self.assertEqual(data["results"], [{"id": self.order.pk, "status": "DRAFT"}])
+        # validator + orders; no items prefetch
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("subtotal", queries[1])
+
+    def test_nested_fields(self):
+        data, queries = self.get(f"/api/orders/{self.order.pk}/", fields="id,items.quantity")
+        self.assertEqual(data, {"id": self.order.pk, "items": [{"quantity": 2}]})
+        self.assertNotIn("unit_price", queries[-1])
+
+    def test_expand(self):
+        data, queries = self.get(f"/api/orders/{self.order.pk}/", expand="customer,items.product")
+        self.assertEqual(data["customer"]["name"], "Acme")
+        self.assertEqual(data["items"][0]["product"]["sku"], "W-1")
+        self.assertEqual(data["subtotal"], "5.00")
+        # validator + order joined to customer + items joined to products
+        self.assertEqual(len(queries), 3)
+
+    def test_expand_with_nested_fields(self):
+        data, _ = self.get("/api/order-items/", fields="id,product.name", expand="product")
+        self.assertEqual(data["results"], [{"id": self.order.items.get().pk, "product": {"name": "Widget"}}])
+
+    def test_default_output_unchanged(self):
+        data, _ = self.get(f"/api/orders/{self.order.pk}/")
+        self.assertEqual(data["customer"], self.customer.pk)
+        self.assertEqual(data["items"][0]["product"], self.widget.pk)
+
+    def test_unknown_names_are_rejected(self):
+        resp = self.api.get("/api/orders/", {"fields": "id,nope"})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json(), {"fields": ["Unknown field: nope."]})
+        resp = self.api.get("/api/orders/", {"expand": "status"})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_fields_vary_etag(self):
+        full = self.api.get(f"/api/orders/{self.order.pk}/")
+        sparse = self.api.get(f"/api/orders/{self.order.pk}/", {"fields": "id"})
+        self.assertNotEqual(full["ETag"], sparse["ETag"])
+
+    def test_writes_ignore_fields(self):
+        self.api.force_authenticate(get_user_model().objects.create_superuser("admin", "admin@example.com", "pw"))
+        resp = self.api.patch(f"/api/customers/{self.customer.pk}/?fields=id", {"phone": "555"}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["phone"], "555")
+        self.assertEqual(resp.json()["name"], "Acme")
+
+
+class FastListTests(TestCase):
+    """
+    The values_list() list path (config.encoders) must render byte-for-byte
+    what the serializers do.
+    """
+
+    def setUp(self):
+        self.api = APIClient()
+        acme = Customer.objects.create(name="Acme", email="acme@example.com", phone="555")
+        Customer.objects.create(name="Émile ☃", email=None, notes="line\nbreak")
+        products = [
+            Product.objects.create(sku="A-1", name="Widget", price=Decimal("2.50")),
+            Product.objects.create(sku="B-1", name="Gadget", price=Decimal("1000.10"), is_active=False),
+            Product.objects.create(sku="C-1", name="Gizmo", price=Decimal("10.00")),
+        ]
+        for n in range(4):
+            order = Order.objects.create(customer=acme, status=Order.Status.PLACED if n % 2 else Order.Status.DRAFT)
+            for product in products[: n % 3]:
+                OrderItem.objects.create(order=order, product=product, quantity=n + 1, unit_price=Decimal("0.99"))
+        # Whole-second timestamps render without a fraction.
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.make_aware(datetime(2026, 1, 2, 12)))
+
+    def assertSameAsSerializer(self, url):
+        with self.settings(API_FAST_LIST=False):
+            slow = self.api.get(url)
+        with self.settings(API_FAST_LIST=True):
+            fast = self.api.get(url)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content, url)
+        return fast
+
+    def test_byte_identical(self):
+        for url in (
+            "/api/customers/",
+            "/api/products/",
+            "/api/orders/",
+            "/api/order-items/",
+            "/api/orders/?fields=id,subtotal,items.unit_price",
+            "/api/orders/?expand=customer",
+            "/api/order-items/?page_size=2",
+        ):
+            with self.subTest(url=url):
+                resp = self.assertSameAsSerializer(url)
+        # Follow the cursor: later pages match too.
+        self.assertSameAsSerializer(resp.json()["next"])
+
+    def test_query_counts(self):
+        # validator + orders + items, same as the prefetching path
+        with self.assertNumQueries(3):
+            self.api.get("/api/orders/")
+        with self.assertNumQueries(2):
+            self.api.get("/api/orders/?fields=id,status")
+
+
+class FastJSONTests(TestCase):
+    """
+    config.renderers / config.parsers must match DRF's JSON classes byte
+    for byte, with or without orjson installed.
+    """
+
+    PAYLOADS = [
+        {"price": Decimal("2.50"), "unit_price": Decimal("1000.10"), "zero": Decimal("0.00"), "neg": Decimal("-0.5")},
+        {"at": datetime(2026, 1, 2, 3, 4, 5, 678900, tzinfo=dt_timezone.utc), "day": date(2026, 1, 2)},
+        {"naive": datetime(2026, 1, 2, 3, 4, 5), "whole": datetime(2026, 1, 2, tzinfo=dt_timezone.utc)},
+        {"offset": datetime(2026, 1, 2, tzinfo=dt_timezone(timedelta(hours=-5))), "span": timedelta(hours=1)},
+        {"text": "line\nbreak \u2028 \u2029 \x00 \x1f \x7f é ☃ 😀 </script> \"q\" \\"},
+        {"uuid": uuid.UUID(int=1), "lazy": gettext_lazy("Orders"), "none": None, "flag": True},
+        {"floats": [0.1, -0.0, 1e16, 1e-4, 1e-05, 1.5e-9, 123.456], "ints": [0, -1, 2**63, 2**64, -(2**70)]},
+        {1: "int key", "nested": [{"a": [1, {"b": Decimal("3.14")}]}], "empty": [{}, []]},
+        ["top", "level", 1],
+        "just a string",
+    ]
+
+    def test_renderer_matches_drf(self):
+        for data in self.PAYLOADS:
+            for media_type in (None, "application/json", "application/json; indent=2"):
+                with self.subTest(data=data, media_type=media_type):
+                    self.assertEqual(
+                        FastJSONRenderer().render(data, media_type), JSONRenderer().render(data, media_type)
+                    )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_parser_matches_drf(self):
+        bodies = [
+            JSONRenderer().render(data) for data in self.PAYLOADS
+        ] + [b"-0", b"1e400", b"123456789012345678901234", b"NaN", b"", b"[1,]", b"\xef\xbb\xbf{}", b'"\\ud800"']
+        for body in bodies:
+            with self.subTest(body=body):
+                self.assertEqual(self.parse(FastJSONParser(), body), self.parse(JSONParser(), body))
+
+    def parse(self, parser, body):
+        try:
+            return parser.parse(io.BytesIO(body), parser_context={})
+        except ParseError as exc:
+            return str(exc)
+
+    def test_api_output_unchanged(self):
+        customer = Customer.objects.create(name="Émile \u2028", email="e@example.com")
+        widget = Product.objects.create(sku="W-1", name="Widget", price=Decimal("1234.50"))
+        order = Order.objects.create(customer=customer)
+        OrderItem.objects.create(order=order, product=widget, quantity=3, unit_price=Decimal("0.99"))
+        api = APIClient()
+        for url in ("/api/orders/", f"/api/orders/{order.pk}/", "/api/order-items/", "/api/customers/"):
+            with self.subTest(url=url):
+                fast = api.get(url).content
+                with mock.patch("config.renderers.orjson", None):
+                    self.assertEqual(fast, api.get(url).content)
+
+    def test_without_orjson(self):
+        with mock.patch("config.renderers.orjson", None), mock.patch("config.parsers.orjson", None):
+            self.test_renderer_matches_drf()
+            self.test_parser_matches_drf()
+
+
+class AsyncReadApiTests(TestCase):
+    def setUp(self):
+        customer = Customer.objects.create(name="Acme", email="acme@example.com")
+        widget = Product.objects.create(sku="W-1", name="Widget", price=Decimal("2.50"))
+        for n in range(3):
+            order = Order.objects.create(customer=customer)
+            OrderItem.objects.create(order=order, product=widget, quantity=n + 1, unit_price=Decimal("2.50"))
+        self.order = order
+
+    async def test_objects_match_drf_api(self):
+        for resource in ("customers", "products", "orders"):
+            with self.subTest(resource=resource):
+                drf = (await self.async_client.get(f"/api/{resource}/")).json()
+                resp = await self.async_client.get(f"/api/async/{resource}/")
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(resp.json()["results"], drf["results"])
+
+        drf = await self.async_client.get(f"/api/orders/{self.order.pk}/")
+        resp = await self.async_client.get(f"/api/async/orders/{self.order.pk}/")
+        self.assertEqual(resp.content, drf.content)
+
+    async def test_pagination_and_fields(self):
+        first = (await self.async_client.get("/api/async/orders/", {"page_size": 2, "fields": "id"})).json()
+        self.assertEqual(first["results"], [{"id": self.order.pk}, {"id": self.order.pk - 1}])
+        self.assertIsNone(first["previous"])
+        second = (await self.async_client.get(first["next"])).json()
+        self.assertEqual(second["results"], [{"id": self.order.pk - 2}])
+        self.assertIsNone(second["next"])
+        back = (await self.async_client.get(second["previous"])).json()
+        self.assertEqual(back["results"], first["results"])
+
+    async def test_detail_applies_filters_like_drf(self):
+        product = await Product.objects.aget(sku="W-1")
+        cases = [
+            ({"is_active": "false"}, 404),
+            ({"is_active": "true"}, 200),
+            ({"sku_prefix": "X"}, 404),
+            ({"updated_since": "not-a-date"}, 400),
+        ]
+        for params, status in cases:
+            with self.subTest(params=params):
+                drf = await self.async_client.get(f"/api/products/{product.pk}/", params)
+                resp = await self.async_client.get(f"/api/async/products/{product.pk}/", params)
+                self.assertEqual((resp.status_code, drf.status_code), (status, status))
+
+    async def test_conditional_get_and_errors(self):
+        resp = await self.async_client.get("/api/async/customers/")
+        self.assertFalse(resp.has_header("Last-Modified"))
+        resp = await self.async_client.get("/api/async/customers/", headers={"if-none-match": resp["ETag"]})
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual((await self.async_client.get("/api/async/orders/999/")).status_code, 404)
+        self.assertEqual((await self.async_client.get("/api/async/orders/", {"fields": "nope"})).status_code, 400)
+        self.assertEqual((await self.async_client.get("/api/async/orders/", {"expand": "customer"})).status_code, 400)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.customer = Customer.objects.create(name="Acme")
+        self.product = Product.objects.create(sku="SKU-1", name="Widget", price=Decimal("10.00"))
+        self.order = Order.objects.create(customer=self.customer)
+
+    def test_collection_etag_changes_on_save_and_delete(self):
+        etag = self.api.get("/api/orders/")["ETag"]
+        self.assertEqual(self.api.get("/api/orders/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        other = Order.objects.create(customer=self.customer)
+        resp = self.api.get("/api/orders/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp["ETag"]
+
+        other.delete()
+        self.assertEqual(self.api.get("/api/orders/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_collection_ignores_if_modified_since_after_delete(self):
+        other = Order.objects.create(customer=self.customer)
+        resp = self.api.get("/api/orders/")
+        self.assertFalse(resp.has_header("Last-Modified"))
+        last_modified = http_date(other.updated_at.timestamp())
+
+        other.delete()
+        resp = self.api.get("/api/orders/", HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data["results"]), 1)
+
+    def test_order_etag_changes_when_items_change(self):
+        url = f"/api/orders/{self.order.pk}/"
+        etag = self.api.get(url)["ETag"]
+        self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        OrderItem.objects.create(order=self.order, product=self.product, quantity=1, unit_price=Decimal("10.00"))
+        resp = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data["items"]), 1)
+
+    def test_expanded_rows_change_the_etag(self):
+        OrderItem.objects.create(order=self.order, product=self.product, quantity=1, unit_price=Decimal("10.00"))
+        expand = "?expand=customer,items.product"
+        for url in (f"/api/orders/{self.order.pk}/{expand}", f"/api/orders/{expand}"):
+            with self.subTest(url=url):
+                etag = self.api.get(url)["ETag"]
+                self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+                self.customer.name = f"Renamed {etag}"
+                self.customer.save()
+                resp = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(resp.status_code, 200)
+                etag = resp["ETag"]
+
+                self.product.price += 1
+                self.product.save()
+                resp = self.api.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(self.api.get(url, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code, 304)
+
+        # Unexpanded, related changes leave the tag alone.
+        etag = self.api.get("/api/orders/")["ETag"]
+        self.customer.save()
+        self.assertEqual(self.api.get("/api/orders/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_pages_have_distinct_etags(self):
+        Order.objects.create(customer=self.customer)
+        first = self.api.get("/api/orders/?page_size=1")
+        second = self.api.get(first.data["next"])
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_missing_object_is_404(self):
+        self.assertEqual(self.api.get("/api/orders/999999/").status_code, 404)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        customer = Customer.objects.create(name="Acme")
+        self.orders = [Order.objects.create(customer=customer) for _ in range(7)]
+
+    def test_api_walks_pages_without_offset(self):
+        seen = []
+        url = "/api/orders/?page_size=3"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.api.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertFalse(any("OFFSET" in q["sql"] for q in ctx.captured_queries))
+            seen.extend(row["id"] for row in resp.data["results"])
+            url = resp.data["next"]
+
+        self.assertEqual(seen, sorted((o.pk for o in self.orders), reverse=True))
+
+    def test_api_page_size_is_capped(self):
+        with mock.patch.object(KeysetPagination, "max_page_size", 5):
+            resp = self.api.get("/api/orders/?page_size=100000")
+        self.assertEqual(len(resp.data["results"]), 5)
+
+    def test_web_list_pages_by_cursor(self):
+        resp = self.client.get(reverse("orders:list"))
+        self.assertEqual(len(resp.context["orders"]), 7)
+        self.assertFalse(resp.context["is_paginated"])
+
+        OrderListView.paginate_by = 3
+        self.addCleanup(setattr, OrderListView, "paginate_by", 25)
+
+        resp = self.client.get(reverse("orders:list"))
+        first = [o.pk for o in resp.context["orders"]]
+        next_cursor = resp.context["page_obj"].next_cursor
+        self.assertIsNone(resp.context["page_obj"].previous_cursor)
+
+        resp = self.client.get(reverse("orders:list"), {"cursor": next_cursor})
+        second = [o.pk for o in resp.context["orders"]]
+        self.assertEqual(first + second, [o.pk for o in reversed(self.orders)][:6])
+
+        resp = self.client.get(reverse("orders:list"), {"cursor": resp.context["page_obj"].previous_cursor})
+        self.assertEqual([o.pk for o in resp.context["orders"]], first)
+
+    def test_web_list_rejects_bad_cursor(self):
+        resp = self.client.get(reverse("orders:list"), {"cursor": "!!"})
+        self.assertEqual(resp.status_code, 404)
+
+
+class ApiFilterTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.acme = Customer.objects.create(name="Acme")
+        other = Customer.objects.create(name="Other")
+        widget = Product.objects.create(sku="W-1", name="Widget", price=Decimal("1.00"))
+        self.placed = Order.objects.create(customer=self.acme, status=Order.Status.PLACED)
+        self.shipped = Order.objects.create(customer=self.acme, status=Order.Status.SHIPPED)
+        self.draft = Order.objects.create(customer=other)
+        Order.objects.filter(pk=self.placed.pk).update(order_date=date(2026, 1, 10))
+        Order.objects.filter(pk=self.shipped.pk).update(order_date=date(2026, 2, 10))
+        Order.objects.filter(pk=self.draft.pk).update(updated_at=timezone.now() - timedelta(days=30))
+        self.item = OrderItem.objects.create(order=self.placed, product=widget, unit_price=Decimal("1.00"))
+
+    def ids(self, url, params):
+        resp = self.api.get(url, params)
+        self.assertEqual(resp.status_code, 200, resp.content)
+        return [row["id"] for row in resp.json()["results"]]
+
+    def test_order_filters(self):
+        cases = [
+            ({"status": "PLACED"}, [self.placed]),
+            ({"status": ["PLACED", "DRAFT"]}, [self.draft, self.placed]),
+            ({"customer": self.acme.pk}, [self.shipped, self.placed]),
+            ({"customer": self.acme.pk, "status": "SHIPPED"}, [self.shipped]),
+            ({"date_from": "2026-01-01", "date_to": "2026-01-31"}, [self.placed]),
+            ({"updated_since": (timezone.now() - timedelta(days=1)).isoformat()}, [self.shipped, self.placed]),
+            ({"updated_before": (timezone.now() - timedelta(days=1)).isoformat()}, [self.draft]),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                self.assertEqual(self.ids("/api/orders/", params), [o.pk for o in expected])
+
+    def test_item_filters(self):
+        self.assertEqual(self.ids("/api/order-items/", {"order": self.placed.pk}), [self.item.pk])
+        self.assertEqual(self.ids("/api/order-items/", {"order": self.shipped.pk}), [])
+        self.assertEqual(self.ids("/api/order-items/", {"product": self.item.product_id}), [self.item.pk])
+
+    def test_invalid_values_are_rejected(self):
+        for params in ({"status": "LOST"}, {"customer": "acme"}, {"date_from": "January"}, {"updated_since": "x"}):
+            with self.subTest(params=params):
+                resp = self.api.get("/api/orders/", params)
+                self.assertEqual(resp.status_code, 400)
+                self.assertIn(next(iter(params)), resp.json())
+
+    def test_filters_apply_to_validators_and_async_list(self):
+        etag = self.api.get("/api/orders/", {"status": "PLACED"})["ETag"]
+        self.assertNotEqual(self.api.get("/api/orders/", {"status": "DRAFT"})["ETag"], etag)
+        self.assertEqual(self.ids("/api/async/orders/", {"status": "PLACED"}), [self.placed.pk])
+        self.assertEqual(self.api.get("/api/async/orders/", {"status": "LOST"}).status_code, 400)
+
+
+class OrderExportTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        customer = Customer.objects.create(name="Acme", email="acme@example.com")
+        product = Product.objects.create(sku="SKU-1", name="Widget", price=Decimal("10.00"))
+        self.placed = Order.objects.create(customer=customer, status=Order.Status.PLACED)
+        OrderItem.objects.create(order=self.placed, product=product, quantity=3, unit_price=Decimal("10.00"))
+        self.draft = Order.objects.create(customer=customer)
+        Order.objects.filter(pk=self.draft.pk).update(order_date=date(2020, 1, 1))
+
+    def read(self, resp):
+        self.assertIsInstance(resp, StreamingHttpResponse)
+        return b"".join(resp.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        resp = self.api.get("/api/orders/export/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+
+        records = [json.loads(line) for line in self.read(resp).splitlines()]
+        self.assertEqual([r["id"] for r in records], [self.placed.pk, self.draft.pk])
+        self.assertEqual(records[0]["customer"]["email"], "acme@example.com")
+        self.assertEqual(records[0]["items"][0]["sku"], "SKU-1")
+        self.assertEqual(records[0]["items"][0]["line_total"], "30.00")
+        self.assertEqual(records[1]["items"], [])
+
+    def test_csv_export_with_filters(self):
+        resp = self.api.get("/api/orders/export/", {"format": "csv", "status": "PLACED"})
+        self.assertEqual(resp["Content-Type"], "text/csv")
+
+        rows = list(csv.reader(StringIO(self.read(resp))))
+        self.assertEqual(rows[0][0], "order_id")
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][0], str(self.placed.pk))
+        self.assertEqual(rows[1][-1], "30.00")
+
+    def test_date_range_filter(self):
+        resp = self.api.get("/api/orders/export/", {"date_to": "2020-12-31"})
+        records = [json.loads(line) for line in self.read(resp).splitlines()]
+        self.assertEqual([r["id"] for r in records], [self.draft.pk])
+
+    def test_invalid_filter_is_rejected(self):
+        resp = self.api.get("/api/orders/export/", {"status": "BOGUS"})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_export_command_streams_in_chunks(self):
+        out = StringIO()
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("export_orders", "--chunk-size", "1", stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+        # orders + items per chunk, plus the final empty orders batch
+        self.assertEqual(len(ctx.captured_queries), 5)
+
+
+class CompressionTests(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        customer = Customer.objects.create(name="Acme", email="acme@example.com")
+        product = Product.objects.create(sku="SKU-1", name="Widget", price=Decimal("10.00"))
+        for _ in range(20):
+            order = Order.objects.create(customer=customer)
+            OrderItem.objects.create(order=order, product=product, quantity=2, unit_price=Decimal("10.00"))
+
+    def test_large_responses_are_gzipped_with_weak_etag(self):
+        plain = self.api.get("/api/orders/")
+        resp = self.api.get("/api/orders/", HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(resp["Vary"], "Accept, Cookie, Accept-Encoding")
+        self.assertEqual(int(resp["Content-Length"]), len(resp.content))
+        self.assertEqual(gzip.decompress(resp.content), plain.content)
+        self.assertEqual(resp["ETag"], "W/" + plain["ETag"])
+
+        # Either form of the tag revalidates; the 304 carries the weak one.
+        for etag in (resp["ETag"], plain["ETag"]):
+            revalidated = self.api.get("/api/orders/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(revalidated.status_code, 304)
+            self.assertEqual(revalidated["ETag"], resp["ETag"])
+            self.assertIn("Accept-Encoding", revalidated["Vary"])
+        self.assertEqual(self.api.get("/api/orders/", HTTP_IF_NONE_MATCH=plain["ETag"])["ETag"], plain["ETag"])
+
+    def test_negotiation_and_threshold(self):
+        for accept, compressed in [
+            ("gzip;q=0.5, br", True),
+            ("*", True),
+            ("GZIP", True),
+            ("gzip;q=0, *", False),
+            ("identity", False),
+            ("*;q=0", False),
+            ("", False),
+        ]:
+            with self.subTest(accept=accept):
+                resp = self.api.get("/api/orders/", HTTP_ACCEPT_ENCODING=accept)
+                self.assertEqual(resp.has_header("Content-Encoding"), compressed)
+                self.assertIn("Accept-Encoding", resp["Vary"])
+
+        small = self.api.get("/api/orders/?page_size=1&fields=id", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(small.has_header("Content-Encoding"))
+        self.assertNotIn("Accept-Encoding", small["Vary"])
+        with override_settings(GZIP_LEVEL=0):
+            self.assertFalse(self.api.get("/api/orders/", HTTP_ACCEPT_ENCODING="gzip").has_header("Content-Encoding"))
+
+    def test_export_compresses_while_streaming(self):
+        plain = b"".join(self.api.get("/api/orders/export/").streaming_content)
+        resp = self.api.get("/api/orders/export/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertIsInstance(resp, StreamingHttpResponse)
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertFalse(resp.has_header("Content-Length"))
+        self.assertEqual(gzip.decompress(b"".join(resp.streaming_content)), plain)
+
+    async def test_async_stream_is_one_gzip_member(self):
+        async def lines():
+            for n in range(100):
+                yield f'{{"id": {n}}}\n'.encode()
+
+        async def view(request):
+            return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        resp = await GZipMiddleware(view)(request)
+        body = b"".join([chunk async for chunk in resp])
+        stream = zlib.decompressobj(wbits=31)
+        self.assertEqual(stream.decompress(body), b"".join([line async for line in lines()]))
+        self.assertTrue(stream.eof)
+        self.assertEqual(stream.unused_data, b"")
+
+    async def test_async_api_is_compressed(self):
+        plain = await self.async_client.get("/api/async/orders/")
+        resp = await self.async_client.get("/api/async/orders/", headers={"accept-encoding": "gzip"})
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertEqual(resp["ETag"], "W/" + plain["ETag"])
+        self.assertEqual(gzip.decompress(resp.content), plain.content)
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        route_stats.reset()
+        self.api = APIClient()
+        customer = Customer.objects.create(name="Acme")
+        product = Product.objects.create(sku="SKU-1", name="Widget", price=Decimal("10.00"))
+        self.order = Order.objects.create(customer=customer)
+        OrderItem.objects.create(order=self.order, product=product, quantity=1, unit_price=Decimal("10.00"))
+
+    def timings(self, response):
+        metrics = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, *params = metric.split(";")
+            metrics[name] = dict(param.split("=", 1) for param in params)
+        return metrics
+
+    def test_header_reports_queries_and_phases(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.api.get("/api/orders/")
+        metrics = self.timings(response)
+        self.assertEqual(set(metrics), {"db", "view", "render", "total"})
+        self.assertEqual(metrics["db"]["desc"], f'"{len(ctx)} queries"')
+        self.assertGreaterEqual(float(metrics["total"]["dur"]), float(metrics["view"]["dur"]))
+
+    def test_template_pages_are_timed(self):
+        response = self.client.get(reverse("orders:detail", kwargs={"pk": self.order.pk}))
+        self.assertGreater(float(self.timings(response)["render"]["dur"]), 0)
+
+    def test_route_aggregates_are_staff_only(self):
+        self.api.get("/api/orders/")
+        self.api.get("/api/orders/")
+        self.api.get(f"/api/orders/{self.order.pk}/")
+
+        self.assertEqual(self.api.get(reverse("perf-routes")).status_code, 403)
+        user = get_user_model().objects.create_user("clerk", password="x")
+        self.api.force_authenticate(user)
+        self.assertEqual(self.api.get(reverse("perf-routes")).status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        stats = self.api.get(reverse("perf-routes")).json()
+        self.assertEqual(stats["GET order-list"]["count"], 2)
+        self.assertEqual(stats["GET order-detail"]["count"], 1)
+        self.assertEqual(
+            set(stats["GET order-list"]), {"count", "p50_ms", "p95_ms", "max_ms", "avg_db_ms", "avg_queries"}
+        )
+
+        self.assertEqual(self.api.delete(reverse("perf-routes")).status_code, 204)
+        self.assertNotIn("GET order-list", self.api.get(reverse("perf-routes")).json())
+
+    def test_unknown_methods_share_a_route(self):
+        self.api.generic("PURGE", "/api/orders/")
+        self.api.generic("X-CUSTOM", "/api/orders/")
+        self.api.get("/api/orders/")
+        self.assertEqual(set(route_stats.snapshot()), {"GET order-list", "OTHER order-list"})
+        self.assertEqual(route_stats.snapshot()["OTHER order-list"]["count"], 2)
+
+    @override_settings(PERF_TIMING_ENABLED=False)
+    def test_can_be_disabled(self):
+        self.assertNotIn("Server-Timing", self.api.get("/api/orders/"))
+
+
+class SeedPerfCommandTests(TestCase):
+    def seed(self, **options):
+        call_command(
+            "seed_perf", customers=20, products=30, orders=200, days=30, batch_size=64, stdout=StringIO(), **options
+        )
+
+    def snapshot(self):
+        return (
+            list(
+                Order.objects.order_by("id").values_list(
+                    "customer__email", "status", "order_date", "subtotal", "total_items"
+                )
+            ),
+            list(OrderItem.objects.order_by("id").values_list("product__sku", "quantity", "unit_price")),
+        )
+
+    def test_creates_consistent_data(self):
+        self.seed()
+        self.assertEqual((Customer.objects.count(), Product.objects.count(), Order.objects.count()), (20, 30, 200))
+        self.assertTrue(OrderItem.objects.exists())
+
+        out = StringIO()
+        call_command("recompute_order_totals", dry_run=True, stdout=out)
+        self.assertIn("Would repair 0.", out.getvalue())
+
+        dates = list(Order.objects.order_by("id").values_list("order_date", flat=True))
+        self.assertEqual(dates, sorted(dates))
+        self.assertLessEqual((dates[-1] - dates[0]).days, 29)
+
+    def test_same_seed_same_data(self):
+        self.seed()
+        first = self.snapshot()
+        Order.objects.all().delete()
+        Product.objects.all().delete()
+        Customer.objects.all().delete()
+        self.seed()
+        self.assertEqual(self.snapshot(), first)
+
+    def test_seeds_on_top_of_existing_rows(self):
+        self.seed()
+        self.seed(seed=7)
+        self.assertEqual((Customer.objects.count(), Product.objects.count(), Order.objects.count()), (40, 60, 400))
+
+    def test_seeds_after_deleting_rows(self):
+        self.seed()
+        Order.objects.all().delete()
+        Customer.objects.order_by("id").first().delete()
+        Product.objects.order_by("id").first().delete()
+        self.seed()
+        self.assertEqual((Customer.objects.count(), Product.objects.count(), Order.objects.count()), (39, 59, 200))
 
 
 class DeleteBehaviorTests(TestCase):
@@ -149,3 +1253,80 @@ class DeleteBehaviorTests(TestCase):
     def test_delete_customer_is_protected(self):
         with self.assertRaises(ProtectedError):
             self.customer.delete()
+
+
+class OrderQueryPlanTests(QueryPlanAssertions, TestCase):
+    """
+    The order access patterns stay index-backed as the schema changes.
+    """
+
+    def test_orders_by_customer_status_and_date(self):
+        self.assertIndexed(
+            Order.objects.filter(customer_id=1, status="PLACED", order_date__gte=date(2026, 1, 1)),
+            index="order_customer_status_date",
+        )
+        self.assertIndexed(
+            Order.objects.filter(customer_id=1, status__in=["PLACED", "SHIPPED"]),
+            index="order_customer_status_date",
+        )
+
+    def test_orders_by_status_and_date(self):
+        self.assertIndexed(
+            Order.objects.filter(status="PLACED", order_date__range=(date(2026, 1, 1), date(2026, 1, 31))),
+            index="order_status_date",
+        )
+
+    def test_customer_orders_newest_first(self):
+        self.assertIndexed(Order.objects.filter(customer_id=1).order_by("-id")[:50])
+
+    def test_order_list_pages(self):
+        self.assertIndexed(Order.objects.order_by("-id")[:51], ordered_scan=True)
+        self.assertIndexed(Order.objects.filter(id__lt=1000).order_by("-id")[:51])
+
+    def test_items_by_order_and_product(self):
+        self.assertIndexed(OrderItem.objects.filter(order_id__in=[1, 2, 3]))
+        # The PROTECT check run when deleting a product.
+        self.assertIndexed(OrderItem.objects.filter(product_id__in=[1]))
+        # Which orders contain a product, without touching the table.
+        self.assertIndexed(
+            OrderItem.objects.filter(product_id=1).values("order_id"), index="orderitem_product_order"
+        )
+
+    def test_api_order_filters(self):
+        self.assertIndexed(self.api_page(OrderViewSet, "status=PLACED"), index="order_status")
+        self.assertIndexed(self.api_page(OrderViewSet, "customer=1"))
+        self.assertIndexed(self.api_page(OrderViewSet, "customer=1&status=PLACED"))
+        self.assertIndexed(self.api_page(OrderViewSet, "customer=1&date_from=2026-01-01"))
+        self.assertIndexed(self.api_page(OrderViewSet, "status=PLACED&updated_since=2026-01-01T00:00:00Z"))
+        # Ranges and IN lists read only the matching rows, then sort them
+        # into id order.
+        for query, index in [
+            ("status=PLACED&status=SHIPPED", "order_status"),
+            ("date_from=2026-01-01&date_to=2026-01-31", "orders_order_order_date_0416df95"),
+            ("status=PLACED&date_from=2026-01-01", "order_status_date"),
+            ("updated_since=2026-01-01T00:00:00Z", "order_updated_at"),
+            ("updated_since=2026-01-01T00:00:00Z&updated_before=2026-02-01T00:00:00Z", "order_updated_at"),
+        ]:
+            with self.subTest(query=query):
+                self.assertIndexed(self.api_page(OrderViewSet, query), index=index, sort_matches=True)
+
+    def test_api_item_filters(self):
+        self.assertIndexed(self.api_page(OrderItemViewSet, "order=1"))
+        self.assertIndexed(self.api_page(OrderItemViewSet, "product=1"))
+        self.assertIndexed(
+            self.api_page(OrderItemViewSet, "updated_since=2026-01-01T00:00:00Z"),
+            index="orderitem_updated_at",
+            sort_matches=True,
+        )
+
+    def test_sort_matches_needs_an_index_search(self):
+        with self.assertRaisesMessage(AssertionError, "USE TEMP B-TREE"):
+            self.assertIndexed(Order.objects.filter(customer_id=1).order_by("subtotal"), sort_matches=False)
+        with self.assertRaisesMessage(AssertionError, "SCAN orders_order"):
+            self.assertIndexed(Order.objects.order_by("subtotal"), sort_matches=True)
+
+    def test_unindexed_query_fails(self):
+        with self.assertRaisesMessage(AssertionError, "SCAN orders_order"):
+            self.assertIndexed(Order.objects.filter(subtotal__gt=100))
+        with self.assertRaisesMessage(AssertionError, "order_status_date not used"):
+            self.assertIndexed(Order.objects.filter(customer_id=1), index="order_status_date")
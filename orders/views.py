@@ -1,12 +1,88 @@
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
-from rest_framework import viewsets
+from changes.feed import ChangeFeedMixin
+from config.conditional import ConditionalGetMixin
+from config.encoders import FastListMixin
+from config.fieldsets import SparseFieldsetViewMixin
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .exports import EXPORTERS, filter_orders
+from .filters import OrderFilterSet, OrderItemFilterSet
+from .forms import OrderExportFilterForm
 from .models import Order, OrderItem
-from .serializers import OrderSerializer, OrderItemSerializer
+from .renderers import CSVRenderer, NDJSONRenderer
+from .serializers import BulkOrderItemLineSerializer, OrderSerializer, OrderItemSerializer
+from .services import UnknownProducts, bulk_add_items
 
-class OrderViewSet(viewsets.ModelViewSet):
-    queryset = Order.objects.all().order_by("-id")
+class OrderViewSet(ChangeFeedMixin, SparseFieldsetViewMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
+    # Items are nested unless `?fields=` leaves them out; the fieldset
+    # mixin prefetches them in one query (not one per order) only then.
+    # FKs render as ids unless expanded, so no joins by default.
+    queryset = Order.objects.order_by("-id")
     serializer_class = OrderSerializer
+    filterset_class = OrderFilterSet
 
-class OrderItemViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "bulk_items":
+            # Only the order row is needed; lock it while items are merged.
+            return queryset.prefetch_related(None).select_for_update()
+        return queryset
+
+    @action(detail=True, methods=["post"], url_path="items/bulk")
+    def bulk_items(self, request, pk=None):
+        """
+        Add many line items in one request and one transaction.
+        """
+        lines = BulkOrderItemLineSerializer(data=request.data, many=True)
+        lines.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            order = self.get_object()
+            try:
+                created, updated = bulk_add_items(order, lines.validated_data)
+            except UnknownProducts as exc:
+                errors = [
+                    {"product": [f'Invalid pk "{line["product"]}" - object does not exist.']}
+                    if line["product"] in exc.product_ids
+                    else {}
+                    for line in lines.validated_data
+                ]
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "created": created,
+                "updated": updated,
+                "subtotal": str(order.subtotal),
+                "total_items": order.total_items,
+                "item_count": order.item_count,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Stream every matching order with its customer and items.
+        `?format=ndjson` (default) or `?format=csv`; filter with
+        `date_from`, `date_to` and repeated `status`.
+        """
+        form = OrderExportFilterForm(request.query_params)
+        if not form.is_valid():
+            return Response(form.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type, lines = EXPORTERS[request.accepted_renderer.format]
+        response = StreamingHttpResponse(
+            lines(filter_orders(Order.objects.all(), **form.cleaned_data)),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="orders.{request.accepted_renderer.format}"'
+        return response
+
+class OrderItemViewSet(ChangeFeedMixin, SparseFieldsetViewMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = OrderItem.objects.all().order_by("id")
     serializer_class = OrderItemSerializer
+    filterset_class = OrderItemFilterSet
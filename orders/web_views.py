@@ -1,19 +1,31 @@
 from django.contrib import messages
-from django.shortcuts import get_object_or_404, redirect, render
+from django.db import transaction
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
 from django.views.generic import ListView, CreateView, DeleteView, DetailView
 
+from config.fragments import CachedTableMixin
+from config.pagination import KeysetPaginationMixin
+from customers.models import Customer
+from products.cache import get_products
 from .models import Order
 from .forms import OrderForm, OrderItemFormSet
 
 
-class OrderListView(ListView):
+class OrderListView(CachedTableMixin, KeysetPaginationMixin, ListView):
     model = Order
     template_name = "orders/order_list.html"
+    table_template_name = "orders/order_list_table.html"
+    # Rows show the customer's name.
+    table_models = [Order, Customer]
     context_object_name = "orders"
     paginate_by = 25
     ordering = ["-id"]
 
+    def get_queryset(self):
+        # Subtotals are stored on the order, so no items are read here.
+        return super().get_queryset().select_related("customer")
+
 
 class OrderCreateView(CreateView):
     model = Order
@@ -28,11 +40,17 @@ class OrderDetailView(DetailView):
     model = Order
     template_name = "orders/order_detail.html"
     context_object_name = "order"
+    queryset = Order.objects.select_related("customer")
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         if "formset" not in ctx:
             ctx["formset"] = OrderItemFormSet(instance=self.object, prefix="items")
+        # Prices for the products already on the rows; the product search
+        # returns prices for the rest.
+        pks = [f["product"].value() for f in ctx["formset"].forms]
+        products = get_products(pk for pk in pks if str(pk).isdigit())
+        ctx["product_prices"] = {str(pk): str(product.price) for pk, product in products.items()}
         return ctx
 
     def post(self, request, *args, **kwargs):
@@ -43,16 +61,13 @@ class OrderDetailView(DetailView):
         formset = OrderItemFormSet(request.POST, instance=self.object, prefix="items")
 
         if formset.is_valid():
-            formset.save()
+            with transaction.atomic():
+                formset.save()
             messages.success(request, "Order items saved.")
             return redirect("orders:detail", pk=self.object.pk)
 
         # If invalid, re-render page with errors
-        return render(
-            request,
-            "orders/order_detail.html",
-            {"order": self.object, "formset": formset},
-        )
+        return self.render_to_response(self.get_context_data(formset=formset))
 
 
 class OrderDeleteView(DeleteView):
@@ -0,0 +1,125 @@
+"""
+Read-through product cache.
+
+Products are cached by id in the cache named by `PRODUCT_CACHE_ALIAS`.
+Entries are dropped by the `post_save`/`post_delete` handlers in
+`products.signals`; code that writes products in bulk must call
+`invalidate_skus()` itself. Both drop entries right away and again when
+the writing transaction commits: in between, a concurrent reader (WAL)
+can still load the old row and would otherwise cache it until the timeout.
+
+The local-memory backend is per process, so other workers only see a
+change once `PRODUCT_CACHE_TIMEOUT` expires; use the file-based (or any
+shared) backend when several processes serve traffic. Prices copied onto
+order lines are read from the database for that reason (orders/forms.py).
+
+Hit and miss counts are per process; staff read them at
+`/api/perf/product-cache/`.
+"""
+
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Product
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _cache():
+    return caches[settings.PRODUCT_CACHE_ALIAS]
+
+
+def _id_key(pk):
+    return f"product:id:{pk}"
+
+
+def _count(hits=0, misses=0):
+    with _stats_lock:
+        _stats["hits"] += hits
+        _stats["misses"] += misses
+
+
+def cache_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def get_products(pks):
+    """
+    Return `{pk: Product}` for the given ids; unknown ids are left out.
+    Misses are loaded with one query and written back.
+    """
+    pks = {int(pk) for pk in pks}
+    cached = _cache().get_many([_id_key(pk) for pk in pks])
+    found = {product.pk: product for product in cached.values()}
+    missing = pks - found.keys()
+    _count(hits=len(found), misses=len(missing))
+
+    if missing:
+        loaded = Product.objects.in_bulk(missing)
+        _cache().set_many(
+            {_id_key(pk): product for pk, product in loaded.items()},
+            timeout=settings.PRODUCT_CACHE_TIMEOUT,
+        )
+        found.update(loaded)
+    return found
+
+
+def get_product(pk):
+    """
+    Return the product with this id, or None.
+    """
+    return get_products([pk]).get(int(pk))
+
+
+async def aget_products(pks):
+    """
+    `get_products()` for async views, through the async cache and ORM APIs.
+    """
+    pks = {int(pk) for pk in pks}
+    cached = await _cache().aget_many([_id_key(pk) for pk in pks])
+    found = {product.pk: product for product in cached.values()}
+    missing = pks - found.keys()
+    _count(hits=len(found), misses=len(missing))
+
+    if missing:
+        loaded = await Product.objects.ain_bulk(missing)
+        await _cache().aset_many(
+            {_id_key(pk): product for pk, product in loaded.items()},
+            timeout=settings.PRODUCT_CACHE_TIMEOUT,
+        )
+        found.update(loaded)
+    return found
+
+
+async def aget_product(pk):
+    return (await aget_products([pk])).get(int(pk))
+
+
+def invalidate(product):
+    key = _id_key(product.pk)
+    _cache().delete(key)
+    transaction.on_commit(lambda: _cache().delete(key))
+
+
+def invalidate_skus(skus):
+    """
+    Drop entries for products written without signals (bulk upserts).
+    """
+    skus = list(skus)
+
+    def delete():
+        pks = Product.objects.filter(sku__in=skus).values_list("pk", flat=True)
+        _cache().delete_many([_id_key(pk) for pk in pks])
+
+    delete()
+    transaction.on_commit(delete)
@@ -0,0 +1,14 @@
+import django_filters
+
+from config.filters import PrefixFilter, UpdatedFilterSet
+
+from .models import Product
+
+
+class ProductFilterSet(UpdatedFilterSet):
+    is_active = django_filters.BooleanFilter()
+    sku_prefix = PrefixFilter(field_name="sku")
+
+    class Meta:
+        model = Product
+        fields = ["is_active", "sku_prefix", "updated_since", "updated_before"]
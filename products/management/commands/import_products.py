@@ -0,0 +1,15 @@
+from config.bulk_import import BulkImportCommand
+from products.cache import invalidate_skus
+from products.forms import ProductForm
+from products.models import Product
+
+
+class Command(BulkImportCommand):
+    help = "Upsert products from a CSV or NDJSON file, keyed on sku."
+
+    model = Product
+    form_class = ProductForm
+    unique_field = "sku"
+
+    def chunk_written(self, keys):
+        invalidate_skus(keys)
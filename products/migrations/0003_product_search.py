@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from config.search import SearchIndex
+
+
+def index(apps):
+    return SearchIndex(apps.get_model("products", "Product"), ["sku", "name"])
+
+
+def install(apps, schema_editor):
+    index(apps).install(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    index(apps).uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
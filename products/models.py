@@ -11,4 +11,17 @@ class Product(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.sku} - {self.name}"
\ No newline at end of file
+        return f"{self.sku} - {self.name}"
+
+    class Meta:
+        indexes = [
+            # Active products by name (pickers, catalogue listings). The ORM
+            # renders `is_active=True` as a bare `WHERE is_active`, which
+            # SQLite cannot match against an (is_active, name) index, so
+            # this is a partial index on name instead.
+            models.Index(fields=["name"], condition=models.Q(is_active=True), name="product_active_name"),
+            # API `?is_active=false`: the few inactive products in id order.
+            # `?is_active=true` matches most rows and pages off the primary key.
+            models.Index(fields=["id"], condition=models.Q(is_active=False), name="product_inactive"),
+            models.Index(fields=["updated_at"], name="product_updated_at"),
+        ]
\ No newline at end of file
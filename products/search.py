@@ -0,0 +1,5 @@
+from config.search import SearchIndex
+
+from .models import Product
+
+product_index = SearchIndex(Product, ["sku", "name"])
@@ -1,7 +1,8 @@
+from config.fieldsets import SparseFieldsetMixin
 from rest_framework import serializers
 from .models import Product
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Product
         fields = "__all__"
@@ -1,11 +1,23 @@
+import json
+import tempfile
 from decimal import Decimal
+from io import StringIO
+from pathlib import Path
 from django.urls import reverse
 from django.test import TestCase
+from django.utils.http import http_date
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
 from django.db.models.deletion import ProtectedError
 
+from testing.query_plans import QueryPlanAssertions
+from products import cache as product_cache
 from products.models import Product
+from products.views import ProductViewSet
+from products.search import product_index
 from customers.models import Customer
 from orders.models import Order, OrderItem
 
@@ -60,6 +72,131 @@ class ProductsWebViewTests(TestCase):
         self.assertFalse(Product.objects.filter(pk=p.pk).exists())
 
 
+class ProductPricesViewTests(TestCase):
+    def setUp(self):
+        self.p1 = Product.objects.create(sku="SKU-1", name="Widget", price=Decimal("10.00"))
+        self.p2 = Product.objects.create(sku="SKU-2", name="Gadget", price=Decimal("2.50"))
+        self.url = reverse("products:prices")
+
+    def test_batch_prices_with_validators(self):
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.url, {"ids": f"{self.p1.pk},{self.p2.pk},999999"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"prices": {str(self.p1.pk): "10.00", str(self.p2.pk): "2.50"}})
+        self.assertTrue(resp.has_header("ETag"))
+        self.assertFalse(resp.has_header("Last-Modified"))
+        self.assertIn("max-age=60", resp["Cache-Control"])
+        self.assertIn("private", resp["Cache-Control"])
+
+    def test_revalidation_returns_304_until_price_changes(self):
+        params = {"ids": str(self.p1.pk)}
+        etag = self.client.get(self.url, params)["ETag"]
+
+        resp = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        self.p1.price = Decimal("11.00")
+        self.p1.save()
+        resp = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["prices"][str(self.p1.pk)], "11.00")
+
+    def test_deleted_product_is_not_revalidated_by_date(self):
+        params = {"ids": f"{self.p1.pk},{self.p2.pk}"}
+        self.client.get(self.url, params)
+        last_modified = http_date(self.p2.updated_at.timestamp())
+
+        self.p1.delete()
+        resp = self.client.get(self.url, params, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json(), {"prices": {str(self.p2.pk): "2.50"}})
+
+    def test_rejects_non_integer_ids(self):
+        resp = self.client.get(self.url, {"ids": "1,abc"})
+        self.assertEqual(resp.status_code, 400)
+
+    async def test_async_price_matches_sync(self):
+        product_cache._cache().clear()
+        product_cache.reset_stats()
+        for _ in range(2):
+            resp = await self.async_client.get(reverse("async-product-price", kwargs={"pk": self.p1.pk}))
+            self.assertEqual(resp.json(), {"price": "10.00"})
+        self.assertEqual(product_cache.cache_stats(), {"hits": 1, "misses": 1})
+        resp = await self.async_client.get(reverse("async-product-price", kwargs={"pk": 999999}))
+        self.assertEqual(resp.status_code, 404)
+
+
+class ProductCacheTests(TestCase):
+    def setUp(self):
+        product_cache._cache().clear()
+        product_cache.reset_stats()
+        self.product = Product.objects.create(sku="SKU-1", name="Widget", price=Decimal("10.00"))
+
+    def test_read_through_by_id(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(product_cache.get_product(self.product.pk).sku, "SKU-1")
+        with self.assertNumQueries(0):
+            self.assertEqual(product_cache.get_product(self.product.pk).price, Decimal("10.00"))
+        self.assertEqual(product_cache.cache_stats(), {"hits": 1, "misses": 1})
+        self.assertIsNone(product_cache.get_product(999999))
+
+    def test_stats_are_staff_only(self):
+        product_cache.get_product(self.product.pk)
+        api = APIClient()
+        url = reverse("perf-product-cache")
+        self.assertEqual(api.get(url).status_code, 403)
+
+        api.force_authenticate(get_user_model().objects.create_user("admin", password="x", is_staff=True))
+        self.assertEqual(api.get(url).json(), {"hits": 0, "misses": 1})
+        self.assertEqual(api.delete(url).status_code, 204)
+        self.assertEqual(api.get(url).json(), {"hits": 0, "misses": 0})
+
+    def test_save_and_delete_invalidate(self):
+        product_cache.get_product(self.product.pk)
+
+        self.product.price = Decimal("12.00")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.save()
+            # A concurrent reader caching the old row before the commit.
+            stale = Product(pk=self.product.pk, sku="SKU-1", name="Widget", price=Decimal("10.00"))
+            product_cache._cache().set(product_cache._id_key(self.product.pk), stale)
+        self.assertEqual(product_cache.get_product(self.product.pk).price, Decimal("12.00"))
+
+        pk = self.product.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.delete()
+        self.assertIsNone(product_cache.get_product(pk))
+
+    def test_price_endpoint_and_api_retrieve_hit_the_cache(self):
+        self.client.get(reverse("products:price", kwargs={"pk": self.product.pk}))
+        with self.assertNumQueries(0):
+            resp = self.client.get(reverse("products:price", kwargs={"pk": self.product.pk}))
+        self.assertEqual(resp.json(), {"price": "10.00"})
+
+        with self.assertNumQueries(0):
+            resp = APIClient().get(f"/api/products/{self.product.pk}/")
+        self.assertEqual(resp.data["sku"], "SKU-1")
+        self.assertEqual(APIClient().get("/api/products/999999/").status_code, 404)
+
+    def test_api_retrieve_applies_filters_to_cached_rows(self):
+        url = f"/api/products/{self.product.pk}/"
+        APIClient().get(url)
+        with self.assertNumQueries(1):
+            self.assertEqual(APIClient().get(url, {"is_active": "false"}).status_code, 404)
+        self.assertEqual(APIClient().get(url, {"is_active": "true"}).data["sku"], "SKU-1")
+        with self.assertNumQueries(0):
+            self.assertEqual(APIClient().get(url, {"fields": "sku"}).status_code, 200)
+
+    def test_bulk_import_invalidates(self):
+        product_cache.get_product(self.product.pk)
+        path = Path(tempfile.mkdtemp()) / "products.csv"
+        path.write_text("sku,price\nSKU-1,15.00\n")
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_products", str(path), stdout=StringIO())
+            product_cache._cache().set(product_cache._id_key(self.product.pk), self.product)
+        self.assertEqual(product_cache.get_product(self.product.pk).price, Decimal("15.00"))
+
+
 class ProductsApiTests(TestCase):
     def setUp(self):
         self.api = APIClient()
@@ -81,6 +218,21 @@ class ProductsApiTests(TestCase):
             is_active=True,
         )
 
+    def test_filter_products(self):
+        Product.objects.create(sku="SKU-10", name="Old", price=Decimal("1.00"), is_active=False)
+        Product.objects.create(sku="sku-2", name="Lower", price=Decimal("1.00"))
+        cases = [
+            ({"is_active": "false"}, ["SKU-10"]),
+            ({"is_active": "true"}, ["SKU-1", "sku-2"]),
+            ({"sku_prefix": "SKU-1"}, ["SKU-1", "SKU-10"]),
+            ({"sku_prefix": "SKU-1", "is_active": "true"}, ["SKU-1"]),
+            ({"sku_prefix": "sku"}, ["sku-2"]),
+        ]
+        for params, expected in cases:
+            with self.subTest(params=params):
+                resp = self.api.get("/api/products/", params)
+                self.assertEqual([row["sku"] for row in resp.json()["results"]], expected)
+
     def test_list_products(self):
         resp = self.api.get("/api/products/")
         self.assertEqual(resp.status_code, 200)
@@ -128,3 +280,130 @@ class ProductsDeleteProtectionTests(TestCase):
     def test_product_delete_is_protected_when_used_in_orders(self):
         with self.assertRaises(ProtectedError):
             self.product.delete()
+
+
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        self.widget = Product.objects.create(sku="WID-100", name="Blue Widget", price=Decimal("10.00"))
+        self.gadget = Product.objects.create(sku="GAD-200", name="Widget Gadget", price=Decimal("5.00"))
+        Product.objects.create(sku="BOL-300", name="Bolt", price=Decimal("0.10"))
+
+    def test_prefix_search_on_sku_and_name(self):
+        self.assertEqual(set(product_index.search("widg")), {self.widget.pk, self.gadget.pk})
+        self.assertEqual(product_index.search("wid-1"), [self.widget.pk])
+        self.assertEqual(product_index.search("blue wid"), [self.widget.pk])
+        self.assertEqual(product_index.search("Gadgét"), [self.gadget.pk])
+        self.assertEqual(product_index.search(" -*\"\" "), [])
+
+    def test_index_follows_writes(self):
+        self.widget.name = "Red Sprocket"
+        self.widget.save()
+        self.assertEqual(product_index.search("sprock"), [self.widget.pk])
+        self.assertEqual(product_index.search("blue"), [])
+
+        Product.objects.filter(pk=self.gadget.pk).update(name="Gizmo")
+        Product.objects.bulk_create([Product(sku="NUT-1", name="Hex Nut")])
+        self.assertEqual(product_index.search("giz"), [self.gadget.pk])
+        self.assertEqual(len(product_index.search("hex")), 1)
+
+        self.widget.delete()
+        self.assertEqual(product_index.search("sprock"), [])
+
+    def test_post_migrate_restores_dropped_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TRIGGER "{product_index.table}_au"')
+        emit_post_migrate_signal(0, False, "default")
+        Product.objects.filter(pk=self.widget.pk).update(name="Sprocket")
+        self.assertEqual(product_index.search("sprock"), [self.widget.pk])
+
+    def test_bulk_upsert_reindexes(self):
+        path = Path(tempfile.mkdtemp()) / "products.csv"
+        path.write_text("sku,name,price\nBOL-300,Anchor Bolt,0.20\n")
+        call_command("import_products", str(path), stdout=StringIO())
+        self.assertEqual(len(product_index.search("anchor")), 1)
+
+    def test_search_endpoint(self):
+        resp = self.client.get(reverse("products:search"), {"q": "wid-100"})
+        self.assertEqual(
+            resp.json(),
+            {"results": [{"id": self.widget.pk, "label": "WID-100 - Blue Widget", "price": "10.00", "is_active": True}]},
+        )
+        resp = self.client.get(reverse("products:search"), {"q": "widget", "limit": "1"})
+        self.assertEqual(len(resp.json()["results"]), 1)
+        self.assertEqual(self.client.get(reverse("products:search")).json(), {"results": []})
+        self.assertEqual(self.client.get(reverse("products:search"), {"q": "w", "limit": "x"}).status_code, 400)
+
+    def test_search_is_one_query_plus_load(self):
+        with self.assertNumQueries(2):
+            self.client.get(reverse("products:search"), {"q": "widget"})
+
+
+class ImportProductsCommandTests(TestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        Product.objects.create(sku="SKU-1", name="Widget", price=Decimal("10.00"))
+
+    def run_import(self, name, content, *args):
+        path = self.dir / name
+        path.write_text(content)
+        out = StringIO()
+        call_command("import_products", str(path), *args, stdout=out)
+        return path, out.getvalue()
+
+    def test_csv_upsert_reports_counts_and_rejects(self):
+        path, out = self.run_import(
+            "products.csv",
+            "sku,name,price,is_active\n"
+            "SKU-1,Widget v2,12.50,True\n"
+            "SKU-2,Gadget,2.50,False\n"
+            "SKU-3,,1.00,True\n"
+            "SKU-4,Broken,abc,True\n",
+            "--batch-size", "2",
+        )
+
+        self.assertIn("Inserted 1, updated 1, rejected 2.", out)
+        widget = Product.objects.get(sku="SKU-1")
+        self.assertEqual((widget.name, widget.price), ("Widget v2", Decimal("12.50")))
+        self.assertFalse(Product.objects.get(sku="SKU-2").is_active)
+        self.assertFalse(Product.objects.filter(sku__in=["SKU-3", "SKU-4"]).exists())
+
+        rejects = (self.dir / "products.csv.rejects.csv").read_text().splitlines()
+        self.assertEqual(len(rejects), 3)
+        self.assertIn("SKU-4", rejects[2])
+        self.assertIn("price", rejects[2])
+
+    def test_ndjson_partial_columns_keep_other_values(self):
+        _, out = self.run_import(
+            "products.ndjson",
+            json.dumps({"sku": "SKU-1", "price": "11.00"}) + "\n" + "not json\n",
+        )
+
+        self.assertIn("Inserted 0, updated 1, rejected 1.", out)
+        widget = Product.objects.get(sku="SKU-1")
+        self.assertEqual((widget.name, widget.price), ("Widget", Decimal("11.00")))
+        self.assertTrue((self.dir / "products.ndjson.rejects.ndjson").exists())
+
+
+class ProductQueryPlanTests(QueryPlanAssertions, TestCase):
+    def test_active_products_by_name(self):
+        self.assertIndexed(
+            Product.objects.filter(is_active=True).order_by("name")[:50],
+            index="product_active_name",
+            ordered_scan=True,
+        )
+
+    def test_lookup_by_sku(self):
+        self.assertIndexed(Product.objects.filter(sku__in=["SKU-1", "SKU-2"]))
+
+    def test_api_filters(self):
+        # Most products are active: pages come off the primary key.
+        self.assertIndexed(self.api_page(ProductViewSet, "is_active=true"), ordered_scan=True)
+        # The few inactive ones are all in a partial index, in id order.
+        self.assertIndexed(self.api_page(ProductViewSet, "is_active=false"), index="product_inactive", ordered_scan=True)
+        for query, index in [
+            ("sku_prefix=PERF-00", "sqlite_autoindex_products_product_1"),
+            ("sku_prefix=PERF-00&is_active=true", "sqlite_autoindex_products_product_1"),
+            ("updated_since=2026-01-01T00:00:00Z", "product_updated_at"),
+        ]:
+            with self.subTest(query=query):
+                self.assertIndexed(self.api_page(ProductViewSet, query), index=index, sort_matches=True)
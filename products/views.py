@@ -1,8 +1,43 @@
+from django.http import Http404
 from django.shortcuts import render
+from changes.feed import ChangeFeedMixin
+from config.conditional import ConditionalGetMixin
+from config.encoders import FastListMixin
+from config.fieldsets import SparseFieldsetViewMixin
 from rest_framework import viewsets
+from .cache import get_product
+from .filters import ProductFilterSet
 from .models import Product
 from .serializers import ProductSerializer
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ChangeFeedMixin, SparseFieldsetViewMixin, ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all().order_by("id")
     serializer_class = ProductSerializer
+    filterset_class = ProductFilterSet
+
+    def has_filters(self):
+        return any(name in self.request.query_params for name in self.filterset_class.base_filters)
+
+    def get_cached_object(self):
+        if not hasattr(self, "_cached_object"):
+            pk = self.kwargs["pk"]
+            product = get_product(pk) if str(pk).isdigit() else None
+            if product is not None and self.has_filters():
+                if not self.filter_queryset(self.get_queryset()).filter(pk=product.pk).exists():
+                    product = None
+            if product is None:
+                raise Http404("No Product matches the given query.")
+            self.check_object_permissions(self.request, product)
+            self._cached_object = product
+        return self._cached_object
+
+    def get_last_modified(self):
+        # Validators come from the cached row, so a hit costs no queries.
+        return self.get_cached_object().updated_at
+
+    def get_object(self):
+        # Reads go through the product cache; writes load a fresh row. Filter
+        # params still apply to a cached read, at the cost of one query.
+        if self.action == "retrieve":
+            return self.get_cached_object()
+        return super().get_object()
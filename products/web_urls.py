@@ -1,6 +1,7 @@
 from django.urls import path
 from .web_views import (
-    ProductListView, ProductCreateView, ProductUpdateView, ProductDeleteView, product_price
+    ProductListView, ProductCreateView, ProductUpdateView, ProductDeleteView, product_price, product_prices,
+    product_search,
 )
 
 app_name = "products"
@@ -11,4 +12,6 @@ urlpatterns = [
     path("<int:pk>/edit/", ProductUpdateView.as_view(), name="update"),
     path("<int:pk>/delete/", ProductDeleteView.as_view(), name="delete"),
     path("<int:pk>/price/", product_price, name="price"),
+    path("prices/", product_prices, name="prices"),
+    path("search/", product_search, name="search"),
 ]
\ No newline at end of file
@@ -1,20 +1,83 @@
 from django.urls import reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404
+from django.http import Http404, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
 
+from config.conditional import make_etag, not_modified, set_validators
+from config.fragments import CachedTableMixin
+from config.pagination import KeysetPaginationMixin
+from config.search import autocomplete_response
+from .cache import aget_product, get_product
 from .models import Product
 from .forms import ProductForm
+from .search import product_index
+
+# Browsers may reuse a price map this long before revalidating with the ETag.
+PRICE_MAX_AGE = 60
+MAX_PRICE_IDS = 1000
 
 def product_price(request, pk):
-    product = get_object_or_404(Product, pk=pk)
+    product = get_product(pk)
+    if product is None:
+        raise Http404("No Product matches the given query.")
+    return JsonResponse({"price": str(product.price)})
+
+async def product_price_async(request, pk):
+    product = await aget_product(pk)
+    if product is None:
+        raise Http404("No Product matches the given query.")
     return JsonResponse({"price": str(product.price)})
 
-class ProductListView(ListView):
+@require_GET
+def product_prices(request):
+    """
+    Prices for many products in one response: `?ids=1,2,3` -> `{"prices": {"1": "9.99", ...}}`.
+    Unknown ids are left out. Revalidates with an ETag from `updated_at`
+    and the number of rows found; like the API lists it sends no
+    Last-Modified, which a deleted product would not move.
+    """
+    try:
+        ids = {int(pk) for value in request.GET.getlist("ids") for pk in value.split(",") if pk}
+    except ValueError:
+        return JsonResponse({"ids": ["Expected comma-separated integers."]}, status=400)
+    if len(ids) > MAX_PRICE_IDS:
+        return JsonResponse({"ids": [f"At most {MAX_PRICE_IDS} ids per request."]}, status=400)
+
+    rows = list(Product.objects.filter(pk__in=ids).order_by("pk").values_list("pk", "price", "updated_at"))
+    last_modified = max((updated_at for _, _, updated_at in rows), default=None)
+    etag = make_etag(sorted(ids), len(rows), last_modified)
+
+    response = not_modified(request, etag, None)
+    if response is None:
+        response = set_validators(JsonResponse({"prices": {str(pk): str(price) for pk, price, _ in rows}}), etag, None)
+    patch_cache_control(response, private=True, max_age=PRICE_MAX_AGE)
+    return response
+
+@require_GET
+def product_search(request):
+    """
+    Autocomplete: products with words starting with each word of `?q=` in
+    their sku or name. Prices are included so pickers can fill them in.
+    """
+    return autocomplete_response(
+        request,
+        product_index,
+        lambda product: {
+            "id": product.pk,
+            "label": str(product),
+            "price": str(product.price),
+            "is_active": product.is_active,
+        },
+    )
+
+class ProductListView(CachedTableMixin, KeysetPaginationMixin, ListView):
     model = Product
     template_name = "products/product_list.html"
+    table_template_name = "products/product_list_table.html"
     context_object_name = "products"
     paginate_by = 25
+    ordering = ["id"]
     
 class ProductCreateView(CreateView):
     model = Product
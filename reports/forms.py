@@ -0,0 +1,16 @@
+from django import forms
+
+from orders.models import Order
+
+
+class DateRangeForm(forms.Form):
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+
+
+class SalesReportForm(DateRangeForm):
+    SOURCES = [("rollup", "Daily rollup"), ("live", "Order items")]
+
+    status = forms.MultipleChoiceField(choices=Order.Status.choices, required=False)
+    source = forms.ChoiceField(choices=SOURCES, required=False)
+    limit = forms.IntegerField(min_value=1, max_value=1000, required=False)
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:37
+
+from django.db import migrations, models
+
+from reports.stale_days import install_triggers, uninstall_triggers
+
+
+def install(apps, schema_editor):
+    install_triggers(schema_editor.connection, apps)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_triggers(schema_editor.connection, apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+        ('orders', '0005_api_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+            ],
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,92 @@
+from decimal import Decimal
+
+from django.db import models
+
+from orders.models import Order
+
+
+class SalesRollup(models.Model):
+    """
+    Revenue (`unit_price * quantity`), units and orders for one day and
+    status. Rebuilt a day at a time by `manage.py refresh_sales_rollup`.
+    """
+
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Order.Status.choices)
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal("0.00"))
+    units = models.PositiveBigIntegerField(default=0)
+    orders = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class DailySales(SalesRollup):
+    """
+    Sales per day and status: a few rows per day, for dashboards over
+    long ranges.
+    """
+
+    class Meta:
+        verbose_name_plural = "daily sales"
+        constraints = [
+            models.UniqueConstraint(fields=["day", "status"], name="daily_sales_day_status"),
+        ]
+
+
+class DailyProductSales(SalesRollup):
+    """
+    Sales per day, status and product. `orders` counts the orders that
+    contain the product.
+    """
+
+    product = models.ForeignKey("products.Product", on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        verbose_name_plural = "daily product sales"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "status", "product"], name="daily_product_sales_day_status_product"
+            ),
+        ]
+
+
+class DailyCustomerSales(SalesRollup):
+    """
+    Sales per day, status and customer.
+    """
+
+    customer = models.ForeignKey("customers.Customer", on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        verbose_name_plural = "daily customer sales"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "status", "customer"], name="daily_customer_sales_day_status_customer"
+            ),
+        ]
+
+
+class StaleDay(models.Model):
+    """
+    A day whose rollup rows may still count an order that was deleted or
+    moved to another day. Written only by the triggers in
+    `reports.stale_days`; `refresh()` rebuilds the day and deletes the row.
+    """
+
+    day = models.DateField()
+
+    def __str__(self):
+        return self.day.isoformat()
+
+
+class Watermark(models.Model):
+    """
+    The `updated_at` up to which a rollup has been refreshed.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.value.isoformat()}"
@@ -0,0 +1,61 @@
+"""
+Sales aggregates grouped by day, product or customer.
+
+Both sources return rows of `{"key", "revenue", "units", "orders"}`:
+`rollup_sales` sums the daily rollup tables, `live_sales` aggregates
+`unit_price * quantity` over order items directly.
+"""
+
+from django.db.models import Count, F, Sum
+
+from orders.models import LINE_TOTAL, OrderItem
+
+from .models import DailyCustomerSales, DailyProductSales, DailySales
+
+ROLLUPS = {
+    "day": (DailySales, "day"),
+    "product": (DailyProductSales, "product_id"),
+    "customer": (DailyCustomerSales, "customer_id"),
+}
+LIVE_KEYS = {"day": "order__order_date", "product": "product_id", "customer": "order__customer_id"}
+
+
+def _ordered(rows, dimension, limit):
+    if dimension == "day":
+        return rows.order_by("key")
+    # Top sellers first; the key keeps ties stable.
+    return rows.order_by("-revenue", "key")[:limit]
+
+
+def rollup_sales(dimension, date_from=None, date_to=None, status=None, limit=None):
+    model, key = ROLLUPS[dimension]
+    rows = model.objects.all()
+    if date_from:
+        rows = rows.filter(day__gte=date_from)
+    if date_to:
+        rows = rows.filter(day__lte=date_to)
+    if status:
+        rows = rows.filter(status__in=status)
+    rows = rows.values(key=F(key)).annotate(
+        revenue=Sum("revenue"), units=Sum("units"), orders=Sum("orders")
+    )
+    return _ordered(rows, dimension, limit)
+
+
+def live_sales(dimension, date_from=None, date_to=None, status=None, limit=None):
+    items = OrderItem.objects.all()
+    if date_from:
+        items = items.filter(order__order_date__gte=date_from)
+    if date_to:
+        items = items.filter(order__order_date__lte=date_to)
+    if status:
+        items = items.filter(order__status__in=status)
+    # A product appears at most once per order.
+    orders = Count("id") if dimension == "product" else Count("order_id", distinct=True)
+    rows = items.values(key=F(LIVE_KEYS[dimension])).annotate(
+        revenue=Sum(LINE_TOTAL), units=Sum("quantity"), orders=orders
+    )
+    return _ordered(rows, dimension, limit)
+
+
+SOURCES = {"rollup": rollup_sales, "live": live_sales}
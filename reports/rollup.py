@@ -0,0 +1,145 @@
+"""
+Incremental maintenance of the sales rollup tables.
+
+A day is rebuilt from scratch (delete, then one aggregate insert per
+table) whenever an order dated that day, or one of its items, has an
+`updated_at` past the watermark. Rebuilding whole days picks up status
+changes and removed lines without knowing the old values.
+
+A deleted order leaves no `updated_at` behind, so triggers record its
+`order_date` (and the old date of a re-dated order) as a `StaleDay`
+(reports/stale_days.py), which the next refresh also rebuilds.
+"""
+
+from datetime import timedelta
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Sum
+from django.utils import timezone
+
+from orders.models import LINE_TOTAL, Order, OrderItem
+
+from .models import DailyCustomerSales, DailyProductSales, DailySales, StaleDay, Watermark
+
+ROLLUP_MODELS = (DailySales, DailyProductSales, DailyCustomerSales)
+
+WATERMARK = "sales_rollup"
+
+# A transaction that began before a refresh can commit rows stamped just
+# before its watermark; re-reading this window picks them up.
+OVERLAP = timedelta(minutes=5)
+
+# Keeps `day IN (...)` well under SQLite's 999 parameters.
+DAYS_PER_BATCH = 200
+
+
+def changed_days(since):
+    """
+    Order dates with an order or item updated after `since`.
+    """
+    days = set(Order.objects.filter(updated_at__gt=since).values_list("order_date", flat=True).distinct())
+    days.update(
+        OrderItem.objects.filter(updated_at__gt=since).values_list("order__order_date", flat=True).distinct()
+    )
+    return days
+
+
+def all_days(date_from=None, date_to=None):
+    """
+    Every day with orders or rollup rows in the range.
+    """
+    filters = {}
+    if date_from:
+        filters["gte"] = date_from
+    if date_to:
+        filters["lte"] = date_to
+    days = set(
+        Order.objects.filter(**{f"order_date__{op}": value for op, value in filters.items()})
+        .values_list("order_date", flat=True)
+        .distinct()
+    )
+    for model in ROLLUP_MODELS:
+        days.update(
+            model.objects.filter(**{f"day__{op}": value for op, value in filters.items()})
+            .values_list("day", flat=True)
+            .distinct()
+        )
+    return days
+
+
+def _insert_select(model, rows, keys):
+    """
+    `INSERT INTO <rollup> SELECT ...` from an aggregate queryset, so the
+    rows never pass through Python.
+    """
+    names = [*keys, "revenue", "units", "orders"]
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(model._meta.get_field(name).column) for name in names)
+    sql, params = rows.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(model._meta.db_table)} ({columns}) "
+            f"SELECT {', '.join(quote(name) for name in names)} FROM ({sql}) AS rollup",
+            params,
+        )
+
+
+def _rollups(items):
+    """
+    `(model, key columns, aggregate queryset)` for each rollup table.
+    """
+    day = {"day": F("order__order_date"), "status": F("order__status")}
+    totals = {"revenue": Sum(LINE_TOTAL), "units": Sum("quantity")}
+    distinct_orders = Count("order_id", distinct=True)
+    return [
+        (DailySales, ["day", "status"], items.values(**day).annotate(**totals, orders=distinct_orders)),
+        (
+            DailyProductSales,
+            ["day", "status", "product_id"],
+            # A product appears at most once per order.
+            items.values("product_id", **day).annotate(**totals, orders=Count("id")),
+        ),
+        (
+            DailyCustomerSales,
+            ["day", "status", "customer_id"],
+            items.values(**day, customer_id=F("order__customer_id")).annotate(**totals, orders=distinct_orders),
+        ),
+    ]
+
+
+def rebuild_days(days):
+    """
+    Replace the rollup rows for `days` with fresh aggregates of their items.
+    """
+    days = sorted(days)
+    for start in range(0, len(days), DAYS_PER_BATCH):
+        batch = days[start : start + DAYS_PER_BATCH]
+        items = OrderItem.objects.filter(order__order_date__in=batch).order_by()
+        with transaction.atomic():
+            for model, keys, rows in _rollups(items):
+                model.objects.filter(day__in=batch).delete()
+                _insert_select(model, rows, keys)
+
+
+def last_refreshed():
+    return Watermark.objects.filter(name=WATERMARK).values_list("value", flat=True).first()
+
+
+def refresh(full=False):
+    """
+    Rebuild the days changed since the last refresh, including stale
+    days left by deleted or re-dated orders (every day on the first run,
+    or with `full`), and advance the watermark. Returns the rebuilt days.
+    """
+    started = timezone.now()
+    since = None if full else last_refreshed()
+    # Rows recorded while this refresh runs are left for the next one.
+    stale = StaleDay.objects.filter(id__lte=StaleDay.objects.aggregate(last=Max("id"))["last"] or 0)
+    if since:
+        days = changed_days(since - OVERLAP) | set(stale.values_list("day", flat=True).distinct())
+    else:
+        # Covers the stale days too: they are days with orders or rollup rows.
+        days = all_days()
+    rebuild_days(days)
+    stale.delete()
+    Watermark.objects.update_or_create(name=WATERMARK, defaults={"value": started})
+    return days
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+
+class SalesRowSerializer(serializers.Serializer):
+    revenue = serializers.DecimalField(max_digits=16, decimal_places=2)
+    units = serializers.IntegerField()
+    orders = serializers.IntegerField()
+
+
+class DaySalesSerializer(SalesRowSerializer):
+    day = serializers.DateField(source="key")
+
+
+class ProductSalesSerializer(SalesRowSerializer):
+    product = serializers.IntegerField(source="key")
+    sku = serializers.CharField()
+    name = serializers.CharField()
+
+
+class CustomerSalesSerializer(SalesRowSerializer):
+    customer = serializers.IntegerField(source="key")
+    name = serializers.CharField()
@@ -0,0 +1,11 @@
+from django.db import connections
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from .stale_days import restore_triggers
+
+
+@receiver(post_migrate)
+def restore_stale_day_triggers(sender, using, **kwargs):
+    if sender.name == "reports":
+        restore_triggers(connections[using])
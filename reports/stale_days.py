@@ -0,0 +1,62 @@
+"""
+Triggers that record the rollup days an order leaves behind.
+
+An order deleted, or moved to another `order_date`, leaves no `updated_at`
+on its old day for `refresh()` to find. `AFTER DELETE` and
+`AFTER UPDATE OF order_date` triggers on `orders_order` insert the
+affected `order_date`s into `reports_staleday`; `refresh()` rebuilds those days and
+deletes the rows it read. Triggers see cascades, queryset deletes and
+updates, and raw SQL alike.
+
+Like the tombstone triggers (changes/tombstones.py), these are dropped
+when a migration rebuilds the table, so `restore_triggers()` runs after
+every `migrate`. SQLite only; on other backends rebuild the affected days
+with `refresh_sales_rollup --date-from/--date-to` after deleting orders.
+"""
+
+from django.apps import apps as global_apps
+
+
+def triggers(order_model, stale_day_model, quote):
+    """
+    `{name: CREATE TRIGGER sql}` for the order table.
+    """
+    table = order_model._meta.db_table
+    insert = f"INSERT INTO {quote(stale_day_model._meta.db_table)}(day) VALUES"
+    return {
+        f"{table}_stale_day_delete": (
+            f"CREATE TRIGGER IF NOT EXISTS {quote(f'{table}_stale_day_delete')} AFTER DELETE ON {quote(table)} "
+            f"BEGIN {insert} (old.order_date); END"
+        ),
+        # Both days: an `update()` moving the date leaves `updated_at` alone.
+        f"{table}_stale_day_update": (
+            f"CREATE TRIGGER IF NOT EXISTS {quote(f'{table}_stale_day_update')} "
+            f"AFTER UPDATE OF order_date ON {quote(table)} FOR EACH ROW WHEN old.order_date IS NOT new.order_date "
+            f"BEGIN {insert} (old.order_date), (new.order_date); END"
+        ),
+    }
+
+
+def install_triggers(connection, apps=global_apps):
+    if connection.vendor != "sqlite":
+        return
+    sql = triggers(apps.get_model("orders", "Order"), apps.get_model("reports", "StaleDay"), connection.ops.quote_name)
+    with connection.cursor() as cursor:
+        for statement in sql.values():
+            cursor.execute(statement)
+
+
+def uninstall_triggers(connection, apps=global_apps):
+    if connection.vendor != "sqlite":
+        return
+    sql = triggers(apps.get_model("orders", "Order"), apps.get_model("reports", "StaleDay"), connection.ops.quote_name)
+    with connection.cursor() as cursor:
+        for name in sql:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {connection.ops.quote_name(name)}")
+
+
+def restore_triggers(connection):
+    """
+    Recreate triggers dropped by table rebuilds.
+    """
+    install_triggers(connection)
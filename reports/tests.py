@@ -0,0 +1,172 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from customers.models import Customer
+from orders.models import Order, OrderItem
+from products.models import Product
+from reports import rollup
+from reports.models import DailyCustomerSales, DailyProductSales, DailySales, StaleDay, Watermark
+
+DAY1 = date(2026, 3, 1)
+DAY2 = date(2026, 3, 2)
+
+
+class SalesReportTestCase(TestCase):
+    def setUp(self):
+        self.api = APIClient()
+        self.alice = Customer.objects.create(name="Alice")
+        self.bob = Customer.objects.create(name="Bob")
+        self.widget = Product.objects.create(sku="W-1", name="Widget", price=Decimal("10.00"))
+        self.gadget = Product.objects.create(sku="G-1", name="Gadget", price=Decimal("2.50"))
+
+        self.o1 = self.make_order(self.alice, DAY1, Order.Status.PLACED, [(self.widget, 2, "10.00"), (self.gadget, 4, "2.50")])
+        self.o2 = self.make_order(self.bob, DAY1, Order.Status.SHIPPED, [(self.widget, 1, "9.00")])
+        self.o3 = self.make_order(self.alice, DAY2, Order.Status.CANCELLED, [(self.gadget, 10, "2.50")])
+
+    def make_order(self, customer, day, status, lines):
+        order = Order.objects.create(customer=customer, status=status)
+        for product, quantity, price in lines:
+            OrderItem.objects.create(order=order, product=product, quantity=quantity, unit_price=Decimal(price))
+        # order_date is auto_now_add, so backdate it with an update.
+        Order.objects.filter(pk=order.pk).update(order_date=day)
+        order.order_date = day
+        return order
+
+    def get(self, report, **params):
+        response = self.api.get(reverse(f"sales-report-{report}"), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+
+class RefreshSalesRollupTests(SalesReportTestCase):
+    def test_first_refresh_builds_both_rollups(self):
+        out = StringIO()
+        call_command("refresh_sales_rollup", stdout=out)
+        self.assertIn("Rebuilt 2 days.", out.getvalue())
+
+        day1 = DailySales.objects.filter(day=DAY1).order_by("status")
+        self.assertEqual(
+            [(row.status, row.revenue, row.units, row.orders) for row in day1],
+            [("PLACED", Decimal("30.00"), 6, 1), ("SHIPPED", Decimal("9.00"), 1, 1)],
+        )
+        widget_day1 = DailyProductSales.objects.filter(day=DAY1, product=self.widget).order_by("status")
+        self.assertEqual(
+            [(row.status, row.revenue, row.units, row.orders) for row in widget_day1],
+            [("PLACED", Decimal("20.00"), 2, 1), ("SHIPPED", Decimal("9.00"), 1, 1)],
+        )
+        alice_day1 = DailyCustomerSales.objects.get(day=DAY1, customer=self.alice)
+        self.assertEqual((alice_day1.revenue, alice_day1.units, alice_day1.orders), (Decimal("30.00"), 6, 1))
+        self.assertTrue(Watermark.objects.filter(name=rollup.WATERMARK).exists())
+
+    def test_incremental_refresh_rebuilds_only_changed_days(self):
+        rollup.refresh()
+        # Age everything past the overlap window: nothing has changed since.
+        yesterday = timezone.now() - timedelta(days=1)
+        Order.objects.update(updated_at=yesterday)
+        OrderItem.objects.update(updated_at=yesterday)
+        Watermark.objects.update(value=yesterday + timedelta(hours=1) + rollup.OVERLAP)
+        self.assertEqual(rollup.refresh(), set())
+
+        self.o2.status = Order.Status.CANCELLED
+        self.o2.save()
+        self.assertEqual(rollup.refresh(), {DAY1})
+        self.assertFalse(DailySales.objects.filter(day=DAY1, status="SHIPPED").exists())
+        self.assertEqual(DailySales.objects.get(day=DAY1, status="CANCELLED").revenue, Decimal("9.00"))
+
+    def test_item_changes_are_picked_up(self):
+        rollup.refresh()
+        item = OrderItem.objects.get(order=self.o3)
+        item.quantity = 1
+        item.save()
+        rollup.refresh()
+        self.assertEqual(DailySales.objects.get(day=DAY2).revenue, Decimal("2.50"))
+
+        item.delete()
+        rollup.refresh()
+        self.assertFalse(DailySales.objects.filter(day=DAY2).exists())
+
+    def test_deleted_and_redated_orders_are_picked_up(self):
+        rollup.refresh()
+        self.assertFalse(StaleDay.objects.exists())
+        yesterday = timezone.now() - timedelta(days=1)
+        Order.objects.update(updated_at=yesterday)
+        OrderItem.objects.update(updated_at=yesterday)
+        Watermark.objects.update(value=yesterday + timedelta(hours=1) + rollup.OVERLAP)
+
+        self.o3.delete()
+        self.assertEqual(rollup.refresh(), {DAY2})
+        for model in (DailySales, DailyProductSales, DailyCustomerSales):
+            self.assertFalse(model.objects.filter(day=DAY2).exists())
+        self.assertFalse(StaleDay.objects.exists())
+
+        Order.objects.filter(pk=self.o2.pk).update(order_date=DAY2)
+        self.assertEqual(rollup.refresh(), {DAY1, DAY2})
+        self.assertFalse(DailySales.objects.filter(day=DAY1, status="SHIPPED").exists())
+        self.assertEqual(DailySales.objects.get(day=DAY2, status="SHIPPED").revenue, Decimal("9.00"))
+
+    def test_date_range_rebuild_clears_deleted_orders(self):
+        rollup.refresh()
+        self.o3.delete()
+        call_command("refresh_sales_rollup", date_from="2026-03-02", date_to="2026-03-02", stdout=StringIO())
+        for model in (DailySales, DailyProductSales, DailyCustomerSales):
+            self.assertFalse(model.objects.filter(day=DAY2).exists())
+
+
+class SalesReportApiTests(SalesReportTestCase):
+    def setUp(self):
+        super().setUp()
+        rollup.refresh()
+
+    def test_by_day(self):
+        data = self.get("by-day")
+        self.assertEqual(data["source"], "rollup")
+        self.assertIsNotNone(data["refreshed_at"])
+        self.assertEqual(
+            data["results"],
+            [
+                {"day": "2026-03-01", "revenue": "39.00", "units": 7, "orders": 2},
+                {"day": "2026-03-02", "revenue": "25.00", "units": 10, "orders": 1},
+            ],
+        )
+
+    def test_by_product_and_customer(self):
+        products = self.get("by-product")["results"]
+        self.assertEqual(
+            [(row["sku"], row["revenue"], row["units"], row["orders"]) for row in products],
+            [("G-1", "35.00", 14, 2), ("W-1", "29.00", 3, 2)],
+        )
+        customers = self.get("by-customer", limit=1)["results"]
+        self.assertEqual(customers, [{"customer": self.alice.pk, "name": "Alice", "revenue": "55.00", "units": 16, "orders": 2}])
+
+    def test_filters(self):
+        data = self.get("by-day", status=["PLACED", "SHIPPED"], date_to="2026-03-01")
+        self.assertEqual(data["results"], [{"day": "2026-03-01", "revenue": "39.00", "units": 7, "orders": 2}])
+
+    def test_live_source_matches_rollup(self):
+        for report in ("by-day", "by-product", "by-customer"):
+            for params in ({}, {"status": ["CANCELLED"]}, {"date_from": "2026-03-02"}):
+                with self.subTest(report=report, params=params):
+                    rollup_rows = self.get(report, **params)["results"]
+                    live = self.get(report, source="live", **params)
+                    self.assertIsNone(live["refreshed_at"])
+                    self.assertEqual(live["results"], rollup_rows)
+
+    def test_invalid_params(self):
+        response = self.api.get(reverse("sales-report-by-day"), {"date_from": "yesterday", "status": "LOST"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"date_from", "status"})
+
+    def test_rollup_report_does_not_read_order_tables(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.get("by-day")
+        self.assertEqual(len(ctx), 2)  # watermark + aggregate
+        self.assertFalse(any("orders_order" in query["sql"] for query in ctx.captured_queries))
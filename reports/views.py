@@ -0,0 +1,69 @@
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from customers.models import Customer
+from products.cache import get_products
+
+from .forms import SalesReportForm
+from .models import DailySales
+from .queries import SOURCES
+from .rollup import last_refreshed
+from .serializers import CustomerSalesSerializer, DaySalesSerializer, ProductSalesSerializer
+
+DEFAULT_LIMIT = 100
+
+
+class SalesReportViewSet(viewsets.ViewSet):
+    """
+    Revenue (`unit_price * quantity`), units and orders by day, product or
+    customer. Filter with `date_from`, `date_to` and repeated `status`.
+
+    Reads the daily rollups unless `?source=live`; `refreshed_at` says how
+    current they are. Product and customer reports return the top
+    `?limit=` rows (default 100) by revenue.
+    """
+
+    # Only consulted by the model-permission class; reports are read-only.
+    queryset = DailySales.objects.none()
+
+    def report(self, request, dimension, serializer_class, describe=None):
+        form = SalesReportForm(request.query_params)
+        if not form.is_valid():
+            return Response(form.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = form.cleaned_data
+        source = params.pop("source") or "rollup"
+        params["limit"] = params["limit"] or DEFAULT_LIMIT
+
+        rows = list(SOURCES[source](dimension, **params))
+        if describe:
+            describe(rows)
+        return Response({
+            "source": source,
+            "refreshed_at": last_refreshed() if source == "rollup" else None,
+            "results": serializer_class(rows, many=True).data,
+        })
+
+    @action(detail=False, url_path="by-day")
+    def by_day(self, request):
+        return self.report(request, "day", DaySalesSerializer)
+
+    @action(detail=False, url_path="by-product")
+    def by_product(self, request):
+        def describe(rows):
+            products = get_products(row["key"] for row in rows)
+            for row in rows:
+                product = products.get(row["key"])
+                row["sku"], row["name"] = (product.sku, product.name) if product else ("", "")
+
+        return self.report(request, "product", ProductSalesSerializer, describe)
+
+    @action(detail=False, url_path="by-customer")
+    def by_customer(self, request):
+        def describe(rows):
+            customers = Customer.objects.only("name").in_bulk([row["key"] for row in rows])
+            for row in rows:
+                customer = customers.get(row["key"])
+                row["name"] = customer.name if customer else ""
+
+        return self.report(request, "customer", CustomerSalesSerializer, describe)
@@ -0,0 +1,73 @@
+"""
+Query-plan assertions for tests.
+
+`QueryPlanAssertions.assertIndexed(queryset)` runs the queryset's SQL
+through `EXPLAIN` (`EXPLAIN QUERY PLAN` on SQLite) and fails if the plan
+reads a whole table or sorts every matching row, so a dropped or unusable
+index shows up as a test failure rather than a slow page.
+"""
+
+from django.conf import settings
+from django.http import QueryDict
+
+
+def query_plan(queryset):
+    """
+    The plan's detail lines, e.g. `SEARCH orders_order USING INDEX ...`.
+    """
+    # SQLite rows are "<id> <parent> <notused> <detail>".
+    return [line.split(" ", 3)[-1] for line in queryset.explain().splitlines()]
+
+
+def plan_problems(queryset, ordered_scan=False, sort_matches=False):
+    """
+    Plan lines that touch every row: table scans and temp-table sorts.
+
+    With `ordered_scan`, a scan is accepted when it already yields rows
+    in the requested order and the query is limited (`ORDER BY id DESC
+    LIMIT n`), since it stops after `n` rows. With `sort_matches`, a sort
+    is accepted after an index search, since it only sorts the matches
+    (`WHERE order_date BETWEEN ... ORDER BY id`).
+    """
+    limited = queryset.query.high_mark is not None
+    plan = query_plan(queryset)
+    searched = any(line.startswith("SEARCH ") for line in plan)
+    problems = []
+    for line in plan:
+        if line.startswith("USE TEMP B-TREE"):
+            if sort_matches and searched:
+                continue
+            problems.append(line)
+        elif line.startswith("SCAN ") and not (ordered_scan and limited):
+            problems.append(line)
+    return problems
+
+
+class QueryPlanAssertions:
+    """
+    TestCase mixin.
+    """
+
+    def assertIndexed(self, queryset, index=None, ordered_scan=False, sort_matches=False):
+        """
+        Fail on a full scan or sort; with `index`, also fail unless the
+        plan uses that index.
+        """
+        plan = query_plan(queryset)
+        problems = plan_problems(queryset, ordered_scan=ordered_scan, sort_matches=sort_matches)
+        if index and not any(f"INDEX {index} " in f"{line} " for line in plan):
+            problems.append(f"{index} not used")
+        if problems:
+            self.fail(
+                "Query is not index-backed (%s):\n%s\nPlan:\n%s"
+                % ("; ".join(problems), queryset.query, "\n".join(plan))
+            )
+
+    def api_page(self, viewset_class, query):
+        """
+        The first list page of `viewset_class` for the query string
+        `query`, filtered by its `filterset_class` as the API filters it.
+        """
+        filterset = viewset_class.filterset_class(QueryDict(query), queryset=viewset_class.queryset.all())
+        self.assertTrue(filterset.is_valid(), filterset.errors)
+        return filterset.qs[: settings.REST_FRAMEWORK["PAGE_SIZE"] + 1]